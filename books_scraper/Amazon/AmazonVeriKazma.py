@@ -1,22 +1,50 @@
 #!/usr/bin/env python3
 # amazon_tablets_page1_2_full.py
-# Amaç: Amazon Bestseller page=1 ve page=2 içindeki ürünleri çek (her sayfa için hedef 50)
+# Amaç: Amazon Bestseller kategorilerinin (CATEGORY_NODES) sayfalarındaki ürünleri çek (her sayfa için hedef 50).
+# Sayfa sayısı her kategorinin 1. sayfasındaki sayfalamadan keşfedilir (en fazla MAX_PAGES).
+# İşler öncelikli kuyrukla (scheduler.py) sıralanır: önce tüm kategorilerin listeleme sayfaları,
+# sonra ürünler sıralamaya göre (tüm kategorilerin 1. ürünleri, sonra 2. ürünleri...).
 # Eksik alanlar "NonePublished" ile doldurulur. Terminalde "img" ve "link" gizlenir.
 
-import requests
-import time
+import os
+import sys
 import random
-import re
+import time
 import html
 import json
-from typing import List, Dict, Tuple
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
 from bs4 import BeautifulSoup
 import pandas as pd
 from tabulate import tabulate
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # books_scraper/ ortak modülleri
+from concurrent_fetch import DEFAULT_PARSE_WORKERS, fetch_parse_all
+from scheduler import CrawlScheduler, listing_priority, product_priority
+from rate_limiter import BACKOFF_STATUSES, DomainRateLimiter, retry_delay
+from http_cache import ResponseCache
+from parsers import make_soup
+from exporters import MultiWriter, open_writer
+from snapshot_store import snapshot_writers
+from checkpoint import CrawlCheckpoint
+from fingerprint import FINGERPRINT_FIELD, SCRAPED_AT_FIELD, row_fingerprint
+from hybrid_fetch import HybridFetcher
+from asin_set import AsinSet, BloomFilter
+from transport import Transport
+from metrics import CrawlMetrics
+from Amazon.extraction_registry import (ASIN_IN_LINK, BULLET_SPLIT, CARD_PRODUCT_LINK, LISTING_CARD_CSS,
+                                        LISTING_CARDS, PAYLOAD_HINT, RANK_BADGE, REVIEW_COUNT, SCREEN_SIZE,
+                                        decode_json_escapes, iter_asins, listing_page_count, spec_field)
+
 # -------- Ayarlar --------
-BASE_URL = "https://www.amazon.com.tr/gp/bestsellers/computers/12601907031"
-PAGES = [1, 2]                    # çekilecek sayfalar: 1 ve 2
+# site kökü; yerel mock sunucuya yönlendirmek için SCRAPEWORKS_AMAZON_ROOT=http://127.0.0.1:8800
+SITE_ROOT = os.environ.get("SCRAPEWORKS_AMAZON_ROOT", "https://www.amazon.com.tr").rstrip("/")
+# kategoriler: "yol/node" listesi, ör. SCRAPEWORKS_AMAZON_CATEGORIES=computers/12601907031,electronics/12466496031
+CATEGORY_NODES = [c.strip() for c in os.environ.get("SCRAPEWORKS_AMAZON_CATEGORIES",
+                                                    "computers/12601907031").split(",") if c.strip()]
+MAX_PAGES = 2                     # kategori başına en fazla sayfa (gerçek sayı sayfalamadan keşfedilir)
 HEADERS_BASE = {
     "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -27,67 +55,162 @@ USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_5) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.5 Safari/605.1.15",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
 ]
-DELAY_RANGE = (0.8, 1.6)
+REQUESTS_PER_SECOND = 0.8       # domain başına başlangıç hızı (token bucket)
+BURST = 2                         # bucket kapasitesi
 RETRIES = 3
 DEFAULT_VALUE = "NonePublished"
 TARGET_PER_PAGE = 50
-session = requests.Session()
+OUTPUT_FILES = ["amazon_tablets_page1_2_full.csv"]   # .jsonl / .parquet da eklenebilir
+SNAPSHOT_SOURCE = "amazon_bestsellers"   # tipli Parquet snapshot'ı (snapshot_store.py; SCRAPEWORKS_SNAPSHOTS)
+OUTPUT_FIELDS = ["rank", "kategori", "link", "asin", "isim", "fiyat", "değerlendirilme sayısı", "Markası",
+                 "Modeli", "Ekran boyutu", "işletim sistemi", "rengi", "img", SCRAPED_AT_FIELD, FINGERPRINT_FIELD]
+# alan doluluğu ölçülen (sayfadan çıkarılan) alanlar
+EXTRACTED_FIELDS = [f for f in OUTPUT_FIELDS
+                    if f not in ("rank", "kategori", "link", "asin", SCRAPED_AT_FIELD, FINGERPRINT_FIELD)]
+WRITE_BATCH_SIZE = 10             # bu kadar kayıtta bir diske flush
+CHECKPOINT_PATH = "amazon_crawl_checkpoint.sqlite3"
+RESUME = os.environ.get("SCRAPEWORKS_FRESH") != "1"  # 1: checkpoint'i yok say, baştan başla
+# artımlı yenileme: önceki çalışmalarda (checkpoint'in published tablosu) aynı (kategori, rank) ile
+# duran ve REFRESH_MAX_AGE'den yeni ürünlerin sayfası yeniden çekilmez, önceki kayıt yeniden yazılır
+INCREMENTAL = os.environ.get("SCRAPEWORKS_INCREMENTAL") == "1"
+REFRESH_MAX_AGE = float(os.environ.get("SCRAPEWORKS_REFRESH_MAX_AGE", 3 * 24 * 3600))  # sn
+CONCURRENCY = 8                   # aynı anda uçuşta tutulacak ürün isteği
+PER_HOST_IN_FLIGHT = 4            # host başına eşzamanlı istek üst sınırı
+# ürün sayfaları ayrı süreçlerde ayrıştırılır (GIL'e takılmaz); 0: ana süreçte ayrıştır
+PARSE_WORKERS = int(os.environ.get("SCRAPEWORKS_PARSE_WORKERS", DEFAULT_PARSE_WORKERS))
+PARSE_QUEUE_SIZE = 2 * max(PARSE_WORKERS, 1)   # indirilmiş ama ayrıştırılmamış en fazla sayfa
+CACHE_DIR = ".httpcache"
+CACHE_TTL = 6 * 3600              # bu süreden yeni kayıtlar ağa çıkmadan kullanılır
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+CACHE_OFFLINE = os.environ.get("SCRAPEWORKS_OFFLINE") == "1"  # 1: yalnızca cache, ağ yok
+RENDER_MODE = os.environ.get("SCRAPEWORKS_RENDER", "hybrid")   # static: tarayıcıya hiç yükselme
+RENDER_HINTS_PATH = "render_hints.json"   # hangi listeleme URL'si render gerektirdi
+# verilirse önceki çalışmalarda kaydı yazılmış ASIN'ler atlanır (yalnızca yeni ürün keşfi)
+ASIN_BLOOM_PATH = os.environ.get("SCRAPEWORKS_ASIN_BLOOM")
+ASIN_BLOOM_CAPACITY = 5_000_000
+# çalışma sonu metrikleri: .json özet ya da .prom (Prometheus metni)
+METRICS_PATH = os.environ.get("SCRAPEWORKS_METRICS", "amazon_metrics.json")
+# ağ/disk kaynakları ilk get()/main() çağrısında kurulur: modülü import etmek (Scrapy spider'ı,
+# ayrıştırma worker süreçleri) .httpcache açmaz, DNS'i yamamaz. Önceden atanan değer korunur.
+session: Optional[Transport] = None     # keep-alive havuzu, DNS cache, SCRAPEWORKS_HTTP2=1 ile HTTP/2
+cache: Optional[ResponseCache] = None
+limiter: Optional[DomainRateLimiter] = None
+metrics: Optional[CrawlMetrics] = None
+
+
+def setup_runtime() -> None:
+    """session / cache / limiter / metrics henüz kurulmadıysa kurar."""
+    global session, cache, limiter, metrics
+    if session is None:
+        session = Transport(pool_maxsize=CONCURRENCY)
+    if cache is None:
+        cache = ResponseCache(CACHE_DIR, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES, offline=CACHE_OFFLINE)
+    if limiter is None:
+        limiter = DomainRateLimiter(rate=REQUESTS_PER_SECOND, burst=BURST)
+    if metrics is None:
+        metrics = CrawlMetrics("amazon_bestsellers")
 
 # -------- HTTP helper --------
 def get(url: str, retries: int = RETRIES, timeout: int = 12) -> Tuple[str, int]:
-    """Basit GET: user-agent rotasyonu ve retry. Döner (text, status)."""
+    """Basit GET: disk cache, user-agent rotasyonu, domain hız sınırı ve retry. Döner (text, status)."""
+    setup_runtime()
+    cached = cache.lookup(url)
+    if cached and cache.is_fresh(cached):
+        metrics.observe_cache_hit()
+        return cached.text, 200
+    if CACHE_OFFLINE:
+        return "", 0
     last_status = None
     for attempt in range(1, retries + 1):
         headers = HEADERS_BASE.copy()
         headers["User-Agent"] = random.choice(USER_AGENTS)
+        headers.update(cache.conditional_headers(cached))
+        limiter.wait(url)
+        started = time.monotonic()
         try:
             resp = session.get(url, headers=headers, timeout=timeout)
             last_status = resp.status_code
+            metrics.observe_fetch(url, time.monotonic() - started, resp.status_code, len(resp.content))
+            limiter.feedback(url, resp.status_code, resp.headers.get("Retry-After"))
+            if resp.status_code == 304 and cached:
+                cache.revalidated(url, resp.headers)
+                return cached.text, 200
             if resp.status_code == 200:
+                cache.store_response(url, resp)
                 return resp.text, resp.status_code
             else:
                 print(f"GET status {resp.status_code} (attempt {attempt}) for {url}")
+                if attempt < retries:
+                    metrics.observe_retry(resp.status_code)
+                    # 429/503'te bekleme limiter'da (hız yarıya iner, Retry-After); diğerlerinde üstel geri çekilme
+                    if resp.status_code not in BACKOFF_STATUSES:
+                        time.sleep(retry_delay(attempt))
         except Exception as e:
             print(f"GET exception (attempt {attempt}): {e}")
-        time.sleep(0.5 * attempt)
+            limiter.feedback(url, 503)  # bağlantı hatası: aşırı yük gibi davran, hızı düşür
+            if attempt < retries:
+                metrics.observe_retry("exception")
+                time.sleep(retry_delay(attempt))
     return "", last_status or 0
 
 # -------- yardımcıler --------
 def decode_escaped_payloads(text: str) -> str:
-    """HTML unescape + unicode_escape denemesi."""
+    """HTML unescape (gerekiyorsa) + yalnızca JSON kaçışları; ASCII dışı metin bozulmaz."""
+    if "&" in text:
+        text = html.unescape(text)
+    return decode_json_escapes(text)
+
+def parse_payload(raw: str):
+    """Payload attribute'unu JSON olarak yükle: önce olduğu gibi, olmazsa kaçışlar çözülerek. Olmazsa None."""
     try:
-        unescaped = html.unescape(text)
-        decoded = unescaped.encode("utf-8").decode("unicode_escape")
-        return decoded
-    except Exception:
-        return html.unescape(text)
+        return json.loads(raw)
+    except ValueError:
+        pass
+    decoded = decode_escaped_payloads(raw)
+    for candidate in (decoded, decoded.replace("'", '"')):
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            continue
+    return None
 
 def asin_from_link(link: str) -> str:
-    m = re.search(r"/dp/([A-Za-z0-9]{8,12})", link)
+    m = ASIN_IN_LINK.search(link)
     return m.group(1) if m else None
 
+def category_url(category: str) -> str:
+    return f"{SITE_ROOT}/gp/bestsellers/{category}"
+
+def listing_url(category: str, page: int) -> str:
+    return f"{category_url(category)}?ie=UTF8&pg={page}"
+
+def rank_number(rank) -> int:
+    """'#12' / '12' -> 12; sıra bilinmiyorsa None."""
+    digits = "".join(ch for ch in str(rank or "") if ch.isdigit())
+    return int(digits) if digits else None
+
 # -------- link toplama (DOM + payload + regex) --------
 def collect_products_from_page(raw_html: str, soup: BeautifulSoup, limit: int = TARGET_PER_PAGE,
-                               seen_global: set = None) -> List[Dict]:
+                               seen_global: AsinSet = None) -> List[Dict]:
     """
     Döndürür: list of { 'rank': '#1'|'1'|'NonePublished', 'link': 'https://.../dp/ASIN', 'asin': 'ASIN' }
     Öncelik: DOM kartları -> payload JSON -> raw regex. seen_global var ise onu kullanarak global duplikasyonu engeller.
     """
     if seen_global is None:
-        seen_global = set()
+        seen_global = AsinSet()
     products = []
-    seen_local = set()
+    seen_local = AsinSet()
 
     # 1) DOM tabanlı: ürün kartları
-    items = soup.select("div.zg-grid-general-faceout, div.p13n-sc-uncoverable-faceout, div._cDEzb_grid-cell_1uMOS")
+    items = LISTING_CARDS.select(soup)
     for item in items:
-        rank_tag = item.select_one(".zg-bdg-text")
+        rank_tag = RANK_BADGE.select_one(item)
         rank = rank_tag.get_text(strip=True) if rank_tag else DEFAULT_VALUE
-        a = item.select_one("a.a-link-normal[href*='/dp/']") or item.find("a", href=True)
+        a = CARD_PRODUCT_LINK.select_one(item) or item.find("a", href=True)
         if not a:
             continue
         href = a["href"].split("?")[0]
-        link = href if href.startswith("http") else "https://www.amazon.com.tr" + href
+        link = href if href.startswith("http") else SITE_ROOT + href
         asin = asin_from_link(link)
         if asin and asin not in seen_global and asin not in seen_local:
             products.append({"rank": rank, "link": link, "asin": asin})
@@ -100,17 +223,10 @@ def collect_products_from_page(raw_html: str, soup: BeautifulSoup, limit: int =
     for tag in soup.find_all(lambda t: any(a in t.attrs for a in attrs_to_try)):
         for attr in attrs_to_try:
             raw = tag.attrs.get(attr)
-            if not raw:
+            # ASIN ipucu taşımayan payload'lar (ör. sayfa durumu) hiç çözülmez
+            if not raw or not PAYLOAD_HINT.search(raw):
                 continue
-            decoded = decode_escaped_payloads(raw)
-            parsed = None
-            # try load
-            for candidate in (decoded, decoded.replace("'", '"')):
-                try:
-                    parsed = json.loads(candidate)
-                    break
-                except Exception:
-                    parsed = None
+            parsed = parse_payload(raw)
             # if parsed is dict containing list(s), try to find list of items
             list_candidates = []
             if isinstance(parsed, list):
@@ -131,28 +247,25 @@ def collect_products_from_page(raw_html: str, soup: BeautifulSoup, limit: int =
                         asin = None
                         rank = DEFAULT_VALUE
                     if asin and asin not in seen_global and asin not in seen_local:
-                        link = f"https://www.amazon.com.tr/dp/{asin}"
+                        link = f"{SITE_ROOT}/dp/{asin}"
                         products.append({"rank": rank, "link": link, "asin": asin})
                         seen_local.add(asin)
                         if len(products) >= limit:
                             return products
             else:
-                # fallback regex inside decoded payload
-                for m in re.finditer(r"/dp/([A-Za-z0-9]{8,12})", decoded):
-                    asin = m.group(1)
+                # fallback: ham payload içinde (kaçışlı biçimler dahil) /dp/ASIN taraması
+                for asin in iter_asins(raw):
                     if asin and asin not in seen_global and asin not in seen_local:
-                        link = f"https://www.amazon.com.tr/dp/{asin}"
+                        link = f"{SITE_ROOT}/dp/{asin}"
                         products.append({"rank": DEFAULT_VALUE, "link": link, "asin": asin})
                         seen_local.add(asin)
                         if len(products) >= limit:
                             return products
 
-    # 3) final fallback: raw regex over whole page (in-order)
-    decoded_text = decode_escaped_payloads(raw_html)
-    for m in re.finditer(r"/dp/([A-Za-z0-9]{8,12})", decoded_text):
-        asin = m.group(1)
+    # 3) final fallback: ham sayfa üzerinde akış halinde tarama (belge çözülmez, sıra korunur)
+    for asin in iter_asins(raw_html):
         if asin and asin not in seen_global and asin not in seen_local:
-            link = f"https://www.amazon.com.tr/dp/{asin}"
+            link = f"{SITE_ROOT}/dp/{asin}"
             products.append({"rank": DEFAULT_VALUE, "link": link, "asin": asin})
             seen_local.add(asin)
             if len(products) >= limit:
@@ -161,9 +274,92 @@ def collect_products_from_page(raw_html: str, soup: BeautifulSoup, limit: int =
     return products
 
 # -------- ürün detay çıkarma --------
-def extract_product_data(product_html: str, url: str, rank_value: str) -> Dict:
-    """Ürün sayfasından detayları çek (birden fazla selector dener)."""
-    soup = BeautifulSoup(product_html, "html.parser")
+# Tek geçişlik çıkarım planı. Her kural (alan, öncelik) üretir; bir alan için öncelik
+# sırası eski selector listelerinin sırasıdır, aynı kuralda belge sırasında ilk eleman kalır
+# (select_one ile aynı davranış). Kurallar:
+#   ID_RULES:      id -> (alan, öncelik, tag şartı ya da None)
+#   CLASS_RULES:   (tag ya da None, class) -> (alan, öncelik)
+ID_RULES = {
+    "productTitle": ("isim", 0, None), "title": ("isim", 0, None),
+    "priceblock_ourprice": ("fiyat", 0, None), "priceblock_dealprice": ("fiyat", 1, None),
+    "price_inside_buybox": ("fiyat", 3, None),
+    "acrCustomerReviewText": ("reviews", 0, None), "acrCustomerReviewLink": ("reviews", 0, None),
+    "landingImage": ("img", 0, None), "imgBlkFront": ("img", 0, "img"), "main-image": ("img", 0, "img"),
+}
+CLASS_RULES = {
+    (None, "a-color-price"): ("fiyat", 4),
+    ("img", "a-dynamic-image"): ("img", 0), ("img", "s-image"): ("img", 0),
+}
+OFFSCREEN_PRICE = ("fiyat", 2)            # span.a-price span.a-offscreen
+SPEC_TABLE_IDS = {"productDetails_techSpec_section_1", "productDetails_detailBullets_sections1",
+                  "productDetails_techSpec_section_2"}
+DETAIL_BULLETS_ID = "detailBullets_feature_div"
+# ekran boyutu bulanık araması yalnızca bu alt ağaçlarda yapılır (tüm sayfa metni yerine)
+SCREEN_FALLBACK_IDS = {"productTitle", "feature-bullets", "productOverview_feature_div",
+                       "poExpander", DETAIL_BULLETS_ID} | SPEC_TABLE_IDS
+
+
+def _has_ancestor(el, target) -> bool:
+    for parent in el.parents:
+        if parent is target:
+            return True
+    return False
+
+
+def _selector_label(el) -> str:
+    """Metrikler için alanı dolduran elemanın kısa CSS etiketi (#id ya da tag.class)."""
+    if el.get("id"):
+        return "#" + el["id"]
+    classes = el.get("class")
+    return f"{el.name}.{classes[0]}" if classes else el.name
+
+
+def _scan_product_tree(soup) -> Tuple[Dict, List, List, List]:
+    """
+    Ağacı bir kez dolaşır. Döner: (ilk eşleşmeler {(alan, öncelik): el}, spec tablo satırları,
+    detail bullet li'leri, ekran fallback alt ağaçları).
+    """
+    firsts: Dict[Tuple[str, int], object] = {}
+    spec_tables, rows, bullets, fallback_roots = [], [], [], []
+    bullets_root = None
+    for el in soup.find_all(True):
+        el_id = el.get("id")
+        if el_id:
+            rule = ID_RULES.get(el_id)
+            if rule and (rule[2] is None or rule[2] == el.name):
+                firsts.setdefault(rule[:2], el)
+            if el_id in SPEC_TABLE_IDS and el.name == "table":
+                spec_tables.append(el)
+            elif el_id == DETAIL_BULLETS_ID and bullets_root is None:
+                bullets_root = el
+            if el_id in SCREEN_FALLBACK_IDS:
+                fallback_roots.append(el)
+        classes = el.get("class")
+        if classes:
+            for cls in classes:
+                rule = CLASS_RULES.get((el.name, cls)) or CLASS_RULES.get((None, cls))
+                if rule:
+                    firsts.setdefault(rule, el)
+            if (OFFSCREEN_PRICE not in firsts and el.name == "span" and "a-offscreen" in classes
+                    and el.find_parent("span", class_="a-price")):
+                firsts[OFFSCREEN_PRICE] = el
+        if el.name == "a" and ("reviews", 0) not in firsts and "product-reviews" in (el.get("href") or ""):
+            firsts[("reviews", 0)] = el
+        elif el.name == "tr" and spec_tables and any(_has_ancestor(el, t) for t in spec_tables):
+            rows.append(el)
+        elif el.name == "li" and bullets_root is not None and _has_ancestor(el, bullets_root):
+            bullets.append(el)
+    return firsts, rows, bullets, fallback_roots
+
+
+def extract_product_data(product_html: str, url: str, rank_value: str, sources: Dict = None) -> Dict:
+    """
+    Ürün sayfasından detayları çek (birden fazla selector dener, ağaç tek geçişte dolaşılır).
+    sources verilirse her dolan alan için onu dolduran selector etiketi yazılır (metrikler için).
+    """
+    if sources is None:
+        sources = {}
+    soup = make_soup(product_html)
     data = {
         "rank": rank_value or DEFAULT_VALUE,
         "link": url,
@@ -178,70 +374,109 @@ def extract_product_data(product_html: str, url: str, rank_value: str) -> Dict:
         "rengi": DEFAULT_VALUE,
         "img": DEFAULT_VALUE,
     }
+    firsts, rows, bullets, fallback_roots = _scan_product_tree(soup)
 
     # isim
-    t = soup.select_one("#productTitle, #title, span#productTitle")
+    t = firsts.get(("isim", 0))
     if t:
         data["isim"] = t.get_text(strip=True)
+        sources["isim"] = _selector_label(t)
 
-    # fiyat
-    price_selectors = ("#priceblock_ourprice", "#priceblock_dealprice",
-                       "span.a-price span.a-offscreen", "#price_inside_buybox", ".a-color-price")
-    for sel in price_selectors:
-        p = soup.select_one(sel)
+    # fiyat (öncelik sırasıyla, boş olmayan ilk aday)
+    for priority in range(5):
+        p = firsts.get(("fiyat", priority))
         if p and p.get_text(strip=True):
             data["fiyat"] = p.get_text(strip=True)
+            sources["fiyat"] = _selector_label(p)
             break
 
     # değerlendirme sayısı
-    rc = soup.select_one("#acrCustomerReviewText, #acrCustomerReviewLink, a[href*='product-reviews']")
+    rc = firsts.get(("reviews", 0))
     if rc and rc.get_text(strip=True):
-        num = re.search(r"(\d[\d\.]*)", rc.get_text(strip=True))
+        num = REVIEW_COUNT.search(rc.get_text(strip=True))
         if num:
             try:
                 data["değerlendirilme sayısı"] = int(num.group(1).replace(".", ""))
+                sources["değerlendirilme sayısı"] = _selector_label(rc)
             except Exception:
                 data["değerlendirilme sayısı"] = DEFAULT_VALUE
 
     # teknik detaylar tablolar
-    tables = soup.select("table#productDetails_techSpec_section_1, table#productDetails_detailBullets_sections1, table#productDetails_techSpec_section_2")
-    for table in tables:
-        for row in table.select("tr"):
-            th = row.select_one("th"); td = row.select_one("td")
-            if not th or not td: continue
-            key = th.get_text(strip=True).lower()
-            val = td.get_text(strip=True)
-            if "marka" in key or "brand" in key: data["Markası"] = val
-            elif "model" in key: data["Modeli"] = val
-            elif "ekran" in key or "display" in key or "inch" in key: data["Ekran boyutu"] = val
-            elif "işletim" in key or "operating system" in key: data["işletim sistemi"] = val
-            elif "renk" in key or "colour" in key or "color" in key: data["rengi"] = val
+    for row in rows:
+        th = row.find("th"); td = row.find("td")
+        if not th or not td: continue
+        field = spec_field(th.get_text(strip=True))
+        if field:
+            data[field] = td.get_text(strip=True)
+            sources[field] = "spec_table"
 
     # detail bullets
-    for li in soup.select("#detailBullets_feature_div li"):
+    for li in bullets:
         text = li.get_text(" ", strip=True)
-        parts = [p.strip() for p in re.split(r":|\n", text) if p.strip()]
+        parts = [p.strip() for p in BULLET_SPLIT.split(text) if p.strip()]
         if len(parts) >= 2:
-            k = parts[0].lower(); v = parts[1]
-            if "marka" in k or "brand" in k: data["Markası"] = v
-            elif "model" in k: data["Modeli"] = v
-            elif "ekran" in k or "inch" in k: data["Ekran boyutu"] = v
-            elif "işletim" in k or "operating" in k: data["işletim sistemi"] = v
-            elif "renk" in k or "color" in k: data["rengi"] = v
-
-    # fallback ekran bulanık arama
+            field = spec_field(parts[0])
+            if field:
+                data[field] = parts[1]
+                sources[field] = "detail_bullets"
+
+    # fallback ekran bulanık arama (yalnızca ilgili alt ağaçlar)
     if data["Ekran boyutu"] == DEFAULT_VALUE:
-        m = re.search(r"(\d{2}\.?(\d)?\s*(inç|inch|\"))", soup.get_text(" ", strip=True), flags=re.IGNORECASE)
-        if m:
-            data["Ekran boyutu"] = m.group(1)
+        for root in fallback_roots:
+            m = SCREEN_SIZE.search(root.get_text(" ", strip=True))
+            if m:
+                data["Ekran boyutu"] = m.group(1)
+                sources["Ekran boyutu"] = _selector_label(root) + " (regex)"
+                break
 
     # görsel
-    img = soup.select_one("#landingImage, img#imgBlkFront, img.a-dynamic-image, img#main-image, img.s-image")
+    img = firsts.get(("img", 0))
     if img and img.get("src"):
         data["img"] = img.get("src")
+        sources["img"] = _selector_label(img)
 
     return data
 
+def parse_product(meta: Dict, product_html: str) -> Tuple[Dict, Dict, float]:
+    """
+    Parse worker'ında çalışır (modül seviyesinde, picklable): (kayıt, alan -> selector etiketi,
+    ayrıştırma süresi). Kayıt asin/rank/fingerprint ile tamamlanmış döner; HTML geri taşınmaz.
+    """
+    started = time.perf_counter()
+    sources = {}
+    rec = extract_product_data(product_html, meta["link"], meta.get("rank"), sources)
+    # ensure asin/rank preserved
+    rec["asin"] = meta["asin"]
+    if not rec.get("rank"):
+        rec["rank"] = meta.get("rank", DEFAULT_VALUE)
+    rec["kategori"] = meta.get("kategori", DEFAULT_VALUE)
+    rec[SCRAPED_AT_FIELD] = utc_now()
+    rec[FINGERPRINT_FIELD] = row_fingerprint(rec)
+    return rec, sources, time.perf_counter() - started
+
+# -------- artımlı yenileme --------
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+def refresh_reason(meta: Dict, previous: Optional[Dict], now: datetime,
+                   max_age: float = REFRESH_MAX_AGE) -> Optional[str]:
+    """Ürün sayfasının yeniden çekilme sebebi ("yeni", "sıra", "eski"); önceki kayıt geçerliyse None."""
+    if previous is None:
+        return "yeni"
+    # "#3" ile "3" aynı sıradır (DOM rozeti / payload); sıra okunamadıysa metinler karşılaştırılır
+    old_rank, new_rank = rank_number(previous.get("rank")), rank_number(meta.get("rank"))
+    if old_rank != new_rank or (new_rank is None and previous.get("rank") != meta.get("rank")):
+        return "sıra"
+    if previous.get("kategori") and previous["kategori"] != meta.get("kategori"):
+        return "sıra"
+    try:
+        scraped_at = datetime.fromisoformat(previous[SCRAPED_AT_FIELD])
+    except (KeyError, TypeError, ValueError):
+        return "eski"
+    if scraped_at.tzinfo is None:
+        scraped_at = scraped_at.replace(tzinfo=timezone.utc)
+    return "eski" if (now - scraped_at).total_seconds() > max_age else None
+
 # -------- terminal gösterim helper (düz tablo) --------
 def print_table_plain(df: pd.DataFrame):
     display_df = df.drop(columns=["img", "link"], errors="ignore").fillna(DEFAULT_VALUE)
@@ -256,69 +491,191 @@ def print_table_plain(df: pd.DataFrame):
 
 # -------- main --------
 def main():
-    all_products_meta: List[Dict] = []
-    seen_asins = set()
-
-    # 1) sayfaları sırayla topla (page 1 ve 2)
-    for page in PAGES:
-        page_url = f"{BASE_URL}?ie=UTF8&pg={page}"
-        print(f"\nSayfa çekiliyor: {page_url}")
-        raw_text, status = get(page_url)
-        if status != 200 or not raw_text:
-            print(f"Sayfa alınamadı. status={status}")
+    setup_runtime()
+    checkpoint = CrawlCheckpoint(CHECKPOINT_PATH, run_key=" ".join(category_url(c) for c in CATEGORY_NODES))
+    if not RESUME:
+        checkpoint.reset()
+    # önceki yarım kalmış çalışmadan kalanlar (yoksa boş)
+    all_products_meta: List[Dict] = checkpoint.products_meta()
+    # kalıcı filtreye yalnızca kaydı yazılan ASIN'ler eklenir (sayfası alınamayanlar sonraki
+    # çalışmalarda yeniden denenir); dosya çalışma başarıyla bitince kaydedilir
+    bloom = BloomFilter(ASIN_BLOOM_CAPACITY, path=ASIN_BLOOM_PATH) if ASIN_BLOOM_PATH else None
+    seen_asins = AsinSet((p["asin"] for p in all_products_meta),
+                         capacity=len(CATEGORY_NODES) * MAX_PAGES * TARGET_PER_PAGE)
+    page_count = None             # son ayrıştırılan listeleme sayfasının sayfalamasındaki sayfa sayısı
+    card_count = 0                # son ayrıştırılan listeleme sayfasındaki ham kart sayısı (dedupe öncesi)
+
+    def extract_listing(text):
+        nonlocal page_count, card_count
+        with metrics.time_parse("listing"):
+            soup = make_soup(text)
+            page_count = listing_page_count(soup)
+            card_count = len(LISTING_CARDS.select(soup))
+            return collect_products_from_page(text, soup, limit=TARGET_PER_PAGE, seen_global=seen_asins)
+
+    # statik HTML'de kart sayısı yetmezse yalnızca o sayfa headless tarayıcıda render edilir
+    fetcher = None
+    if RENDER_MODE == "hybrid" and not CACHE_OFFLINE:
+        fetcher = HybridFetcher(get, LISTING_CARD_CSS, min_count=TARGET_PER_PAGE, hints_path=RENDER_HINTS_PATH,
+                                limiter=limiter, user_agent=random.choice(USER_AGENTS))
+
+    # 1) listeleme sayfaları: önce tüm kategorilerin 1. sayfası; kalan sayfalar 1. sayfanın
+    # sayfalamasından keşfedilip kuyruğa eklenir. Sayfalar ortak seen_asins kümesini
+    # güncellediği için sırayla işlenir (ürün isteklerinin yanında sayıca azdır).
+    errors = []                   # alınamayan listeleme/ürün URL'leri; varsa checkpoint silinmez
+    listings = CrawlScheduler()
+    for idx, category in enumerate(CATEGORY_NODES):
+        listings.push((idx, 1), listing_url(category, 1), listing_priority(1, idx))
+    for (idx, page), page_url in listings:
+        category = CATEGORY_NODES[idx]
+        page_products = None
+        if checkpoint.page_done(page_url):
+            print(f"\nSayfa checkpoint'te var, atlanıyor: {page_url}")
+        else:
+            print(f"\nSayfa çekiliyor: {page_url}")
+            page_count, card_count = None, 0
+            if fetcher:
+                # yeterlilik ham kart sayısına bakar: önceki sayfalarda görülen ürünler eleneceği için
+                # tekilleştirilmiş liste dolu bir sayfada da kısa kalabilir
+                result = fetcher.fetch(page_url, extract_listing, lambda found: card_count >= TARGET_PER_PAGE)
+                raw_text, status, page_products = result.html, result.status, result.extracted
+                if result.rendered:
+                    print("  Statik HTML yetersizdi, sayfa tarayıcıda render edildi.")
+            else:
+                raw_text, status = get(page_url)
+                page_products = extract_listing(raw_text) if status == 200 and raw_text else None
+            if status != 200 or not raw_text:
+                print(f"Sayfa alınamadı. status={status}")
+                page_products = None
+                errors.append(page_url)
+        if page == 1:
+            # sayfa sayısı bilinmiyorsa (checkpoint / hata) üst sınıra kadar denenir;
+            # sayfalama yoksa dolu bir sayfanın devamı olduğu varsayılır
+            if page_products is None:
+                last = MAX_PAGES
+            elif page_count:
+                last = min(page_count, MAX_PAGES)
+            else:
+                last = MAX_PAGES if card_count >= TARGET_PER_PAGE else 1
+            for next_page in range(2, last + 1):
+                listings.push((idx, next_page), listing_url(category, next_page), listing_priority(next_page, idx))
+        if page_products is None:
             continue
-        soup = BeautifulSoup(raw_text, "html.parser")
-        page_products = collect_products_from_page(raw_text, soup, limit=TARGET_PER_PAGE, seen_global=seen_asins)
         print(f"  Bu sayfadan bulunan (unique) ürün sayısı: {len(page_products)}")
         # append and update global seen
+        new_products = []
         for p in page_products:
-            if p["asin"] not in seen_asins:
-                all_products_meta.append(p)
-                seen_asins.add(p["asin"])
-        # polite pause between pages
-        time.sleep(random.uniform(*DELAY_RANGE))
+            if bloom is not None and p["asin"] in bloom:
+                continue  # önceki bir çalışmada görüldü
+            if seen_asins.add(p["asin"]):
+                p["kategori"] = category
+                new_products.append(p)
+        all_products_meta.extend(new_products)
+        checkpoint.save_page(page_url, new_products)
 
+    if fetcher:
+        fetcher.close()
     total_meta = len(all_products_meta)
-    print(f"\nToplam benzersiz ürün meta (sayfa1+2): {total_meta}")
+    print(f"\nToplam benzersiz ürün meta ({len(CATEGORY_NODES)} kategori): {total_meta}")
 
     if not all_products_meta:
         print("Hiç ürün meta bulunamadı. Çalışma sonlandırılıyor.")
+        checkpoint.close()
+        metrics.export(METRICS_PATH)
         return
 
-    # 2) Her ürünün detayını çek
-    product_records = []
-    errors = []
-    for idx, meta in enumerate(all_products_meta, start=1):
-        print(f"Çekiliyor ({idx}/{len(all_products_meta)}) rank={meta.get('rank')} asin={meta.get('asin')}")
-        html_text, st = get(meta["link"])
-        if st != 200 or not html_text:
+    # 2) Her ürünün detayını çek (eşzamanlı; her kayıt geldiği anda diske yazılır).
+    # Artımlı modda önceki kayıtlar checkpoint'te yayımlanmış olanlardır (çıktı dosyası yarım kalmış olabilir).
+    previous = checkpoint.published_records() if INCREMENTAL else {}
+    writer = MultiWriter([open_writer(path, fieldnames=OUTPUT_FIELDS, batch_size=WRITE_BATCH_SIZE,
+                                      encoding="utf-8-sig") for path in OUTPUT_FILES]
+                         + snapshot_writers(SNAPSHOT_SOURCE, OUTPUT_FIELDS))
+
+    def emit(asin, rec):
+        writer.write(rec)
+        if bloom is not None:
+            bloom.add(asin)
+
+    completed = checkpoint.completed_asins()
+    if completed:
+        print(f"Checkpoint: {len(completed)} ürün daha önce çekilmiş, yeniden yazılıyor.")
+        for rec in checkpoint.records():
+            emit(rec["asin"], rec)
+    # üst sıradaki ürünler önce; aynı sıradakiler kategoriler arasında dönüşümlü
+    category_index = {c: i for i, c in enumerate(CATEGORY_NODES)}
+    jobs = CrawlScheduler()
+    now = datetime.now(timezone.utc)
+    reasons = Counter()
+    for meta in all_products_meta:
+        if meta["asin"] in completed:
+            continue
+        if INCREMENTAL:
+            reason = refresh_reason(meta, previous.get(meta["asin"]), now)
+            if reason is None:
+                # listeleme verisi değişmedi: kayıt aynen kullanılır (checkpoint'e de yazılır)
+                rec = dict(previous[meta["asin"]], kategori=meta.get("kategori", DEFAULT_VALUE))
+                rec[FINGERPRINT_FIELD] = row_fingerprint(rec)
+                emit(meta["asin"], rec)
+                checkpoint.save_record(meta["asin"], rec)
+                reasons["aynen"] += 1
+                continue
+            reasons[reason] += 1
+        jobs.push(meta, meta["link"], product_priority(rank_number(meta.get("rank")),
+                                                       category_index.get(meta.get("kategori"), 0)))
+    total = len(jobs)
+    if INCREMENTAL:
+        print(f"Artımlı yenileme: {reasons['aynen']} kayıt önceki çalışmadan kullanıldı; çekilecek {total} "
+              f"(yeni {reasons['yeni']}, sırası değişen {reasons['sıra']}, "
+              f"{REFRESH_MAX_AGE / 3600:g} saatten eski {reasons['eski']})")
+    done = 0
+
+    def handle_product(meta, parsed, st):
+        nonlocal done
+        done += 1
+        print(f"Alındı ({done}/{total}) rank={meta.get('rank')} asin={meta.get('asin')}")
+        if parsed is None:
             print(f"  Ürün sayfası alınamadı. status={st}")
             errors.append(meta["link"])
-            time.sleep(random.uniform(*DELAY_RANGE))
-            continue
-        rec = extract_product_data(html_text, meta["link"], meta.get("rank"))
-        # ensure asin/rank preserved
-        rec["asin"] = meta["asin"]
-        if not rec.get("rank"):
-            rec["rank"] = meta.get("rank", DEFAULT_VALUE)
-        product_records.append(rec)
-        time.sleep(random.uniform(*DELAY_RANGE))
-
-    # 3) Kaydet + göster
-    df = pd.DataFrame(product_records).fillna(DEFAULT_VALUE)
-    csv_filename = "amazon_tablets_page1_2_full.csv"
-    df.to_csv(csv_filename, index=False, encoding="utf-8-sig")
-    print(f"\nCSV dosyası kaydedildi: {csv_filename}")
+            return
+        rec, sources, parse_seconds = parsed
+        metrics.observe_parse("product", parse_seconds)
+        metrics.observe_fields(rec, EXTRACTED_FIELDS, missing=(DEFAULT_VALUE, "", None), sources=sources)
+        emit(meta["asin"], rec)
+        metrics.observe_item()
+        checkpoint.save_record(meta["asin"], rec)
 
+    # istekler arası bekleme get() içindeki limiter'da; burada yalnızca eşzamanlılık sınırı var.
+    # Listeleme sayfaları ortak seen_asins kümesine bağlı olduğundan ana süreçte ayrıştırılır.
+    with writer:
+        fetch_parse_all(jobs, get, parse_product, handle_product, parse_workers=min(PARSE_WORKERS, total),
+                        queue_size=PARSE_QUEUE_SIZE, concurrency=CONCURRENCY, per_host=PER_HOST_IN_FLIGHT)
+    # tamamlanan kayıtlar (hatalı ürünler hariç) sonraki artımlı çalışmalar için yayımlanır
+    checkpoint.publish()
+    if bloom is not None:
+        bloom.save()
+
+    # 3) Göster (kayıtlar zaten yazıldı; tablo CSV'den okunur)
+    csv_filename = OUTPUT_FILES[0]
+    print(f"\nKaydedildi ({writer.count} ürün): {', '.join(OUTPUT_FILES)}")
+    df = pd.read_csv(csv_filename, encoding="utf-8-sig", dtype=str).fillna(DEFAULT_VALUE)
     print_table_plain(df)
 
+    print("\nBağlantı istatistikleri:")
+    print(session.report())
+    print(f"\nMetrikler ({METRICS_PATH}):")
+    print(metrics.report())
+    metrics.export(METRICS_PATH)
+
     # Hatalar raporu
     if errors:
-        print("\nBazı ürünler alınamadı (örnek):")
+        print(f"\nBazı sayfalar alınamadı ({len(errors)}, örnek):")
         for e in errors[:10]:
             print(" -", e)
+        print(f"Checkpoint korundu ({CHECKPOINT_PATH}); yeniden çalıştırınca yalnızca bunlar denenecek.")
     else:
         print("\nTüm ürünler başarılı şekilde alındı.")
+        checkpoint.reset()
+    checkpoint.close()
 
 if __name__ == "__main__":
     main()
@@ -1,45 +1,103 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+import os
+import sys
 import time
-import random
+from pathlib import Path
+from typing import Optional
+import pandas as pd
 from tabulate import tabulate
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # books_scraper/ ortak modülleri
+from rate_limiter import DomainRateLimiter
+from http_cache import ResponseCache
+from parsers import make_soup
+from exporters import CsvStreamWriter, MultiWriter
+from snapshot_store import snapshot_writers
+from asin_set import AsinSet
+from transport import Transport
+from metrics import CrawlMetrics
+from Amazon.extraction_registry import ASIN_IN_LINK, listing_page_count, spec_field
+
 # -------------------------------
 # Ayarlar
 # -------------------------------
-BASE_URL = "https://www.amazon.com.tr/gp/bestsellers/computers/12601907031/ref=zg_bs_pg_1_computers?ie=UTF8&pg="
+# site kökü; yerel mock sunucuya yönlendirmek için SCRAPEWORKS_AMAZON_ROOT=http://127.0.0.1:8800
+SITE_ROOT = os.environ.get("SCRAPEWORKS_AMAZON_ROOT", "https://www.amazon.com.tr").rstrip("/")
+BASE_URL = f"{SITE_ROOT}/gp/bestsellers/computers/12601907031/ref=zg_bs_pg_1_computers?ie=UTF8&pg="
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36",
     "Accept-Language": "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7"
 }
-DELAY_RANGE = (2, 6)  # istekler arası rastgele delay (saniye)
-MAX_PAGES = 5  # örnek olarak ilk 5 sayfa, istenirse arttırılabilir
+REQUESTS_PER_SECOND = 0.25  # domain başına başlangıç hızı (eski 2-6 sn bekleme ortalaması)
+MAX_PAGES = 5  # en fazla bu kadar sayfa; gerçek sayfa sayısı 1. sayfanın sayfalamasından okunur
+OUTPUT_FILE = "amazon_tablets.csv"
+SNAPSHOT_SOURCE = "amazon_tablets"   # tipli Parquet snapshot'ı (snapshot_store.py; SCRAPEWORKS_SNAPSHOTS)
+METRICS_PATH = os.environ.get("SCRAPEWORKS_METRICS", "amazon_tablets_metrics.json")  # .json ya da .prom
+CACHE_OFFLINE = os.environ.get("SCRAPEWORKS_OFFLINE") == "1"  # 1: yalnızca cache, ağ yok
+# ağ/disk kaynakları ilk get_soup()/main() çağrısında kurulur (import .httpcache açmaz, DNS'i
+# yamamaz); önceden atanan değer korunur
+limiter: Optional[DomainRateLimiter] = None
+cache: Optional[ResponseCache] = None
+session: Optional[Transport] = None     # her istekte yeni TCP+TLS yerine keep-alive
+metrics: Optional[CrawlMetrics] = None
+
+
+def setup_runtime() -> None:
+    """limiter / cache / session / metrics henüz kurulmadıysa kurar."""
+    global limiter, cache, session, metrics
+    if limiter is None:
+        limiter = DomainRateLimiter(rate=REQUESTS_PER_SECOND, burst=1)
+    if cache is None:
+        cache = ResponseCache(".httpcache", offline=CACHE_OFFLINE)
+    if session is None:
+        session = Transport(pool_maxsize=2, headers=HEADERS)
+    if metrics is None:
+        metrics = CrawlMetrics("amazon_tablets")
 
 # -------------------------------
 # Yardımcı fonksiyonlar
 # -------------------------------
-def get_soup(url):
-    """URL'den BeautifulSoup objesi döndürür, hata varsa None döner."""
+def timed_soup(text, kind):
+    with metrics.time_parse(kind):
+        return make_soup(text)
+
+def get_soup(url, kind="product"):
+    """URL'den BeautifulSoup objesi döndürür (disk cache'li), hata varsa None döner."""
+    setup_runtime()
+    cached = cache.lookup(url)
+    if cached and cache.is_fresh(cached):
+        metrics.observe_cache_hit()
+        return timed_soup(cached.text, kind)
+    if CACHE_OFFLINE:
+        return None
+    limiter.wait(url)
+    started = time.monotonic()
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
+        response = session.get(url, headers=cache.conditional_headers(cached), timeout=15)
+        metrics.observe_fetch(url, time.monotonic() - started, response.status_code, len(response.content))
+        limiter.feedback(url, response.status_code, response.headers.get("Retry-After"))
+        if response.status_code == 304 and cached:
+            cache.revalidated(url, response.headers)
+            return timed_soup(cached.text, kind)
         if response.status_code != 200:
             print(f"  Hata {response.status_code} ile {url}")
             return None
-        return BeautifulSoup(response.text, "html.parser")
+        cache.store_response(url, response)
+        return timed_soup(response.text, kind)
     except Exception as e:
         print(f"  İstek sırasında hata: {e}")
+        limiter.feedback(url, 503)
         return None
 
 def extract_product_links(soup):
-    """Ana sayfadaki ürün linklerini döndürür"""
+    """Ana sayfadaki ürün linklerini sıralamadaki sırayla döndürür (ASIN başına bir link)"""
     links = []
+    seen = AsinSet()
     for a in soup.select("div.zg-grid-general-faceout a.a-link-normal"):
         href = a.get("href")
-        if href and "/dp/" in href:
-            full_link = "https://www.amazon.com.tr" + href.split("?")[0]
-            links.append(full_link)
-    return list(set(links))  # tekrarları kaldır
+        m = ASIN_IN_LINK.search(href) if href else None
+        if m and seen.add(m.group(1)):
+            links.append(SITE_ROOT + href.split("?")[0])
+    return links
 
 def extract_product_data(soup, product_url):
     """Ürün sayfasından istenen bilgileri alır"""
@@ -79,35 +137,17 @@ def extract_product_data(soup, product_url):
                 td = row.select_one("td")
                 if not th or not td:
                     continue
-                key = th.get_text(strip=True).lower()
-                value = td.get_text(strip=True)
-                if "marka" in key:
-                    data["Markası"] = value
-                elif "model" in key:
-                    data["Modeli"] = value
-                elif "ekran" in key or "display" in key:
-                    data["Ekran boyutu"] = value
-                elif "işletim" in key or "operating system" in key:
-                    data["işletim sistemi"] = value
-                elif "renk" in key or "colour" in key or "color" in key:
-                    data["rengi"] = value
+                field = spec_field(th.get_text(strip=True))
+                if field:
+                    data[field] = td.get_text(strip=True)
 
         # Bazı ürünlerde detaylar "div#detailBullets_feature_div" altında
         bullets = soup.select("div#detailBullets_feature_div li span.a-text-bold")
         for b in bullets:
-            key = b.get_text(strip=True).lower()
-            val = b.find_next("span").get_text(strip=True)
-            if "marka" in key:
-                data["Markası"] = val
-            elif "model" in key:
-                data["Modeli"] = val
-            elif "ekran" in key or "display" in key:
-                data["Ekran boyutu"] = val
-            elif "işletim" in key or "operating system" in key:
-                data["işletim sistemi"] = val
-            elif "renk" in key or "colour" in key or "color" in key:
-                data["rengi"] = val 
-            
+            field = spec_field(b.get_text(strip=True))
+            if field:
+                data[field] = b.find_next("span").get_text(strip=True)
+
     except:
         pass
 
@@ -116,51 +156,68 @@ def extract_product_data(soup, product_url):
 # -------------------------------
 # Ana iş akışı
 # -------------------------------
-all_products = []
-errors = []
-
-for page in range(1, MAX_PAGES + 1):
-    print(f"\n Sayfa {page} çekiliyor...")
-    soup = get_soup(BASE_URL + str(page))
-    if not soup:
-        errors.append(f"Sayfa {page} çekilemedi")
-        continue
-
-    links = extract_product_links(soup)
-    print(f" {len(links)} ürün linki bulundu")
-    
-    for idx, link in enumerate(links, 1):
-        print(f"   Ürün {idx}/{len(links)}: {link}")
-        product_soup = get_soup(link)
-        if not product_soup:
-            errors.append(f"Ürün çekilemedi: {link}")
-            continue
-        product_data = extract_product_data(product_soup, link)  # link parametresi eklendi
-        all_products.append(product_data)
-        sleep_time = random.uniform(*DELAY_RANGE)
-        print(f"      {sleep_time:.2f}s bekleniyor...")
-        time.sleep(sleep_time)
+def main():
+    setup_runtime()
+    # kayıtlar geldikçe yazılır
+    writer = MultiWriter([CsvStreamWriter(OUTPUT_FILE, batch_size=10, encoding="utf-8-sig")]
+                         + snapshot_writers(SNAPSHOT_SOURCE))
+    errors = []
 
-# -------------------------------
-# CSV Kaydı
-# -------------------------------
-df = pd.DataFrame(all_products)
-csv_filename = "amazon_tablets.csv"
-df.to_csv(csv_filename, index=False, encoding="utf-8-sig")
-print(f"\n CSV dosyası kaydedildi: {csv_filename}")
+    # hata/kesintide de o ana kadarki kayıtlar flush edilip dosyalar kapanır
+    with writer:
+        last_page = MAX_PAGES
+        page = 0
+        while page < last_page:
+            page += 1
+            print(f"\n Sayfa {page} çekiliyor...")
+            soup = get_soup(BASE_URL + str(page), kind="listing")
+            if not soup:
+                errors.append(f"Sayfa {page} çekilemedi")
+                continue
+            if page == 1:
+                last_page = min(listing_page_count(soup) or MAX_PAGES, MAX_PAGES)
 
-# -------------------------------
-# Terminalde tablo olarak göster
-# -------------------------------
-print("\n Ürün listesi:")
-print(tabulate(df, headers="keys", tablefmt="fancy_grid", showindex=True))
+            links = extract_product_links(soup)
+            print(f" {len(links)} ürün linki bulundu")
 
-# -------------------------------
-# Hatalar
-# -------------------------------
-if errors:
-    print("\n  Hatalar tespit edildi:")
-    for e in errors:
-        print(" -", e)
-else:
-    print("\n Tüm ürünler başarıyla çekildi")
+            for idx, link in enumerate(links, 1):
+                print(f"   Ürün {idx}/{len(links)}: {link}")
+                product_soup = get_soup(link)
+                if not product_soup:
+                    errors.append(f"Ürün çekilemedi: {link}")
+                    continue
+                with metrics.time_parse("product_extract"):
+                    product_data = extract_product_data(product_soup, link)  # link parametresi eklendi
+                writer.write(product_data)
+                metrics.observe_item()
+                metrics.observe_fields(product_data, [k for k in product_data if k != "link"])
+
+    # -------------------------------
+    # CSV Kaydı
+    # -------------------------------
+    print(f"\n CSV dosyası kaydedildi: {OUTPUT_FILE} ({writer.count} ürün)")
+    df = pd.read_csv(OUTPUT_FILE, encoding="utf-8-sig") if writer.count else pd.DataFrame()
+
+    # -------------------------------
+    # Terminalde tablo olarak göster
+    # -------------------------------
+    print("\n Ürün listesi:")
+    print(tabulate(df, headers="keys", tablefmt="fancy_grid", showindex=True))
+
+    print("\n Bağlantı istatistikleri:")
+    print(session.report())
+    print(metrics.report())
+    metrics.export(METRICS_PATH)
+
+    # -------------------------------
+    # Hatalar
+    # -------------------------------
+    if errors:
+        print("\n  Hatalar tespit edildi:")
+        for e in errors:
+            print(" -", e)
+    else:
+        print("\n Tüm ürünler başarıyla çekildi")
+
+if __name__ == "__main__":
+    main()
@@ -1,71 +1,242 @@
+import argparse
+import sys
+import tempfile
+import numpy as np
 import pandas as pd
+from pathlib import Path
+from typing import NamedTuple
 from tabulate import tabulate
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # books_scraper/ ortak modülleri
+from fingerprint import EXCLUDED_FIELDS, FINGERPRINT_FIELD
+from snapshot_store import SNAPSHOT_ROOT, SnapshotStore, read_snapshot
+
 # -------------------------------
-# CSV dosyalarını yükle
+# Ayarlar
 # -------------------------------
-old_csv = "amazon_tablets.csv"         # Eski sürüm CSV
-new_csv = "amazon_tablets_page1_2_full.csv"    # FALLBACK + Payload tabanlı yeni sürüm CSV
+OLD_CSV = "amazon_tablets.csv"                  # Eski sürüm CSV
+NEW_CSV = "amazon_tablets_page1_2_full.csv"     # FALLBACK + Payload tabanlı yeni sürüm CSV
+DIFF_CSV = "amazon_tablets_differences.csv"
+DEFAULT_VALUE = "NonePublished"
+MISSING_COLUMN = "N/A"                          # eski snapshot'ta olmayan sütun
+CHUNK_SIZE = 200_000                            # chunked modda okunan satır/parça
+BUCKETS = 64                                    # chunked modda hash bölüm sayısı
+TABLE_LIMIT = 500                               # terminalde gösterilecek en fazla fark satırı
+
+
+class SnapshotDiff(NamedTuple):
+    key: str
+    added: pd.DataFrame      # yalnızca yeni snapshot'ta olan ürünler
+    removed: pd.DataFrame    # yalnızca eski snapshot'ta olan ürünler
+    changes: pd.DataFrame    # uzun biçim: key, Alan, Eski Değer, Yeni Değer
 
-df_old = pd.read_csv(old_csv)
-df_new = pd.read_csv(new_csv)
 
 # -------------------------------
-# Eksik alanlar ve NonePublished kontrolü
+# Yükleme
 # -------------------------------
-for col in df_new.columns:
-    df_new[col] = df_new[col].fillna("NonePublished")
-for col in df_old.columns:
-    df_old[col] = df_old[col].fillna("NonePublished")
+def load_snapshot(path: str) -> pd.DataFrame:
+    """CSV'yi string olarak yükle; eksik alanlar NonePublished olur (tip çıkarımı yok: 12 != 12.0 sorunu olmaz)."""
+    if str(path).endswith(".parquet"):
+        return load_parquet_snapshot(path)
+    return pd.read_csv(path, dtype=str, keep_default_na=True).fillna(DEFAULT_VALUE)
+
+
+def load_parquet_snapshot(path: str) -> pd.DataFrame:
+    """
+    snapshot_store'un tipli Parquet dosyası: değerler zaten normalize (Decimal fiyat, int puan),
+    yalnızca karşılaştırma için metne çevrilir; null -> NonePublished.
+    """
+    df = read_snapshot(path)
+    return df.astype(object).where(df.notna(), DEFAULT_VALUE).astype(str)
+
+
+def latest_runs(source: str, root: str = SNAPSHOT_ROOT):
+    """Snapshot deposundaki kaynağın son iki çalışması (eski, yeni)."""
+    runs = SnapshotStore(root).runs(source)
+    if len(runs) < 2:
+        raise SystemExit(f"{root} altında '{source}' için karşılaştırılacak iki çalışma yok ({len(runs)} bulundu).")
+    return str(runs[-2]), str(runs[-1])
+
+
+def pick_key(df_old: pd.DataFrame, df_new: pd.DataFrame) -> str:
+    """İki snapshot'ta da varsa asin, yoksa link anahtar olur."""
+    for key in ("asin", "link"):
+        if key in df_old.columns and key in df_new.columns:
+            return key
+    raise ValueError("Snapshot'larda ortak anahtar sütunu (asin/link) yok.")
+
 
 # -------------------------------
-# Karşılaştırma
+# Karşılaştırma (vektörel, anahtar indeksli)
 # -------------------------------
-comparison = []
+def diff_snapshots(df_old: pd.DataFrame, df_new: pd.DataFrame, key: str = None) -> SnapshotDiff:
+    """
+    İki snapshot'ı anahtar üzerinde hizalar ve sütun başına boolean değişim maskesi hesaplar.
+    Aynı anahtar birden fazla kez geçiyorsa ilk satır kullanılır. Karşılaştırma yeni
+    snapshot'ın sütunları üzerinden yapılır (fingerprint ve scraped_at hariç); eskide olmayan
+    sütun "N/A" sayılır. İki tarafta da fingerprint sütunu varsa önce o karşılaştırılır;
+    parmak izi aynı olan (değişmemiş) ürünlerin sütunlarına hiç bakılmaz.
+    """
+    key = key or pick_key(df_old, df_new)
+    old = df_old.drop_duplicates(key, keep="first").set_index(key)
+    new = df_new.drop_duplicates(key, keep="first").set_index(key)
+
+    # hash tabanlı hizalama: yeni satır -> eski satır konumu (-1: eskide yok)
+    pos = old.index.get_indexer(new.index)
+    in_old = pos >= 0
+    matched = np.zeros(len(old), dtype=bool)
+    matched[pos[in_old]] = True
+    added = new[~in_old].reset_index()
+    removed = old[~matched].reset_index()
+
+    new_common = new[in_old]
+    old_aligned = old.iloc[pos[in_old]]
+    if FINGERPRINT_FIELD in new.columns and FINGERPRINT_FIELD in old.columns:
+        differs = (new_common[FINGERPRINT_FIELD].to_numpy(dtype=object)
+                   != old_aligned[FINGERPRINT_FIELD].to_numpy(dtype=object))
+        new_common, old_aligned = new_common[differs], old_aligned[differs]
 
-# Ortak linkleri bul
-common_links = set(df_old['link']).intersection(set(df_new['link']))
+    common = new_common.index
+    cols = [c for c in new.columns if c not in EXCLUDED_FIELDS]
+    new_vals = new_common[cols].astype(str).to_numpy(dtype=object)
+    old_vals = np.empty_like(new_vals)
+    for j, col in enumerate(cols):
+        old_vals[:, j] = old_aligned[col].astype(str).to_numpy(dtype=object) if col in old.columns else MISSING_COLUMN
+    mask = old_vals != new_vals
 
-for link in common_links:
-    old_row = df_old[df_old['link'] == link].iloc[0]
-    new_row = df_new[df_new['link'] == link].iloc[0]
+    # maske -> uzun biçim (yalnızca değişen hücreler, ürün sırası korunur)
+    r, c = mask.nonzero()
+    changes = pd.DataFrame({
+        key: common.to_numpy()[r],
+        "Alan": np.asarray(cols, dtype=object)[c],
+        "Eski Değer": old_vals[r, c],
+        "Yeni Değer": new_vals[r, c],
+    })
+    return SnapshotDiff(key, added, removed, changes)
 
-    differences = {}
-    for col in df_new.columns:
-        old_val = str(old_row[col]) if col in df_old.columns else "N/A"
-        new_val = str(new_row[col])
-        if old_val != new_val:
-            differences[col] = {"old": old_val, "new": new_val}
 
-    if differences:
-        comparison.append({"link": link, "differences": differences})
+def changes_to_wide(changes: pd.DataFrame, key: str, column_order=None) -> pd.DataFrame:
+    """Uzun biçimi eski CSV düzenine çevirir: ürün başına bir satır, <alan>_old / <alan>_new."""
+    if changes.empty:
+        return pd.DataFrame(columns=[key])
+    keys = pd.unique(changes[key].to_numpy(dtype=object))
+    key_index = pd.Index(keys)
+    fields_present = set(changes["Alan"])
+    fields = [f for f in (column_order or []) if f in fields_present] or sorted(fields_present)
+    out = {key: keys}
+    for f in fields:
+        sub = changes[changes["Alan"] == f]
+        pos = key_index.get_indexer(sub[key].to_numpy(dtype=object))
+        for side, suffix in (("Eski Değer", "_old"), ("Yeni Değer", "_new")):
+            values = np.full(len(keys), None, dtype=object)
+            values[pos] = sub[side].to_numpy(dtype=object)
+            out[f + suffix] = values
+    return pd.DataFrame(out)
+
 
 # -------------------------------
-# Terminalde tablo şeklinde göster
+# Chunked (bellek dışı) karşılaştırma
 # -------------------------------
-if comparison:
-    table_data = []
-    for comp in comparison:
-        link = comp["link"]
-        for col, vals in comp["differences"].items():
-            table_data.append([link, col, vals["old"], vals["new"]])
-
-    print("\nÜrünlerdeki değişiklikler:")
-    print(tabulate(table_data, headers=["Link", "Alan", "Eski Değer", "Yeni Değer"], tablefmt="fancy_grid"))
-else:
-    print("Ortak ürünlerde değişiklik bulunamadı.")
+def partition_csv(path: str, key: str, out_dir: Path, buckets: int = BUCKETS,
+                  chunksize: int = CHUNK_SIZE) -> None:
+    """CSV'yi parça parça okuyup anahtar hash'ine göre bucket dosyalarına dağıtır (sıra korunur)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = set()
+    for chunk in pd.read_csv(path, dtype=str, chunksize=chunksize):
+        chunk = chunk.fillna(DEFAULT_VALUE)
+        bucket_ids = pd.util.hash_pandas_object(chunk[key], index=False).to_numpy() % buckets
+        for b in np.unique(bucket_ids):
+            part = chunk[bucket_ids == b]
+            target = out_dir / f"{b}.csv"
+            part.to_csv(target, mode="a", index=False, header=b not in written)
+            written.add(b)
+
+
+def diff_csv_chunked(old_path: str, new_path: str, out_path: str, buckets: int = BUCKETS,
+                     chunksize: int = CHUNK_SIZE) -> dict:
+    """
+    RAM'e sığmayan snapshot'lar için: iki dosya da anahtar hash'ine göre diskte bucket'lara
+    bölünür, her bucket çifti ayrı ayrı diff_snapshots ile karşılaştırılır ve farklar
+    out_path'e eklenerek yazılır. Bellek kullanımı ~ dosya boyutu / buckets ile sınırlıdır.
+    Çıktı sütunları sabittir: anahtar + her alan için <alan>_old / <alan>_new (değişmeyen boş).
+    """
+    old_cols = list(pd.read_csv(old_path, dtype=str, nrows=0).columns)
+    new_cols = list(pd.read_csv(new_path, dtype=str, nrows=0).columns)
+    key = pick_key(pd.DataFrame(columns=old_cols), pd.DataFrame(columns=new_cols))
+    fields = [c for c in new_cols if c != key and c not in EXCLUDED_FIELDS]
+    out_columns = [key] + [f + suffix for f in fields for suffix in ("_old", "_new")]
+
+    stats = {"key": key, "added": 0, "removed": 0, "changed": 0}
+    with tempfile.TemporaryDirectory(prefix="snapshot_diff_") as tmp:
+        tmp = Path(tmp)
+        partition_csv(old_path, key, tmp / "old", buckets, chunksize)
+        partition_csv(new_path, key, tmp / "new", buckets, chunksize)
+        pd.DataFrame(columns=out_columns).to_csv(out_path, index=False, encoding="utf-8-sig")
+        for b in range(buckets):
+            old_file, new_file = tmp / "old" / f"{b}.csv", tmp / "new" / f"{b}.csv"
+            df_old = load_snapshot(old_file) if old_file.exists() else pd.DataFrame(columns=old_cols)
+            df_new = load_snapshot(new_file) if new_file.exists() else pd.DataFrame(columns=new_cols)
+            diff = diff_snapshots(df_old, df_new, key=key)
+            stats["added"] += len(diff.added)
+            stats["removed"] += len(diff.removed)
+            if diff.changes.empty:
+                continue
+            stats["changed"] += diff.changes[key].nunique()
+            wide = changes_to_wide(diff.changes, key, column_order=new_cols).reindex(columns=out_columns)
+            wide.to_csv(out_path, mode="a", index=False, header=False, encoding="utf-8")
+    return stats
+
 
 # -------------------------------
-# Farkları CSV olarak kaydet
+# main
 # -------------------------------
-diff_rows = []
-for comp in comparison:
-    row = {"link": comp["link"]}
-    for col, vals in comp['differences'].items():
-        row[f"{col}_old"] = vals["old"]
-        row[f"{col}_new"] = vals["new"]
-    diff_rows.append(row)
-
-df_diff = pd.DataFrame(diff_rows)
-df_diff.to_csv("amazon_tablets_differences.csv", index=False, encoding="utf-8-sig")
-print("\nFarklar CSV dosyası kaydedildi: amazon_tablets_differences.csv")
+def main():
+    ap = argparse.ArgumentParser(description="İki Amazon snapshot'ını karşılaştırır.")
+    ap.add_argument("--old", default=OLD_CSV, help="CSV ya da snapshot .parquet dosyası")
+    ap.add_argument("--new", default=NEW_CSV, help="CSV ya da snapshot .parquet dosyası")
+    ap.add_argument("--source", default=None,
+                    help="snapshot deposundaki kaynağın son iki çalışmasını karşılaştır (ör. amazon_bestsellers)")
+    ap.add_argument("--store", default=SNAPSHOT_ROOT or "snapshots", help="snapshot deposu kökü")
+    ap.add_argument("--out", default=DIFF_CSV)
+    ap.add_argument("--chunked", action="store_true", help="RAM'den büyük dosyalar için bucket'lı mod")
+    ap.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    ap.add_argument("--buckets", type=int, default=BUCKETS)
+    args = ap.parse_args()
+    if args.source:
+        args.old, args.new = latest_runs(args.source, args.store)
+        print(f"Eski: {args.old}\nYeni: {args.new}")
+
+    if args.chunked:
+        if args.old.endswith(".parquet") or args.new.endswith(".parquet"):
+            ap.error("--chunked yalnızca CSV içindir; Parquet snapshot'lar doğrudan sütunlu okunur.")
+        stats = diff_csv_chunked(args.old, args.new, args.out, buckets=args.buckets, chunksize=args.chunksize)
+        print(f"Anahtar: {stats['key']} | yeni ürün: {stats['added']} | kaldırılan: {stats['removed']} | "
+              f"değişen ürün: {stats['changed']}")
+        print(f"\nFarklar CSV dosyası kaydedildi: {args.out}")
+        return
+
+    df_old = load_snapshot(args.old)
+    df_new = load_snapshot(args.new)
+    diff = diff_snapshots(df_old, df_new)
+
+    print(f"Anahtar: {diff.key} | yeni ürün: {len(diff.added)} | kaldırılan: {len(diff.removed)} | "
+          f"değişen ürün: {diff.changes[diff.key].nunique()}")
+
+    # Terminalde tablo şeklinde göster
+    if not diff.changes.empty:
+        print("\nÜrünlerdeki değişiklikler:")
+        print(tabulate(diff.changes.head(TABLE_LIMIT).values.tolist(),
+                       headers=[diff.key.capitalize(), "Alan", "Eski Değer", "Yeni Değer"], tablefmt="fancy_grid"))
+        if len(diff.changes) > TABLE_LIMIT:
+            print(f"... {len(diff.changes) - TABLE_LIMIT} fark daha (tamamı CSV'de)")
+    else:
+        print("Ortak ürünlerde değişiklik bulunamadı.")
+
+    # Farkları CSV olarak kaydet
+    df_diff = changes_to_wide(diff.changes, diff.key, column_order=list(df_new.columns))
+    df_diff.to_csv(args.out, index=False, encoding="utf-8-sig")
+    print(f"\nFarklar CSV dosyası kaydedildi: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# extraction_registry.py
+# Amaç: Amazon çıkarıcılarının kullandığı regex ve CSS selector'ların tek, önceden derlenmiş
+# kaydı. Desenler modül yüklenirken bir kez derlenir; çağrı başına derleme/cache araması yok.
+# Spec anahtarları (tablo satırı th'si ya da detail bullet başlığı) tek bir çoklu desen ile
+# kanonik alanlara eşlenir; sonuç anahtar başına cache'lenir (aynı anahtarlar her sayfada tekrar eder).
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+import soupsieve as sv
+
+# -------- regex --------
+ASIN_IN_LINK = re.compile(r"/dp/([A-Za-z0-9]{8,12})")
+REVIEW_COUNT = re.compile(r"(\d[\d\.]*)")
+SCREEN_SIZE = re.compile(r"(\d{2}\.?(\d)?\s*(inç|inch|\"))", re.IGNORECASE)
+BULLET_SPLIT = re.compile(r":|\n")
+# ham HTML/JSON içinde /dp/ASIN, \/dp\/ASIN ve \u002Fdp\u002FASIN biçimleri (belge çözülmeden).
+# Desen sabit "dp" ile başlar (regex motoru hızlı literal aramasını kullanır), önceki ayraç
+# lookbehind ile doğrulanır; baştaki alternation'a göre ~5 kat hızlı.
+ASIN_SCAN = re.compile(r"dp(?:(?<=/dp)|(?<=\\u002[fF]dp))(?:/|\\/|\\u002[fF])([A-Za-z0-9]{8,12})")
+ASIN_SCAN_BYTES = re.compile(ASIN_SCAN.pattern.encode("ascii"))
+# yalnızca bu ipucunu taşıyan payload attribute'ları çözülür
+PAYLOAD_HINT = re.compile(r'"(?:id|asin|ASIN)"\s*:|dp(?:/|\\/|\\u002[fF])')
+JSON_ESCAPE = re.compile(r"\\u([0-9a-fA-F]{4})|\\/")
+
+
+def iter_asins(raw):
+    """
+    str ya da bytes üzerinde ASIN'leri belge sırasıyla üretir. Tam metin unescape/decode
+    edilmez; regex doğrudan ham içerikte (kaçışlı biçimler dahil) çalışır, kopya yapılmaz.
+    """
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        for m in ASIN_SCAN_BYTES.finditer(raw):
+            yield m.group(1).decode("ascii")
+    else:
+        for m in ASIN_SCAN.finditer(raw):
+            yield m.group(1)
+
+
+def _unescape_json(m) -> str:
+    return chr(int(m.group(1), 16)) if m.group(1) else "/"
+
+
+def decode_json_escapes(text: str) -> str:
+    """
+    Yalnızca JSON kaçışları (\\uXXXX, \\/) çözülür; diğer her şey (ASCII dışı harfler dahil)
+    olduğu gibi kalır. unicode_escape'in aksine UTF-8 metni latin-1 gibi yorumlayıp bozmaz.
+    """
+    if "\\" not in text:
+        return text
+    decoded = JSON_ESCAPE.sub(_unescape_json, text)
+    if "\\ud" in text or "\\uD" in text:
+        # vekil (surrogate) çiftlerini tek karaktere birleştir
+        decoded = decoded.encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+    return decoded
+
+
+# -------- CSS selector'lar --------
+LISTING_CARD_CSS = "div.zg-grid-general-faceout, div.p13n-sc-uncoverable-faceout, div._cDEzb_grid-cell_1uMOS"
+LISTING_CARDS = sv.compile(LISTING_CARD_CSS)
+RANK_BADGE = sv.compile(".zg-bdg-text")
+CARD_PRODUCT_LINK = sv.compile("a.a-link-normal[href*='/dp/']")
+PAGINATION_LINK = sv.compile("ul.a-pagination a[href*='pg=']")
+PAGE_PARAM = re.compile(r"[?&]pg=(\d+)")
+
+
+def listing_page_count(soup) -> Optional[int]:
+    """Listeleme sayfasının sayfalamasındaki en büyük pg değeri; sayfalama yoksa None."""
+    pages = []
+    for a in PAGINATION_LINK.select(soup):
+        m = PAGE_PARAM.search(a.get("href", ""))
+        if m:
+            pages.append(int(m.group(1)))
+    return max(pages) if pages else None
+
+
+# -------- spec anahtarı -> kanonik alan --------
+# Sıra önceliktir: bir anahtar birden fazla gruba uyarsa listede önce gelen alan kazanır
+# (eski `if "marka" in key ... elif "model" in key ...` zinciriyle aynı).
+SPEC_KEY_PATTERNS = [
+    ("Markası", ("marka", "brand")),
+    ("Modeli", ("model",)),
+    ("Ekran boyutu", ("ekran", "display", "inch")),
+    ("işletim sistemi", ("işletim", "operating")),
+    ("rengi", ("renk", "colour", "color")),
+]
+_SPEC_GROUPS = [f"f{i}" for i in range(len(SPEC_KEY_PATTERNS))]
+SPEC_KEY_MATCHER = re.compile("|".join(
+    f"(?P<{group}>{'|'.join(map(re.escape, needles))})"
+    for group, (_, needles) in zip(_SPEC_GROUPS, SPEC_KEY_PATTERNS)))
+_FIELD_BY_GROUP = {group: field for group, (field, _) in zip(_SPEC_GROUPS, SPEC_KEY_PATTERNS)}
+_PRIORITY = {group: i for i, group in enumerate(_SPEC_GROUPS)}
+
+# Amazon anahtarlarında görünmeyen yön işaretleri (‏ ‎) ve Türkçe büyük İ:
+# "İşletim".lower() == "i̇şletim" (i + birleşik nokta) olduğundan önce düz i'ye çevrilir.
+_KEY_TRANSLATE = str.maketrans({"İ": "i", "‎": None, "‏": None, "̇": None})
+
+
+def normalize_key(key: str) -> str:
+    return key.translate(_KEY_TRANSLATE).lower().strip()
+
+
+@lru_cache(maxsize=4096)
+def spec_field(key: str) -> Optional[str]:
+    """Ham spec anahtarının kanonik alan adı (eşleşme yoksa None); tek regex taraması."""
+    best = None
+    for m in SPEC_KEY_MATCHER.finditer(normalize_key(key)):
+        if best is None or _PRIORITY[m.lastgroup] < _PRIORITY[best]:
+            best = m.lastgroup
+            if _PRIORITY[best] == 0:
+                break
+    return _FIELD_BY_GROUP[best] if best else None
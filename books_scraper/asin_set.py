@@ -0,0 +1,175 @@
+# asin_set.py
+# Amaç: milyonlarca ASIN için öngörülebilir bellekli, sırayı koruyan tekilleştirme.
+# ASIN'ler ([0-9A-Z], en fazla 11 karakter) başlarına "1" eklenerek 36 tabanında tek bir
+# 64 bit tamsayıya paketlenir (int(..., 36) C hızında; baştaki 1 sayesinde "0AB" ile "AB"
+# çakışmaz, 36^12 < 2^63).
+# Paketlenen değerler array('q') üzerinde açık adresli (linear probing) bir hash tablosunda
+# tutulur: ASIN başına ~25-40 bayt (tablo + sıra dizisi), string'leriyle set[str]'de ~85 bayt.
+# Paketlenemeyen değerler (küçük harf, uzun kimlik) küçük bir taşma set'ine düşer.
+#
+# BloomFilter: çalışmalar / kategoriler arası paylaşılan, dosyada kalıcı "daha önce görüldü mü"
+# filtresi. Yanlış pozitif oranı kapasiteye göre ayarlanır; yanlış negatif yoktur.
+
+import hashlib
+import math
+import os
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_MAX_LEN = 11
+_MASK64 = (1 << 64) - 1
+_FIB = 0x9E3779B97F4A7C15                                 # Fibonacci hashing çarpanı
+_MIN_CAPACITY = 1 << 6
+
+
+def pack_asin(asin: str) -> int:
+    """ASIN -> pozitif int (paketlenemiyorsa 0; küçük harf int(..., 36) ile kaybolacağından reddedilir)."""
+    if (0 < len(asin) <= _MAX_LEN and asin.isascii() and asin.isalnum()
+            and (asin.isdigit() or asin.isupper())):
+        return int("1" + asin, 36)
+    return 0
+
+
+def unpack_asin(value: int) -> str:
+    chars = []
+    while value >= 36:
+        value, d = divmod(value, 36)
+        chars.append(_ALPHABET[d])
+    return "".join(reversed(chars))
+
+
+class AsinSet:
+    """
+    Ekleme sırasını koruyan ASIN kümesi. `add` yeni ise True döner; iterasyon ilk görülme
+    sırasıyla ASIN string'leri üretir. bloom verilirse her eklenen ASIN filtreye de yazılır.
+    """
+
+    def __init__(self, items: Iterable[str] = (), capacity: int = _MIN_CAPACITY,
+                 bloom: Optional["BloomFilter"] = None):
+        size = _MIN_CAPACITY
+        while size < capacity * 2:
+            size <<= 1
+        self._table = array("q", bytes(8 * size))
+        self._shift = 64 - (size.bit_length() - 1)
+        self._used = 0
+        self._order = array("q")            # >0: paketli ASIN, <0: -(taşma indeksi + 1)
+        self._overflow = {}                  # paketlenemeyen str -> indeks
+        self._overflow_items = []
+        self.bloom = bloom
+        self.update(items)
+
+    # -------- hash tablosu --------
+    def _slot(self, value: int) -> int:
+        """value'nun bulunduğu ya da yerleşeceği hücre."""
+        table = self._table
+        mask = len(table) - 1
+        i = ((value * _FIB) & _MASK64) >> self._shift
+        while True:
+            cell = table[i]
+            if cell == 0 or cell == value:
+                return i
+            i = (i + 1) & mask
+
+    def _grow(self) -> None:
+        old = self._table
+        self._table = array("q", bytes(8 * len(old) * 2))
+        self._shift -= 1
+        for value in old:
+            if value:
+                self._table[self._slot(value)] = value
+
+    # -------- küme arayüzü --------
+    def add(self, asin: str) -> bool:
+        value = pack_asin(asin)
+        if value:
+            i = self._slot(value)
+            if self._table[i]:
+                return False
+            self._table[i] = value
+            self._used += 1
+            self._order.append(value)
+            if self._used * 2 > len(self._table):
+                self._grow()
+        else:
+            if asin in self._overflow:
+                return False
+            self._overflow[asin] = len(self._overflow_items)
+            self._overflow_items.append(asin)
+            self._order.append(-len(self._overflow_items))
+        if self.bloom is not None:
+            self.bloom.add(asin)
+        return True
+
+    def update(self, asins: Iterable[str]) -> None:
+        for asin in asins:
+            self.add(asin)
+
+    def __contains__(self, asin) -> bool:
+        value = pack_asin(asin) if isinstance(asin, str) else 0
+        if value:
+            return self._table[self._slot(value)] != 0
+        return asin in self._overflow
+
+    def seen_before(self, asin: str) -> bool:
+        """Bu kümede ya da (varsa) kalıcı Bloom filtresinde; yani bu ya da önceki çalışmalarda görüldü."""
+        return asin in self or (self.bloom is not None and asin in self.bloom)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __iter__(self) -> Iterator[str]:
+        for value in self._order:
+            yield unpack_asin(value) if value > 0 else self._overflow_items[-value - 1]
+
+    def nbytes(self) -> int:
+        """Tablo + sıra dizisinin yaklaşık bellek kullanımı (taşma set'i hariç)."""
+        return self._table.itemsize * len(self._table) + self._order.itemsize * len(self._order)
+
+
+class BloomFilter:
+    """
+    capacity öğe için error_rate yanlış pozitif oranlı bit dizisi. path verilirse açılışta
+    dosyadan yüklenir ve `save` ile atomik olarak yazılır (boyut parametreleri dosyada saklanır).
+    """
+
+    _HEADER = 16  # bit sayısı (8 bayt) + hash sayısı (8 bayt)
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        if self.path and self.path.exists():
+            raw = self.path.read_bytes()
+            self.nbits = int.from_bytes(raw[:8], "little")
+            self.nhashes = int.from_bytes(raw[8:16], "little")
+            self.bits = bytearray(raw[self._HEADER:])
+        else:
+            self.nbits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+            self.nhashes = max(1, round(self.nbits / capacity * math.log(2)))
+            self.bits = bytearray((self.nbits + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # çift hashleme (Kirsch-Mitzenmacher): h1 + i*h2
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.nhashes):
+            yield (h1 + i * h2) % self.nbits
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(self.nbits.to_bytes(8, "little"))
+            f.write(self.nhashes.to_bytes(8, "little"))
+            f.write(self.bits)
+        os.replace(tmp, self.path)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# bench_e2e.py
+# Amaç: scraper'ların uçtan uca ölçümü (yerel mock sunucuya karşı, ağ yok). Her scraper ayrı bir
+# alt süreçte ve boş bir geçici dizinde (cache / checkpoint yok) çalışır; ölçülenler:
+#   kayıt/sn (duvar saati), istek ve retry sayısı, sayfa türü başına ortalama ayrıştırma süresi
+#   (scraper'ın kendi metrics.json'ından), tepe bellek (alt sürecin max RSS'i).
+# Scraper'ların hız sınırları mock sunucu için --rate'e yükseltilir; eşzamanlılık ayarları aynen kalır.
+# Not: --error-rate > 0 iken 503'ler domain hız sınırlayıcısını (AIMD) gerçekte olduğu gibi yavaşlatır.
+# --json ile sonuçlar kaydedilir, --baseline ile önceki bir kayda göre kayıt/sn farkı gösterilir
+# ve --tolerance'tan fazla yavaşlama varsa çıkış kodu 1 olur.
+# Ölçümler gürültülüdür (±%10-15); karşılaştırmalarda --repeat 3 önerilir.
+# Kullanım: python benchmarks/bench_e2e.py [--scrapers soup,amazon,acjs,scrapy_books]
+#           [--latency 0.02] [--error-rate 0.01] [--fixtures DIR] [--json out.json] [--baseline old.json]
+
+import argparse
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from tabulate import tabulate
+
+BOOKS_SCRAPER = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BOOKS_SCRAPER))  # books_scraper/ ortak modülleri
+from fixtures import load_saved_pages
+from mock_server import BOOKS_PAGES, PRODUCT_BYTES, MockServer, MockSite
+
+SCRAPERS = ("soup", "amazon", "acjs", "scrapy_books")
+METRICS_FILE = "metrics.json"
+RESULT_PREFIX = "BENCH_RESULT "
+
+
+# -------- alt süreç: tek scraper --------
+def _fast_limiter(rate):
+    from rate_limiter import DomainRateLimiter
+    return DomainRateLimiter(rate=rate, burst=rate)
+
+
+def run_soup(root, rate, amazon_pages):
+    import soup_scraper
+    soup_scraper.limiter = _fast_limiter(rate)
+    soup_scraper.main(["--all", "--details"])
+
+
+def run_amazon(root, rate, amazon_pages):
+    from Amazon import AmazonVeriKazma
+    AmazonVeriKazma.limiter = _fast_limiter(rate)
+    AmazonVeriKazma.MAX_PAGES = amazon_pages
+    AmazonVeriKazma.main()
+
+
+def run_acjs(root, rate, amazon_pages):
+    from Amazon import AmazonVeriKazmaAcJs
+    AmazonVeriKazmaAcJs.limiter = _fast_limiter(rate)
+    AmazonVeriKazmaAcJs.MAX_PAGES = amazon_pages
+    AmazonVeriKazmaAcJs.main()
+
+
+def run_scrapy_books(root, rate, amazon_pages):
+    sys.path.insert(0, str(BOOKS_SCRAPER / "scrapy_scraper"))
+    os.environ["SCRAPY_SETTINGS_MODULE"] = "scrapy_scraper.settings"
+    from scrapy.crawler import CrawlerProcess
+    from scrapy.utils.project import get_project_settings
+
+    settings = get_project_settings()
+    settings.setdict({
+        "HTTPCACHE_ENABLED": False,
+        "LOG_LEVEL": "ERROR",
+        "RATE_LIMIT_DOMAINS": {urlsplit(root).netloc: rate},
+        "METRICS_EXPORT_URI": METRICS_FILE,
+        "STREAM_EXPORT_URIS": ["%(name)s.csv"],
+    }, priority="cmdline")
+    process = CrawlerProcess(settings)
+    process.crawl("books")
+    process.start()
+
+
+RUNNERS = {"soup": run_soup, "amazon": run_amazon, "acjs": run_acjs, "scrapy_books": run_scrapy_books}
+
+
+def peak_rss_mb():
+    """
+    Bu sürecin tepe RSS'i. Linux'ta /proc VmHWM kullanılır: ru_maxrss fork ile ebeveynin
+    değerini devralır (exec sonrası da), mock sunucunun belleği sonuca karışırdı.
+    """
+    try:
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def child(name, root, rate, amazon_pages):
+    """Scraper'ı çalıştırır (çıktısı bastırılır), sonucu tek satır JSON olarak yazar."""
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        RUNNERS[name](root, rate, amazon_pages)
+    wall = time.perf_counter() - started
+    metrics = json.loads(Path(METRICS_FILE).read_text(encoding="utf-8"))
+    result = {
+        "scraper": name,
+        "wall_seconds": round(wall, 3),
+        "items": metrics["items"],
+        "items_per_second": round(metrics["items"] / wall, 2) if wall > 0 else 0.0,
+        "requests": sum(h["latency"]["count"] for h in metrics["hosts"].values()),
+        "retries": sum(metrics["retries"].values()),
+        "fetch_p50": {host: h["latency"].get("p50") for host, h in metrics["hosts"].items()},
+        "parse_ms": {kind: round(p["mean"] * 1000, 2) for kind, p in metrics["parse_seconds"].items() if p["count"]},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    print(RESULT_PREFIX + json.dumps(result))
+
+
+# -------- ana süreç --------
+def run_one(name, server, args):
+    env = dict(os.environ,
+               SCRAPEWORKS_AMAZON_ROOT=server.root,
+               SCRAPEWORKS_BOOKS_ROOT=server.root + "/",
+               SCRAPEWORKS_METRICS=METRICS_FILE,
+               SCRAPEWORKS_RENDER="static",
+               SCRAPEWORKS_FRESH="1")
+    env.pop("SCRAPEWORKS_OFFLINE", None)
+    env.pop("SCRAPEWORKS_ASIN_BLOOM", None)
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--child", name, "--root", server.root,
+           "--rate", str(args.rate), "--amazon-pages", str(args.amazon_pages)]
+    with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as workdir:
+        proc = subprocess.run(cmd, cwd=workdir, env=env, capture_output=True, text=True)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+    if proc.returncode != 0 or not lines:
+        print(f"{name} başarısız (çıkış kodu {proc.returncode}):\n{proc.stderr[-2000:]}")
+        return None
+    return json.loads(lines[-1][len(RESULT_PREFIX):])
+
+
+def compare(results, baseline_path, tolerance):
+    """Baseline'a göre kayıt/sn farkını ekler; tolerans aşan yavaşlama varsa True döner."""
+    baseline = {r["scraper"]: r for r in json.loads(Path(baseline_path).read_text(encoding="utf-8"))["results"]}
+    regressed = False
+    for r in results:
+        old = baseline.get(r["scraper"])
+        if not old or not old["items_per_second"]:
+            r["delta"] = None
+            continue
+        r["delta"] = r["items_per_second"] / old["items_per_second"] - 1
+        if r["delta"] < -tolerance:
+            regressed = True
+    return regressed
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Scraper'ların mock sunucuya karşı uçtan uca benchmark'ı.")
+    ap.add_argument("--scrapers", default=",".join(SCRAPERS))
+    ap.add_argument("--latency", type=float, default=0.02, help="mock yanıt gecikmesi (sn)")
+    ap.add_argument("--jitter", type=float, default=0.02)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--fixtures", default=None, help="kayıtlı HTML sayfaları dizini (yoksa sentetik)")
+    ap.add_argument("--books-pages", type=int, default=BOOKS_PAGES)
+    ap.add_argument("--product-bytes", type=int, default=PRODUCT_BYTES)
+    ap.add_argument("--amazon-pages", type=int, default=2, help="Amazon scraper'larının çekeceği en fazla liste sayfası (sayfalamadan keşfedilir)")
+    ap.add_argument("--rate", type=float, default=1000.0, help="mock host için istek/sn sınırı")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", default=None, help="sonuçları bu dosyaya yaz")
+    ap.add_argument("--baseline", default=None, help="karşılaştırılacak önceki --json çıktısı")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="izin verilen kayıt/sn düşüşü (oran)")
+    ap.add_argument("--repeat", type=int, default=1, help="scraper başına çalıştırma; en hızlısı raporlanır")
+    ap.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    ap.add_argument("--root", default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        return child(args.child, args.root, args.rate, args.amazon_pages)
+
+    saved = load_saved_pages(args.fixtures) if args.fixtures else None
+    site = MockSite(args.books_pages, args.product_bytes, saved)
+    started = time.perf_counter()
+    warmed = site.warm(args.amazon_pages)
+    print(f"{warmed} sayfa hazırlandı ({time.perf_counter() - started:.1f} sn)")
+    results = []
+    with MockServer(site, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                    seed=args.seed) as server:
+        print(f"Mock sunucu {server.root}: gecikme {args.latency}+{args.jitter} sn, hata oranı {args.error_rate}")
+        for name in args.scrapers.split(","):
+            print(f"  {name} çalışıyor...")
+            runs = [r for r in (run_one(name, server, args) for _ in range(args.repeat)) if r]
+            if runs:
+                results.append(max(runs, key=lambda r: r["items_per_second"]))
+
+    regressed = compare(results, args.baseline, args.tolerance) if args.baseline else False
+    rows = []
+    for r in results:
+        row = [r["scraper"], r["items"], r["wall_seconds"], r["items_per_second"], r["requests"], r["retries"],
+               ", ".join(f"{k} {v}" for k, v in r["parse_ms"].items()), r["peak_rss_mb"]]
+        if args.baseline:
+            row.append("-" if r.get("delta") is None else f"{r['delta'] * 100:+.1f}%")
+        rows.append(row)
+    headers = ["scraper", "kayıt", "sn", "kayıt/sn", "istek", "retry", "ayrıştırma ms/sayfa", "tepe RSS MB"]
+    if args.baseline:
+        headers.append("Δ kayıt/sn")
+    print(tabulate(rows, headers=headers, tablefmt="github"))
+
+    if args.json:
+        config = {k: getattr(args, k) for k in ("latency", "jitter", "error_rate", "books_pages", "product_bytes",
+                                                 "amazon_pages", "rate", "seed", "fixtures", "repeat")}
+        Path(args.json).write_text(json.dumps({"config": config, "results": results}, indent=2), encoding="utf-8")
+    if regressed:
+        print(f"Baseline'a göre %{args.tolerance * 100:.0f}'den fazla yavaşlama var.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
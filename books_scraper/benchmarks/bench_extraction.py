@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# bench_extraction.py
+# Amaç: Amazon çıkarıcılarındaki sıcak yol mikro-ölçümleri: spec anahtarı sınıflandırma
+# (eski `in` zinciri vs. extraction_registry.spec_field), ASIN regex'i (literal vs. derlenmiş)
+# ve kart selector'ları (string vs. soupsieve ile önceden derlenmiş).
+# Kullanım: python benchmarks/bench_extraction.py [--fixtures DIR] [--repeat N]
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+from tabulate import tabulate
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # books_scraper/ ortak modülleri
+from fixtures import load_pages
+from parsers import make_soup
+from Amazon.extraction_registry import (ASIN_IN_LINK, CARD_PRODUCT_LINK, LISTING_CARD_CSS, LISTING_CARDS,
+                                        spec_field)
+
+# gerçek sayfalarda görülen anahtar biçimleri (yön işaretleri, büyük İ, İngilizce karşılıklar)
+SAMPLE_KEYS = ["Marka", "Brand", "Model Adı", "Model adı", "Ürün Modeli Numarası", "Ekran Boyutu",
+               "Standing screen display size", "İşletim Sistemi", "Operating System", "Renk", "Colour",
+               "Ağırlık", "Ürün Boyutları", "Pil Ömrü", "RAM Boyutu", "Marka‏ : ‎",
+               "Ekran Çözünürlüğü", "Kablosuz Bağlantı Teknolojisi", "ASIN", "Üretici"]
+
+
+def legacy_spec_field(key):
+    key = key.lower()
+    if "marka" in key or "brand" in key: return "Markası"
+    elif "model" in key: return "Modeli"
+    elif "ekran" in key or "display" in key or "inch" in key: return "Ekran boyutu"
+    elif "işletim" in key or "operating system" in key: return "işletim sistemi"
+    elif "renk" in key or "colour" in key or "color" in key: return "rengi"
+    return None
+
+
+def _per_call_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Amazon çıkarıcı mikro-benchmark'ları")
+    ap.add_argument("--fixtures", help="kayıtlı HTML sayfalarının dizini (yoksa sentetik sayfalar)")
+    ap.add_argument("--repeat", type=int, default=2000)
+    args = ap.parse_args()
+    n = args.repeat
+    rows = []
+
+    keys = SAMPLE_KEYS
+    rows.append(["spec anahtarı (20 anahtar)", "in zinciri",
+                 f"{_per_call_us(lambda: [legacy_spec_field(k) for k in keys], n):.2f}"])
+    rows.append(["", "spec_field (cache'siz)",
+                 f"{_per_call_us(lambda: [spec_field.__wrapped__(k) for k in keys], n):.2f}"])
+    rows.append(["", "spec_field (cache'li)",
+                 f"{_per_call_us(lambda: [spec_field(k) for k in keys], n):.2f}"])
+    missed = [k for k in keys if legacy_spec_field(k) != spec_field(k)]
+    print("Eski zincirden farklı sınıflanan anahtarlar:", missed or "yok")
+
+    pages = load_pages(args.fixtures, per_kind=1)
+    listing = pages["amazon_listing"][0]
+    links = re.findall(r'href="([^"]*/dp/[^"]*)"', listing)
+    rows.append([f"ASIN regex ({len(links)} link)", "re.search(literal)",
+                 f"{_per_call_us(lambda: [re.search(r'/dp/([A-Za-z0-9]{8,12})', l) for l in links], n // 10):.2f}"])
+    rows.append(["", "ASIN_IN_LINK.search",
+                 f"{_per_call_us(lambda: [ASIN_IN_LINK.search(l) for l in links], n // 10):.2f}"])
+
+    soup = make_soup(listing)
+    reps = max(1, n // 200)
+
+    def select_strings():
+        for card in soup.select(LISTING_CARD_CSS):
+            card.select_one("a.a-link-normal[href*='/dp/']")
+
+    def select_compiled():
+        for card in LISTING_CARDS.select(soup):
+            CARD_PRODUCT_LINK.select_one(card)
+
+    rows.append(["kart + link selector", "soup.select(str)", f"{_per_call_us(select_strings, reps):.1f}"])
+    rows.append(["", "derlenmiş selector", f"{_per_call_us(select_compiled, reps):.1f}"])
+    print(tabulate(rows, headers=["ölçüm", "yöntem", "µs/çağrı"], tablefmt="plain"))
+
+
+if __name__ == "__main__":
+    main()
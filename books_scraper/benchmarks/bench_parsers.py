@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# bench_parsers.py
+# Amaç: fixture sayfalarda parser backend'lerinin sayfa başına parse ve select süresini ölçmek.
+# Kullanım: python benchmarks/bench_parsers.py [--fixtures DIR] [--repeat N]
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from tabulate import tabulate
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # books_scraper/ ortak modülleri
+from fixtures import load_pages
+from parsers import available_backends, make_soup
+
+# scraper'ların sıcak yolda kullandığı selector'lar
+SELECTORS = {
+    "amazon_product": ["#productTitle, #title, span#productTitle", "span.a-price span.a-offscreen",
+                       "#acrCustomerReviewText, #acrCustomerReviewLink, a[href*='product-reviews']",
+                       "table#productDetails_techSpec_section_1 tr", "#detailBullets_feature_div li",
+                       "#landingImage, img#imgBlkFront, img.a-dynamic-image"],
+    "amazon_listing": ["div.zg-grid-general-faceout, div.p13n-sc-uncoverable-faceout, div._cDEzb_grid-cell_1uMOS",
+                       ".zg-bdg-text", "a.a-link-normal[href*='/dp/']"],
+    "books_listing": ["article.product_pod", ".price_color", ".instock.availability", "p.star-rating"],
+    "books_product": ["div.product_main h1", "p.price_color", "table tr", "ul.breadcrumb li a"],
+}
+
+
+def _bs4_runner(backend):
+    def run(doc, selectors):
+        t0 = time.perf_counter()
+        soup = make_soup(doc, backend)
+        t1 = time.perf_counter()
+        for sel in selectors:
+            for node in soup.select(sel):
+                node.get_text(strip=True)
+        return t1 - t0, time.perf_counter() - t1
+    return run
+
+
+def _selectolax_runner():
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        return None
+
+    def run(doc, selectors):
+        t0 = time.perf_counter()
+        tree = HTMLParser(doc)
+        t1 = time.perf_counter()
+        for sel in selectors:
+            for node in tree.css(sel):
+                node.text(strip=True)
+        return t1 - t0, time.perf_counter() - t1
+    return run
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Parser backend parse/select benchmark")
+    ap.add_argument("--fixtures", help="kayıtlı HTML sayfalarının dizini (yoksa sentetik sayfalar)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    pages = load_pages(args.fixtures)
+    runners = {f"bs4+{b}": _bs4_runner(b) for b in available_backends()}
+    selectolax = _selectolax_runner()
+    if selectolax:
+        runners["selectolax"] = selectolax
+
+    rows = []
+    for kind, docs in pages.items():
+        size_kb = statistics.mean(len(d.encode("utf-8")) for d in docs) / 1024
+        for name, run in runners.items():
+            parse_times, select_times = [], []
+            for _ in range(args.repeat):
+                for doc in docs:
+                    p, s = run(doc, SELECTORS[kind])
+                    parse_times.append(p)
+                    select_times.append(s)
+            rows.append([kind, f"{size_kb:.0f}", name,
+                         f"{statistics.median(parse_times) * 1000:.1f}",
+                         f"{statistics.median(select_times) * 1000:.1f}"])
+    print(tabulate(rows, headers=["sayfa", "KB", "backend", "parse ms/sayfa", "select ms/sayfa"],
+                   tablefmt="plain"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# fixtures.py
+# Amaç: benchmark'lar için fixture sayfaları.
+# - load_saved_pages(dir): kaydedilmiş gerçek HTML sayfaları (dosya adı öneki türü belirler:
+#   amazon_product*, amazon_listing*, books_listing*, books_product*).
+# - synthetic_pages(): kayıt yoksa gerçek sayfaların yapısını (id/class'lar, payload
+#   attribute'ları, boyut) taklit eden deterministik sayfalar üretir.
+
+import html
+import json
+import random
+import string
+from pathlib import Path
+from typing import Dict, List
+
+KINDS = ("amazon_product", "amazon_listing", "books_listing", "books_product")
+RATINGS = ("One", "Two", "Three", "Four", "Five")
+
+
+def _asin(rng: random.Random) -> str:
+    return "B0" + "".join(rng.choice(string.ascii_uppercase + string.digits) for _ in range(8))
+
+
+def _words(rng: random.Random, n: int) -> str:
+    return " ".join("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+                    for _ in range(n))
+
+
+def _filler(rng: random.Random, target_bytes: int) -> str:
+    """Gerçek sayfalardaki script/carousel gürültüsünü taklit eden blok."""
+    parts, size = [], 0
+    while size < target_bytes:
+        asin = _asin(rng)
+        block = (f'<div class="a-carousel-card"><a class="a-link-normal" href="/x/dp/{asin}/ref=sims">'
+                 f'<img src="https://m.media-amazon.com/images/I/{asin}.jpg" alt="{_words(rng, 4)}"></a>'
+                 f'<span class="a-size-small">{_words(rng, 12)}</span></div>'
+                 f'<script type="text/javascript">P.when("A").execute(function(A){{var d={json.dumps({"asin": asin, "t": _words(rng, 20)})};}});</script>')
+        parts.append(block)
+        size += len(block)
+    return "".join(parts)
+
+
+def amazon_product_page(seed: int = 0, target_bytes: int = 1_500_000) -> str:
+    rng = random.Random(seed)
+    asin = _asin(rng)
+    specs = [("Marka", "Lenovo"), ("Model adı", f"Tab M{rng.randint(8, 11)}"),
+             ("Ekran boyutu", f"{rng.randint(8, 13)}.{rng.randint(0, 9)} İnç"),
+             ("İşletim sistemi", "Android 13"), ("Renk", "Gri")]
+    specs += [(_words(rng, 2).title(), _words(rng, 3)) for _ in range(25)]
+    rng.shuffle(specs)
+    rows = "".join(f'<tr><th class="a-color-secondary prodDetSectionEntry">{k}</th>'
+                   f'<td class="a-size-base prodDetAttrValue">{v}</td></tr>' for k, v in specs)
+    bullets = "".join(f'<li><span class="a-list-item"><span class="a-text-bold">{_words(rng, 2)} :</span>'
+                      f'<span>{_words(rng, 3)}</span></span></li>' for _ in range(10))
+    features = "".join(f'<li><span class="a-list-item">{_words(rng, 25)}</span></li>' for _ in range(6))
+    return f"""<!doctype html><html lang="tr-tr"><head><title>{_words(rng, 6)}</title>
+<style>{_words(rng, 4000)}</style></head><body>
+<div id="dp-container">
+<div id="titleSection"><h1 id="title"><span id="productTitle" class="a-size-large">  {_words(rng, 10)}  </span></h1></div>
+<div id="averageCustomerReviews"><a href="#customerReviews"><span id="acrCustomerReviewText" class="a-size-base">{rng.randint(1, 9)}.{rng.randint(100, 999)} değerlendirme</span></a></div>
+<div id="corePrice_feature_div"><span class="a-price"><span class="a-offscreen">{rng.randint(2, 30)}.{rng.randint(100, 999)},00TL</span><span aria-hidden="true">x</span></span></div>
+<div id="imgTagWrapperId"><img id="landingImage" src="https://m.media-amazon.com/images/I/{asin}._AC_SX679_.jpg" class="a-dynamic-image"></div>
+<div id="feature-bullets"><ul class="a-unordered-list">{features}</ul></div>
+{_filler(rng, target_bytes // 2)}
+<table id="productDetails_techSpec_section_1" class="a-keyvalue prodDetTable">{rows}</table>
+<div id="detailBullets_feature_div"><ul class="a-unordered-list">{bullets}</ul></div>
+{_filler(rng, target_bytes // 2)}
+</div></body></html>"""
+
+
+def amazon_listing_page(seed: int = 0, per_page: int = 50, page: int = 1) -> str:
+    rng = random.Random(seed)
+    asins = [_asin(rng) for _ in range(per_page)]
+    offset = (page - 1) * per_page
+    cards = "".join(
+        f'<div id="gridItemRoot"><div class="zg-grid-general-faceout"><span class="zg-bdg-text">#{offset + i + 1}</span>'
+        f'<a class="a-link-normal" href="/{_words(rng, 3).replace(" ", "-")}/dp/{a}/ref=zg_bs_g_{i}?psc=1">'
+        f'<img class="p13n-product-image" src="https://m.media-amazon.com/images/I/{a}.jpg"></a>'
+        f'<div class="_cDEzb_p13n-sc-css-line-clamp-3_g3dy1">{_words(rng, 12)}</div></div></div>'
+        for i, a in enumerate(asins))
+    recs = [{"id": a, "metadataMap": {"render.zg.rank": str(offset + i + 1)}} for i, a in enumerate(asins)]
+    payload = html.escape(json.dumps(recs), quote=True)
+    return f"""<!doctype html><html><head><title>Çok Satanlar</title></head><body>
+<div class="p13n-desktop-grid" data-client-recs-list="{payload}">{cards}</div>
+<ul class="a-pagination"><li class="a-selected"><a href="?pg=1">1</a></li><li class="a-normal"><a href="?pg=2">2</a></li></ul>
+{_filler(rng, 200_000)}
+</body></html>"""
+
+
+def books_listing_page(seed: int = 0, page: int = 1, pages: int = 50) -> str:
+    rng = random.Random(seed)
+    articles = []
+    for i in range(20):
+        slug = f"{_words(rng, 3).replace(' ', '-')}_{1000 - (page - 1) * 20 - i}"
+        articles.append(
+            f'<li class="col-xs-6 col-sm-4 col-md-3 col-lg-3"><article class="product_pod">'
+            f'<div class="image_container"><a href="{slug}/index.html"><img src="../media/cache/{i}.jpg" class="thumbnail"></a></div>'
+            f'<p class="star-rating {rng.choice(RATINGS)}"><i class="icon-star"></i></p>'
+            f'<h3><a href="{slug}/index.html" title="{_words(rng, 4).title()}">{_words(rng, 2)}...</a></h3>'
+            f'<div class="product_price"><p class="price_color">£{rng.randint(10, 59)}.{rng.randint(10, 99)}</p>'
+            f'<p class="instock availability"><i class="icon-ok"></i>\n    \n        In stock\n    \n</p></div>'
+            f'</article></li>')
+    nxt = f'<li class="next"><a href="page-{page + 1}.html">next</a></li>' if page < pages else ""
+    return f"""<!DOCTYPE html><html lang="en-us"><head><title>All products | Books to Scrape</title></head><body>
+<div class="page_inner"><section><ol class="row">{''.join(articles)}</ol>
+<div><ul class="pager"><li class="current">\n    Page {page} of {pages}\n    </li>{nxt}</ul></div></section></div>
+</body></html>"""
+
+
+def books_product_page(seed: int = 0) -> str:
+    rng = random.Random(seed)
+    upc = "".join(rng.choice("0123456789abcdef") for _ in range(16))
+    return f"""<!DOCTYPE html><html lang="en-us"><head><title>Book | Books to Scrape</title></head><body>
+<ul class="breadcrumb"><li><a href="../../index.html">Home</a></li><li><a href="../category/books_1/index.html">Books</a></li>
+<li><a href="../category/books/poetry_23/index.html">Poetry</a></li><li class="active">x</li></ul>
+<article class="product_page"><div class="row"><div class="col-sm-6 product_main"><h1>{_words(rng, 4).title()}</h1>
+<p class="price_color">£{rng.randint(10, 59)}.{rng.randint(10, 99)}</p>
+<p class="instock availability"><i class="icon-ok"></i>\n    \n        In stock ({rng.randint(1, 22)} available)\n    \n</p>
+<p class="star-rating {rng.choice(RATINGS)}"></p></div></div>
+<div id="product_description" class="sub-header"><h2>Product Description</h2></div><p>{_words(rng, 120)}</p>
+<table class="table table-striped"><tr><th>UPC</th><td>{upc}</td></tr><tr><th>Product Type</th><td>Books</td></tr>
+<tr><th>Price (excl. tax)</th><td>£10.00</td></tr><tr><th>Availability</th><td>In stock</td></tr>
+<tr><th>Number of reviews</th><td>0</td></tr></table></article></body></html>"""
+
+
+GENERATORS = {
+    "amazon_product": amazon_product_page,
+    "amazon_listing": amazon_listing_page,
+    "books_listing": books_listing_page,
+    "books_product": books_product_page,
+}
+
+
+def synthetic_pages(per_kind: int = 3) -> Dict[str, List[str]]:
+    return {kind: [gen(seed=i) for i in range(per_kind)] for kind, gen in GENERATORS.items()}
+
+
+def load_saved_pages(directory: str) -> Dict[str, List[str]]:
+    pages: Dict[str, List[str]] = {kind: [] for kind in KINDS}
+    for path in sorted(Path(directory).glob("*.html")):
+        for kind in KINDS:
+            if path.name.startswith(kind):
+                pages[kind].append(path.read_text(encoding="utf-8", errors="replace"))
+                break
+    return {kind: docs for kind, docs in pages.items() if docs}
+
+
+def load_pages(directory: str = None, per_kind: int = 3) -> Dict[str, List[str]]:
+    """Kayıtlı sayfalar varsa onları, yoksa sentetik sayfaları döner."""
+    if directory:
+        saved = load_saved_pages(directory)
+        if saved:
+            return saved
+    return synthetic_pages(per_kind)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# mock_server.py
+# Amaç: scraper'ları canlı sitelere çıkmadan ölçmek için yerel HTTP sunucusu.
+# Tek sunucu iki siteyi de taklit eder (yollar çakışmaz):
+#   /gp/bestsellers/.../NODE?pg=N -> Amazon çok satanlar listesi (NODE kategorisinin N. sayfası)
+#   /.../dp/ASIN/...              -> Amazon ürün sayfası
+#   /, /catalogue/page-N.html     -> books.toscrape listeleme sayfası
+#   /.../index.html               -> books.toscrape ürün sayfası
+# Sayfalar fixtures.py üreteçlerinden yola göre deterministik (aynı yol -> aynı sayfa) üretilir;
+# --fixtures DIR verilirse kayıtlı gerçek sayfalar türlerine göre (yola göre seçilerek) sunulur.
+# Her yanıt öncesi [latency, latency + jitter] kadar beklenir; error_rate olasılıkla 503 döner.
+# HTTP/1.1 keep-alive ve thread başına istek: scraper'ların bağlantı havuzları gerçekçi çalışır.
+# Kullanım: python benchmarks/mock_server.py --port 8800 --latency 0.05 --error-rate 0.02
+#   SCRAPEWORKS_AMAZON_ROOT=http://127.0.0.1:8800 python Amazon/AmazonVeriKazma.py
+
+import argparse
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from fixtures import (amazon_listing_page, amazon_product_page, books_listing_page, books_product_page,
+                      load_saved_pages)
+
+BOOKS_PAGES = 50                  # books.toscrape katalog sayfa sayısı
+PRODUCT_BYTES = 1_500_000         # sentetik Amazon ürün sayfası boyutu (gerçek sayfalar ~1-2 MB)
+AMAZON_NODES = ("computers/12601907031",)   # warm'da önceden üretilen kategoriler
+
+_AMAZON_PRODUCT = re.compile(r"/dp/([A-Za-z0-9]{8,12})")
+_BOOKS_PAGE = re.compile(r"/(?:catalogue/)?page-(\d+)\.html$")
+_HREF = re.compile(r'href="([^"#]+)"')
+
+
+def _seed(text: str) -> int:
+    return zlib.crc32(text.encode("utf-8"))
+
+
+class MockSite:
+    """
+    Yol -> (tür, anahtar) yönlendirmesi ve sayfa üretimi; HTTP'den bağımsız. Üretilen sayfalar
+    bellekte tutulur, `warm` sonrası yanıt süresi yalnızca ayarlanan gecikmedir.
+    """
+
+    def __init__(self, books_pages: int = BOOKS_PAGES, product_bytes: int = PRODUCT_BYTES,
+                 saved: Optional[Dict[str, List[str]]] = None):
+        self.books_pages = books_pages
+        self.product_bytes = product_bytes
+        self.saved = saved or {}
+        self.page = lru_cache(maxsize=None)(self._page)
+
+    def route(self, path: str, query: str):
+        """(tür, anahtar) ya da bilinmeyen yol için None."""
+        if path.startswith("/gp/bestsellers"):
+            pg = parse_qs(query).get("pg", ["1"])[0]
+            node = path.rstrip("/").rsplit("/", 1)[-1]
+            # farklı kategoriler farklı ürünler listeler
+            return "amazon_listing", (node if node.isdigit() else "", int(pg) if pg.isdigit() else 1)
+        m = _AMAZON_PRODUCT.search(path)
+        if m:
+            return "amazon_product", m.group(1)
+        m = _BOOKS_PAGE.search(path)
+        if m:
+            return "books_listing", int(m.group(1))
+        if path in ("/", "/index.html"):
+            return "books_listing", 1
+        if path.endswith("/index.html"):
+            # anahtar yalnızca slug: /slug/index.html ile /catalogue/slug/index.html aynı kitap
+            return "books_product", path.rsplit("/", 2)[-2]
+        return None
+
+    def _page(self, kind: str, key) -> Optional[str]:
+        saved = self.saved.get(kind)
+        if saved:
+            return saved[_seed(str(key)) % len(saved)]
+        if kind == "amazon_listing":
+            node, pg = key
+            return amazon_listing_page(seed=_seed(f"{node}:{pg}") if node else pg, page=pg)
+        if kind == "amazon_product":
+            return amazon_product_page(seed=_seed(key), target_bytes=self.product_bytes)
+        if kind == "books_listing":
+            return books_listing_page(seed=key, page=key, pages=self.books_pages) if key <= self.books_pages else None
+        return books_product_page(seed=_seed(key))
+
+    def warm(self, amazon_pages: int, per_listing: int = 50, amazon_nodes=AMAZON_NODES) -> int:
+        """
+        Listeleme sayfalarını ve bağladıkları ilk per_listing ürün sayfasını önceden üretir
+        (karusel / script gürültüsündeki linkler hariç); böylece ilk çalışan scraper sayfa
+        üretim süresini ödemez. Üretilen sayfa sayısını döner.
+        """
+        listings = [(f"/gp/bestsellers/{category}?pg={n}", "amazon_listing", (category.rsplit("/", 1)[-1], n))
+                    for category in amazon_nodes for n in range(1, amazon_pages + 1)]
+        listings += [(f"/catalogue/page-{n}.html", "books_listing", n) for n in range(1, self.books_pages + 1)]
+        count = 0
+        for base, kind, key in listings:
+            body = self.page(kind, key)
+            count += 1
+            products = set()
+            for href in _HREF.findall(body or ""):
+                parts = urlsplit(urljoin(base, href))
+                target = self.route(parts.path, parts.query)
+                if target and target[0].endswith("_product") and target not in products:
+                    products.add(target)
+                    self.page(*target)
+                    if len(products) >= per_listing:
+                        break
+            count += len(products)
+        return count
+
+
+class MockServer:
+    """
+    MockSite'ı arka plan thread'inde sunar. with bloğu ile ya da start/stop ile kullanılır;
+    `served` tür/status bazında sunulan yanıt sayılarını tutar.
+    """
+
+    def __init__(self, site: Optional[MockSite] = None, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.site = site or MockSite()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.served = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def root(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _draw(self):
+        with self._lock:
+            return self._rng.random(), self._rng.random()
+
+    def handle(self, request) -> None:
+        parts = urlsplit(request.path)
+        target = self.site.route(parts.path, parts.query)
+        delay_draw, error_draw = self._draw()
+        time.sleep(self.latency + self.jitter * delay_draw)
+        if target is None:
+            return self._send(request, 404, b"not found", "unknown")
+        kind, key = target
+        if error_draw < self.error_rate:
+            return self._send(request, 503, b"service unavailable", kind, {"Retry-After": "0"})
+        body = self.site.page(kind, key)
+        if body is None:
+            return self._send(request, 404, b"not found", kind)
+        self._send(request, 200, body.encode("utf-8"), kind)
+
+    def _send(self, request, status: int, body: bytes, kind: str, headers: Optional[Dict[str, str]] = None) -> None:
+        with self._lock:
+            self.served[(kind, status)] += 1
+        request.send_response(status)
+        request.send_header("Content-Type", "text/html; charset=utf-8")
+        request.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(body)
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Amazon / books.toscrape taklidi yerel HTTP sunucusu.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8800)
+    ap.add_argument("--latency", type=float, default=0.05, help="yanıt başına sabit gecikme (sn)")
+    ap.add_argument("--jitter", type=float, default=0.05, help="gecikmeye eklenen rastgele üst sınır (sn)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="503 dönme olasılığı (0-1)")
+    ap.add_argument("--fixtures", default=None, help="kayıtlı HTML sayfaları dizini")
+    ap.add_argument("--books-pages", type=int, default=BOOKS_PAGES)
+    ap.add_argument("--product-bytes", type=int, default=PRODUCT_BYTES)
+    args = ap.parse_args()
+
+    saved = load_saved_pages(args.fixtures) if args.fixtures else None
+    site = MockSite(args.books_pages, args.product_bytes, saved)
+    server = MockServer(site, args.host, args.port, args.latency, args.jitter, args.error_rate)
+    print(f"Mock sunucu: {server.root} (Ctrl+C ile durdur)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(dict(server.served))
+
+
+if __name__ == "__main__":
+    main()
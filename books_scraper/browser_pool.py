@@ -0,0 +1,148 @@
+# browser_pool.py
+# Amaç: her çağrıda yeni bir headless Chrome açmak yerine ısınmış tarayıcı + sekme havuzu.
+# Görseller, CSS ve fontlar hem Chrome tercihleriyle hem de CDP Network.setBlockedURLs ile
+# engellenir; sayfa yükleme stratejisi "eager" olduğundan driver.get DOMContentLoaded'da döner.
+# Bekleme sabit sleep ile değil, WebDriverWait ile hedef seçici DOM'a düşene kadar yapılır.
+#
+# Bir WebDriver bağlantısı aynı anda tek komut işler; bu yüzden aynı tarayıcının sekmeleri
+# bir kilidi paylaşır. Gerçek paralellik tarayıcı sayısı kadardır, sekmeler ise sayfa geçişinde
+# tarayıcıyı yeniden başlatmadan sıcak bağlam (cookie, cache, JS motoru) sağlar.
+
+import json
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, List, NamedTuple, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+DEFAULT_BROWSERS = 2
+DEFAULT_TABS = 1                  # sekme başına paralellik yok (bkz. üst not); >1 yalnızca sıcak yeniden kullanım
+PAGE_TIMEOUT = 10
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.css", "*.woff", "*.woff2", "*.ttf", "*.otf",
+]
+BLOCKED_CONTENT_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+    "profile.managed_default_content_settings.fonts": 2,
+}
+
+
+class Tab(NamedTuple):
+    driver: Any
+    handle: str
+    lock: threading.Lock     # aynı tarayıcının sekmeleri arasında ortak
+
+
+def chrome_options(headless: bool = True, user_agent: Optional[str] = None) -> Options:
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    if user_agent:
+        options.add_argument(f"--user-agent={user_agent}")
+    options.add_experimental_option("prefs", BLOCKED_CONTENT_PREFS)
+    options.page_load_strategy = "eager"
+    return options
+
+
+def block_resources(driver, patterns: List[str] = BLOCKED_URL_PATTERNS) -> None:
+    """CDP ile o anki sekmede eşleşen istekleri ağ seviyesinde engeller."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+class BrowserPool:
+    """
+    browsers x tabs kadar sekme önceden açılır. `tab()` boştaki bir sekmeyi kiralar,
+    `render()` bir URL'yi yükleyip seçiciyi bekler ve verilen scripti tek round-trip'te çalıştırır.
+    Eşzamanlı render sayısı `browsers` ile sınırlıdır; `tabs` verimi artırmaz, yalnızca
+    tarayıcı başına birden fazla sıcak sekme tutar. Tarayıcılardan biri açılamazsa o ana kadar
+    açılanlar kapatılıp hata yükseltilir (arkada Chrome süreci kalmaz).
+    """
+
+    def __init__(self, browsers: int = DEFAULT_BROWSERS, tabs: int = DEFAULT_TABS,
+                 headless: bool = True, timeout: float = PAGE_TIMEOUT,
+                 user_agent: Optional[str] = None):
+        self.timeout = timeout
+        self._drivers = []
+        self._idle: "queue.Queue[Tab]" = queue.Queue()
+        try:
+            for _ in range(browsers):
+                driver = webdriver.Chrome(service=Service(), options=chrome_options(headless, user_agent))
+                self._drivers.append(driver)
+                driver.set_page_load_timeout(timeout * 3)
+                lock = threading.Lock()
+                for i in range(tabs):
+                    if i:
+                        driver.switch_to.new_window("tab")
+                    block_resources(driver)
+                    self._idle.put(Tab(driver, driver.current_window_handle, lock))
+        except Exception:
+            self.close()
+            raise
+        self.size = browsers * tabs
+
+    @contextmanager
+    def tab(self) -> Iterator[Tab]:
+        leased = self._idle.get()
+        try:
+            with leased.lock:
+                leased.driver.switch_to.window(leased.handle)
+                yield leased
+        finally:
+            self._idle.put(leased)
+
+    def render(self, url: str, wait_css: str, script: str, *args) -> Any:
+        """
+        URL'yi yükler, wait_css DOM'a düşünce script'i çalıştırır. Script JSON string dönerse
+        çözülmüş hali döner. Seçici zaman aşımına uğrarsa TimeoutException yükselir.
+        """
+        with self.tab() as t:
+            t.driver.get(url)
+            WebDriverWait(t.driver, self.timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, wait_css)))
+            result = t.driver.execute_script(script, *args)
+        return json.loads(result) if isinstance(result, str) else result
+
+    def page_source(self, url: str, wait_css: str, min_count: int = 0) -> str:
+        """
+        Render edilmiş HTML (statik ayrıştırıcılarla işlemek için). min_count verilirse sayfa
+        sona kaydırılır ve tembel yüklenen öğeler bu sayıya ulaşana kadar (en fazla timeout) beklenir.
+        """
+        with self.tab() as t:
+            t.driver.get(url)
+            WebDriverWait(t.driver, self.timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, wait_css)))
+            if min_count:
+                t.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                try:
+                    WebDriverWait(t.driver, self.timeout).until(
+                        lambda d: len(d.find_elements(By.CSS_SELECTOR, wait_css)) >= min_count)
+                except TimeoutException:
+                    pass  # gelen kadarıyla devam; yeterlilik kararı çağırana ait
+            return t.driver.page_source
+
+    def close(self) -> None:
+        for driver in self._drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Tarayıcı kapatılamadı: {e}")
+        self._drivers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,93 @@
+# checkpoint.py
+# Amaç: uzun crawl'lar için kalıcı (SQLite) checkpoint. Toplanan ürün meta'ları, tamamlanan
+# listeleme sayfaları ve detayı çıkarılmış kayıtlar her adımda diske yazılır; yarıda kalan
+# bir çalışma yeniden başlatıldığında yalnızca kalan işler yapılır.
+# Bitişte `publish` ile kayıtlar "published" tablosuna kopyalanır; reset bu tabloyu silmez,
+# artımlı yenileme bir sonraki çalışmada önceki kayıtları buradan okur (yarım kalmış çıktı
+# dosyasından değil).
+
+import json
+import sqlite3
+from typing import Dict, Iterator, List, Set
+
+
+class CrawlCheckpoint:
+    """
+    run_key aynı crawl'ı tanımlar (ör. kategori URL'si); farklı crawl'lar aynı dosyayı
+    paylaşabilir. Yazmalar hemen commit edilir (WAL modunda ucuzdur).
+    """
+
+    def __init__(self, path: str, run_key: str):
+        self.run_key = run_key
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                run TEXT NOT NULL, url TEXT NOT NULL, PRIMARY KEY (run, url));
+            CREATE TABLE IF NOT EXISTS products_meta (
+                run TEXT NOT NULL, position INTEGER NOT NULL, asin TEXT NOT NULL,
+                meta TEXT NOT NULL, PRIMARY KEY (run, asin));
+            CREATE TABLE IF NOT EXISTS records (
+                run TEXT NOT NULL, asin TEXT NOT NULL, record TEXT NOT NULL,
+                PRIMARY KEY (run, asin));
+            CREATE TABLE IF NOT EXISTS published (
+                asin TEXT PRIMARY KEY, record TEXT NOT NULL);
+        """)
+        self._db.commit()
+
+    # -------- listeleme sayfaları + meta --------
+    def page_done(self, url: str) -> bool:
+        row = self._db.execute("SELECT 1 FROM pages WHERE run = ? AND url = ?", (self.run_key, url)).fetchone()
+        return row is not None
+
+    def save_page(self, url: str, products: List[Dict]) -> None:
+        """Sayfayı tamamlandı işaretle ve ürün meta'larını sırayla ekle (tek transaction)."""
+        with self._db:
+            start = self._db.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM products_meta WHERE run = ?",
+                                     (self.run_key,)).fetchone()[0]
+            self._db.executemany(
+                "INSERT OR IGNORE INTO products_meta VALUES (?, ?, ?, ?)",
+                [(self.run_key, start + i, p["asin"], json.dumps(p, ensure_ascii=False))
+                 for i, p in enumerate(products)])
+            self._db.execute("INSERT OR IGNORE INTO pages VALUES (?, ?)", (self.run_key, url))
+
+    def products_meta(self) -> List[Dict]:
+        rows = self._db.execute("SELECT meta FROM products_meta WHERE run = ? ORDER BY position",
+                                (self.run_key,))
+        return [json.loads(m) for (m,) in rows]
+
+    # -------- detay kayıtları --------
+    def save_record(self, asin: str, record: Dict) -> None:
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO records VALUES (?, ?, ?)",
+                             (self.run_key, asin, json.dumps(record, ensure_ascii=False)))
+
+    def completed_asins(self) -> Set[str]:
+        rows = self._db.execute("SELECT asin FROM records WHERE run = ?", (self.run_key,))
+        return {a for (a,) in rows}
+
+    def records(self) -> Iterator[Dict]:
+        for (r,) in self._db.execute("SELECT record FROM records WHERE run = ?", (self.run_key,)):
+            yield json.loads(r)
+
+    # -------- tamamlanmış çalışmaların kayıtları --------
+    def publish(self) -> None:
+        """Bu crawl'ın kayıtlarını kalıcı tabloya aktar (aynı ASIN'in eski kaydının yerine geçer)."""
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO published SELECT asin, record FROM records WHERE run = ?",
+                             (self.run_key,))
+
+    def published_records(self) -> Dict[str, Dict]:
+        """asin -> önceki çalışmalarda yayımlanmış son kayıt."""
+        return {a: json.loads(r) for a, r in self._db.execute("SELECT asin, record FROM published")}
+
+    # -------- yaşam döngüsü --------
+    def reset(self) -> None:
+        """Bu crawl'ın tüm checkpoint verisini sil (başarılı bitiş ya da sıfırdan başlama); published kalır."""
+        with self._db:
+            for table in ("pages", "products_meta", "records"):
+                self._db.execute(f"DELETE FROM {table} WHERE run = ?", (self.run_key,))
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,176 @@
+# concurrent_fetch.py
+# Amaç: bloklayan bir fetch fonksiyonunu (ör. AmazonVeriKazma.get) asyncio üzerinden
+# eşzamanlı çalıştırmak. Aynı anda en fazla N istek uçuşta tutulur; her host için ayrı
+# bir nezaket bütçesi (host başına eşzamanlılık + istek başlangıçları arası bekleme) uygulanır.
+# Fetch fonksiyonu thread'lerde çalıştığı için retry / user-agent rotasyonu aynen korunur.
+# fetch_parse_all: üretici/tüketici hattı. Fetch'ler event loop'ta eşzamanlı sürer, indirilen HTML
+# sınırlı bir kuyruk üzerinden ProcessPoolExecutor'daki parse worker'larına gider (GIL'e takılmaz);
+# kuyruk ve uçuştaki parse işleri dolunca fetch'ler bekler (backpressure).
+# İşler scheduler.CrawlScheduler üzerinden dağıtılır (öncelik + host dönüşümü); düz bir iş
+# listesi verilirse ekleme sırası korunur.
+
+import asyncio
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from scheduler import CrawlScheduler
+
+FetchFn = Callable[[str], Tuple[str, int]]
+Jobs = Union[Iterable[Tuple[Any, str]], CrawlScheduler]
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_HOST = 4
+# bir çekirdek fetch / yazma yapan ana sürece kalır; tek çekirdekte ayrıştırma ana süreçte yapılır
+DEFAULT_PARSE_WORKERS = max((os.cpu_count() or 1) - 1, 0)
+
+
+class HostBudget:
+    """Tek bir host için nezaket bütçesi: en fazla `max_in_flight` eşzamanlı istek ve
+    ardışık istek başlangıçları arasında `delay_range` aralığından rastgele bir bekleme."""
+
+    def __init__(self, max_in_flight: int, delay_range: Tuple[float, float]):
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.delay_range = delay_range
+        self._next_start = 0.0
+
+    async def wait_turn(self) -> None:
+        # sıradaki başlangıç zamanını ayır, sonra o ana kadar bekle (kilit gerektirmez:
+        # event loop tek thread, await öncesi bölüm atomik)
+        now = time.monotonic()
+        start_at = max(now, self._next_start)
+        self._next_start = start_at + random.uniform(*self.delay_range)
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+
+async def fetch_as_completed(jobs: Jobs, fetch: FetchFn,
+                             concurrency: int = DEFAULT_CONCURRENCY,
+                             per_host: int = DEFAULT_PER_HOST,
+                             delay_range: Tuple[float, float] = (0.0, 0.0),
+                             buffer: int = 0
+                             ) -> AsyncIterator[Tuple[Any, str, int]]:
+    """
+    jobs: (anahtar, url) çiftleri ya da bir CrawlScheduler. Her tamamlanan istek için
+    (anahtar, text, status) üretir; sonuçlar geliş sırasına göre döner, iş sırasına göre değil.
+    Boş bir worker, host bütçesi dolu olmayan hostlar arasından sıradaki işi alır (dolu bir host
+    diğerlerini bekletmez). Scheduler verilirse tüketici sonuçları işlerken ona yeni iş
+    ekleyebilir; akış kuyruk boşalıp uçuşta istek kalmayınca biter. buffer > 0 ise tüketilmemiş
+    en fazla buffer sonuç tutulur; tüketici yavaşsa fetch worker'ları bekler.
+    """
+    loop = asyncio.get_running_loop()
+    budgets: Dict[str, HostBudget] = {}
+    pending = jobs if isinstance(jobs, CrawlScheduler) else CrawlScheduler.fifo(jobs)
+    results: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+    wakeup = asyncio.Event()          # bir host slotu boşaldı ya da kuyruğa iş eklendi
+    in_flight = 0
+    if not pending:
+        return
+
+    def budget_for(host: str) -> HostBudget:
+        if host not in budgets:
+            budgets[host] = HostBudget(per_host, delay_range)
+        return budgets[host]
+
+    def host_ready(host: str) -> bool:
+        return not budget_for(host).semaphore.locked()
+
+    async def worker(executor: ThreadPoolExecutor):
+        nonlocal in_flight
+        while True:
+            job = pending.pop(ready=host_ready)
+            if job is None:
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+            key, url = job
+            in_flight += 1
+            budget = budget_for(urlsplit(url).netloc)
+            async with budget.semaphore:
+                await budget.wait_turn()
+                try:
+                    text, status = await loop.run_in_executor(executor, fetch, url)
+                except Exception as e:
+                    print(f"Fetch exception for {url}: {e}")
+                    text, status = "", 0
+            wakeup.set()
+            await results.put((key, text, status))
+            in_flight -= 1
+
+    # scheduler'a sonradan iş eklenebilir: worker sayısı ilk kuyruk boyuna göre kısılmaz
+    workers = max(1, concurrency if isinstance(jobs, CrawlScheduler) else min(concurrency, len(pending)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        tasks = [asyncio.create_task(worker(executor)) for _ in range(workers)]
+        try:
+            while pending or in_flight or not results.empty():
+                yield await results.get()
+                wakeup.set()      # tüketici yeni iş eklemiş olabilir
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def fetch_all(jobs: Jobs, fetch: FetchFn,
+              on_result: Callable[[Any, str, int], None], **kwargs) -> None:
+    """fetch_as_completed için senkron sarmalayıcı: her sonuç geldiği anda on_result çağrılır."""
+    async def runner():
+        async for key, text, status in fetch_as_completed(jobs, fetch, **kwargs):
+            on_result(key, text, status)
+
+    asyncio.run(runner())
+
+
+def fetch_parse_all(jobs: Jobs, fetch: FetchFn,
+                    parse: Callable[[Any, str], Any],
+                    on_result: Callable[[Any, Any, int], None],
+                    parse_workers: int = DEFAULT_PARSE_WORKERS,
+                    queue_size: Optional[int] = None, **kwargs) -> None:
+    """
+    fetch_all gibi, ama her başarılı (status 200, boş olmayan) sayfa parse(anahtar, text) ile
+    ayrı süreçlerde ayrıştırılır ve on_result(anahtar, parse sonucu, status) ana süreçte çağrılır;
+    başarısız sayfalarda parse sonucu None'dır. parse ve anahtarlar picklable olmalı (modül
+    seviyesi fonksiyon, dict/tuple); sonuç küçük tutulmalı (HTML değil, çıkarılan alanlar).
+    queue_size: indirilmiş ama ayrıştırılmamış en fazla sayfa (varsayılan worker sayısının 2 katı).
+    parse_workers=0 ise ayrıştırma ana süreçte yapılır (eski davranış).
+    """
+    queue_size = queue_size or max(2, parse_workers * 2)
+
+    if parse_workers <= 0:
+        def inline(key, text, status):
+            on_result(key, parse(key, text) if status == 200 and text else None, status)
+        return fetch_all(jobs, fetch, inline, **kwargs)
+
+    async def runner(pool):
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(queue_size)
+        tasks = set()
+
+        async def parse_one(key, text, status):
+            try:
+                parsed = await loop.run_in_executor(pool, parse, key, text)
+            except Exception as e:
+                print(f"Parse exception for {key!r}: {e}")
+                parsed = None
+            finally:
+                slots.release()
+            on_result(key, parsed, status)
+
+        async for key, text, status in fetch_as_completed(jobs, fetch, buffer=queue_size, **kwargs):
+            if status != 200 or not text:
+                on_result(key, None, status)
+                continue
+            await slots.acquire()
+            task = asyncio.create_task(parse_one(key, text, status))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    # spawn: fetch thread'leri çalışırken fork edilmiş süreçlerde kilit kilitlenmesi riski olmasın
+    with ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        asyncio.run(runner(pool))
@@ -0,0 +1,225 @@
+# exporters.py
+# Amaç: kayıtları çıkarıldıkları anda dosyaya ekleyen akış (streaming) yazıcılar.
+# Bellekte yalnızca bir batch tutulur; her batch sonunda dosya flush edilir, böylece
+# çökmede en fazla bir batch kaybolur. Desteklenen biçimler (uzantıya göre):
+#   .csv   -> CsvStreamWriter
+#   .jsonl -> JsonLinesStreamWriter
+#   .parquet -> ParquetStreamWriter (pyarrow gerekir; her batch bir row group)
+#   .xlsx  -> XlsxStreamWriter (openpyxl write-only modu; dosya yalnızca close()'da yazılır)
+
+import csv
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_BATCH_SIZE = 100
+
+
+class StreamWriter:
+    """Ortak batch/flush mantığı; alt sınıflar `_open` ve `_write_batch` uygular."""
+
+    def __init__(self, path: str, fieldnames: Optional[List[str]] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.path = Path(path)
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.batch_size = batch_size
+        self.count = 0
+        self._buffer: List[Dict] = []
+        self._opened = False
+
+    def write(self, record: Dict) -> None:
+        if self.fieldnames is None:
+            self.fieldnames = list(record.keys())
+        self._buffer.append(record)
+        self.count += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[Dict]) -> None:
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        if not self._opened:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._open()
+            self._opened = True
+        self._write_batch(self._buffer)
+        self._buffer = []
+
+    def close(self) -> None:
+        self.flush()
+        if not self._opened and self.fieldnames:
+            # hiç kayıt gelmediyse de başlıklı boş dosya bırak
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._open()
+            self._opened = True
+        if self._opened:
+            self._close()
+
+    def abort(self) -> None:
+        """
+        Çalışma hatayla/kesintiyle bittiğinde (`with` bloğundan istisna çıkarken) çağrılır.
+        Varsayılan close() ile aynıdır: akış dosyaları o ana kadarki kayıtlarla kalır.
+        """
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    # alt sınıflar
+    def _open(self) -> None:
+        raise NotImplementedError
+
+    def _write_batch(self, rows: List[Dict]) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        pass
+
+
+class CsvStreamWriter(StreamWriter):
+    def __init__(self, path: str, fieldnames: Optional[List[str]] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, encoding: str = "utf-8"):
+        super().__init__(path, fieldnames, batch_size)
+        self.encoding = encoding
+
+    def _open(self) -> None:
+        self._file = open(self.path, "w", newline="", encoding=self.encoding)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def _write_batch(self, rows: List[Dict]) -> None:
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class JsonLinesStreamWriter(StreamWriter):
+    def _open(self) -> None:
+        self._file = open(self.path, "w", encoding="utf-8")
+
+    def _write_batch(self, rows: List[Dict]) -> None:
+        self._file.writelines(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in rows)
+        self._file.flush()
+
+    def _close(self) -> None:
+        self._file.close()
+
+
+class ParquetStreamWriter(StreamWriter):
+    """
+    Her batch ayrı bir row group olarak yazılır. schema verilmezse tüm sütunlar string olur
+    (CSV çıktısıyla aynı, batch'ler arası tip çakışması olmaz).
+    """
+
+    def __init__(self, path: str, fieldnames: Optional[List[str]] = None,
+                 batch_size: int = 1000, schema=None):
+        super().__init__(path, fieldnames, batch_size)
+        self.schema = schema
+
+    def _open(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.schema is None:
+            self.schema = pa.schema([(name, pa.string()) for name in self.fieldnames])
+        self._pa = pa
+        self._writer = pq.ParquetWriter(str(self.path), self.schema)
+
+    def _write_batch(self, rows: List[Dict]) -> None:
+        pa = self._pa
+        columns = {}
+        for field in self.schema:
+            values = [r.get(field.name) for r in rows]
+            if pa.types.is_string(field.type):
+                values = [None if v is None else str(v) for v in values]
+            columns[field.name] = values
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self.schema))
+
+    def _close(self) -> None:
+        self._writer.close()
+
+
+class XlsxStreamWriter(StreamWriter):
+    """
+    Satırlar write-only çalışma sayfasına (openpyxl geçici dosyasına) eklenir, ama .xlsx bir zip
+    arşivi olduğu için hedef dosya yalnızca close()'da yazılır: çökmede XLSX çıktısı oluşmaz,
+    batch flush'ı burada dayanıklılık sağlamaz (aynı kayıtlar için CSV/JSONL yazıcısı kullanın).
+    """
+
+    def _open(self) -> None:
+        from openpyxl import Workbook
+
+        self._book = Workbook(write_only=True)
+        self._sheet = self._book.create_sheet()
+        self._sheet.append(self.fieldnames)
+
+    def _write_batch(self, rows: List[Dict]) -> None:
+        for r in rows:
+            self._sheet.append([r.get(name) for name in self.fieldnames])
+
+    def _close(self) -> None:
+        self._book.save(str(self.path))
+
+
+WRITERS = {
+    ".csv": CsvStreamWriter,
+    ".jsonl": JsonLinesStreamWriter,
+    ".parquet": ParquetStreamWriter,
+    ".xlsx": XlsxStreamWriter,
+}
+
+
+def open_writer(path: str, fieldnames: Optional[List[str]] = None, batch_size: Optional[int] = None,
+                encoding: str = "utf-8") -> StreamWriter:
+    """Dosya uzantısına göre uygun yazıcıyı döner (encoding yalnızca CSV için)."""
+    suffix = Path(path).suffix.lower()
+    if suffix not in WRITERS:
+        raise ValueError(f"Desteklenmeyen çıktı biçimi: {path}")
+    kwargs = {"fieldnames": fieldnames}
+    if batch_size:
+        kwargs["batch_size"] = batch_size
+    if suffix == ".csv":
+        kwargs["encoding"] = encoding
+    return WRITERS[suffix](path, **kwargs)
+
+
+class MultiWriter:
+    """Aynı kaydı birden fazla yazıcıya iletir (ör. CSV + XLSX)."""
+
+    def __init__(self, writers: List[StreamWriter]):
+        self.writers = writers
+
+    @property
+    def count(self) -> int:
+        return self.writers[0].count if self.writers else 0
+
+    def write(self, record: Dict) -> None:
+        for w in self.writers:
+            w.write(record)
+
+    def close(self) -> None:
+        for w in self.writers:
+            w.close()
+
+    def abort(self) -> None:
+        for w in self.writers:
+            w.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for w in self.writers:
+            w.__exit__(exc_type, exc, tb)
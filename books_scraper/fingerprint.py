@@ -0,0 +1,41 @@
+# fingerprint.py
+# Amaç: her kayıt için normalize edilmiş alanlar üzerinden kararlı bir içerik parmak izi.
+# Parmak izi aynıysa kayıt değişmemiştir; karşılaştırmalar önce parmak izine bakar,
+# sütunlara yalnızca hash farklıysa iner. Alan adları da hash'e girer ve alanlar ada göre
+# sıralanır, böylece sütun sırası parmak izini etkilemez.
+
+import hashlib
+import math
+import re
+from typing import Dict, Iterable, Optional
+
+FINGERPRINT_FIELD = "fingerprint"
+SCRAPED_AT_FIELD = "scraped_at"     # kaydın çekildiği an (UTC, ISO 8601); içerik değil
+EXCLUDED_FIELDS = {FINGERPRINT_FIELD, SCRAPED_AT_FIELD}
+NULL_MARKERS = {"", "NonePublished", "None", "nan", "NaN"}
+_WS = re.compile(r"\s+")
+
+
+def normalize_value(value) -> str:
+    """None/NaN/NonePublished -> "", 12.0 -> "12", fazla boşluklar tek boşluğa iner."""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ""
+        if value.is_integer():
+            value = int(value)
+    text = _WS.sub(" ", str(value)).strip()
+    return "" if text in NULL_MARKERS else text
+
+
+def row_fingerprint(record: Dict, fields: Optional[Iterable[str]] = None) -> str:
+    """Kaydın 16 hex karakterlik (64 bit) blake2b parmak izi."""
+    names = sorted(fields if fields is not None else (k for k in record if k not in EXCLUDED_FIELDS))
+    h = hashlib.blake2b(digest_size=8)
+    for name in names:
+        h.update(name.encode("utf-8"))
+        h.update(b"\x1e")
+        h.update(normalize_value(record.get(name)).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
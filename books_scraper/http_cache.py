@@ -0,0 +1,196 @@
+# http_cache.py
+# Amaç: URL'ye göre anahtarlanan, diskte kalıcı HTTP yanıt cache'i.
+# - Gövdeler içerik hash'i (sha256) ile adlandırılır: aynı içerik bir kez saklanır.
+# - İndeks SQLite'ta: url -> gövde hash'i, durum, başlıklar, ETag/Last-Modified, zamanlar.
+# - TTL içindeki kayıt ağa çıkmadan döner; süresi dolmuşsa If-None-Match / If-Modified-Since
+#   ile yeniden doğrulanır (304 -> kayıt tazelenir, gövde yeniden indirilmez).
+# - Toplam boyut max_bytes'ı aşınca en uzun süredir erişilmeyen kayıtlar silinir (LRU).
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+DEFAULT_TTL = 6 * 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class CachedResponse(NamedTuple):
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    encoding: str
+    stored_at: float
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+    @property
+    def etag(self) -> Optional[str]:
+        return _header(self.headers, "ETag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return _header(self.headers, "Last-Modified")
+
+
+def _header(headers: Dict[str, str], name: str) -> Optional[str]:
+    lname = name.lower()
+    for k, v in headers.items():
+        if k.lower() == lname:
+            return v
+    return None
+
+
+class ResponseCache:
+    """
+    Thread-safe disk cache. `offline=True` iken süresi dolmuş kayıtlar da taze sayılır;
+    selector geliştirirken tekrar çalıştırmalar hiç ağa çıkmaz.
+    """
+
+    def __init__(self, directory: str = ".httpcache", ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES, offline: bool = False):
+        self.directory = Path(directory)
+        self.bodies = self.directory / "bodies"
+        self.bodies.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.directory / "index.sqlite3"), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (accessed_at)")
+        self._db.commit()
+
+    # -------- yardımcılar --------
+    @staticmethod
+    def url_key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, body_hash: str) -> Path:
+        return self.bodies / body_hash[:2] / body_hash
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return self.offline or (time.time() - entry.stored_at) < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedResponse]) -> Dict[str, str]:
+        """Yeniden doğrulama için If-None-Match / If-Modified-Since başlıkları."""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    # -------- okuma / yazma --------
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        """Kayıt varsa (taze ya da bayat) döner ve LRU erişim zamanını günceller."""
+        key = self.url_key(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT status, headers, encoding, body_hash, stored_at FROM entries WHERE url_key = ?",
+                (key,)).fetchone()
+            if row is None:
+                return None
+            status, headers, encoding, body_hash, stored_at = row
+            try:
+                body = self._body_path(body_hash).read_bytes()
+            except FileNotFoundError:
+                self._delete(key, body_hash)
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE url_key = ?", (time.time(), key))
+            self._db.commit()
+        return CachedResponse(url, status, json.loads(headers), body, encoding, stored_at)
+
+    def store(self, url: str, status: int, headers: Dict[str, str], body: bytes,
+              encoding: Optional[str] = None) -> None:
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self._body_path(body_hash)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp%d" % threading.get_ident())
+            tmp.write_bytes(body)
+            os.replace(tmp, path)
+        now = time.time()
+        key = self.url_key(url)
+        with self._lock:
+            old = self._db.execute("SELECT body_hash FROM entries WHERE url_key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, status, json.dumps(dict(headers)), encoding, body_hash, len(body), now, now))
+            if old and old[0] != body_hash:
+                self._drop_body_if_unused(old[0])
+            self._evict()
+            self._db.commit()
+
+    def store_response(self, url: str, resp) -> None:
+        """requests.Response kaydet (yalnızca 200)."""
+        if resp.status_code == 200:
+            self.store(url, resp.status_code, dict(resp.headers), resp.content,
+                       resp.encoding or resp.apparent_encoding)
+
+    def revalidated(self, url: str, headers: Dict[str, str]) -> None:
+        """304 sonrası: kaydı tazele, yeni ETag/Last-Modified gibi başlıkları birleştir."""
+        key = self.url_key(url)
+        with self._lock:
+            row = self._db.execute("SELECT headers FROM entries WHERE url_key = ?", (key,)).fetchone()
+            if row is None:
+                return
+            merged = json.loads(row[0])
+            for name in ("ETag", "Last-Modified", "Cache-Control", "Expires", "Date"):
+                value = _header(headers, name)
+                if value is not None:
+                    merged[name] = value
+            now = time.time()
+            self._db.execute("UPDATE entries SET headers = ?, stored_at = ?, accessed_at = ? WHERE url_key = ?",
+                             (json.dumps(merged), now, now, key))
+            self._db.commit()
+
+    # -------- LRU tahliye --------
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, body_hash, size in self._db.execute(
+                "SELECT url_key, body_hash, size FROM entries ORDER BY accessed_at").fetchall():
+            self._delete(key, body_hash)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _delete(self, key: str, body_hash: str) -> None:
+        self._db.execute("DELETE FROM entries WHERE url_key = ?", (key,))
+        self._drop_body_if_unused(body_hash)
+
+    def _drop_body_if_unused(self, body_hash: str) -> None:
+        used = self._db.execute("SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)).fetchone()
+        if not used:
+            try:
+                self._body_path(body_hash).unlink()
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
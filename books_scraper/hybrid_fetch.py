@@ -0,0 +1,138 @@
+# hybrid_fetch.py
+# Amaç: önce ucuz statik yolu (requests + cache) dene; çıkarım yetersizse (ör. JS ile dolan
+# kartlar eksik) yalnızca o sayfa için havuzdaki headless tarayıcıya yüksel. Hangi URL'lerin
+# render gerektirdiği bir JSON ipucu dosyasına yazılır; sonraki çalışmalarda bu URL'ler statik
+# denemeyi atlayıp doğrudan tarayıcıya, diğerleri doğrudan statik yola gider.
+#
+# Tarayıcı havuzu ilk ihtiyaç anında açılır; selenium kurulu değilse ya da Chrome açılamazsa
+# statik sonuç olduğu gibi döner (çalışma durmaz).
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+HINTS_PATH = "render_hints.json"
+
+
+class HybridResult(NamedTuple):
+    html: str
+    status: int
+    rendered: bool       # True: sonuç tarayıcıdan geldi
+    extracted: Any       # extract(html) çıktısı (çağıran yeniden ayrıştırmasın diye)
+
+
+class RenderHints:
+    """URL -> {"render": bool, "items": int, "updated": epoch}; her güncellemede atomik yazılır."""
+
+    def __init__(self, path: str = HINTS_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            self._hints: Dict[str, Dict] = json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            self._hints = {}
+
+    def needs_render(self, url: str) -> Optional[bool]:
+        """Bilinmeyen URL için None."""
+        hint = self._hints.get(url)
+        return hint["render"] if hint else None
+
+    def record(self, url: str, render: bool, items: int) -> None:
+        with self._lock:
+            self._hints[url] = {"render": render, "items": items, "updated": int(time.time())}
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp.write_text(json.dumps(self._hints, ensure_ascii=False, indent=1), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+
+class HybridFetcher:
+    """
+    static_fetch: url -> (text, status) (ör. AmazonVeriKazma.get; cache/limiter onun içinde).
+    extract: html -> çıkarım sonucu; sufficient: sonuç -> bool (ör. len(ürünler) >= 50).
+    wait_css / min_count: tarayıcıda hangi öğe beklenecek ve en az kaç tane.
+    """
+
+    def __init__(self, static_fetch: Callable[[str], Tuple[str, int]], wait_css: str,
+                 min_count: int = 0, hints_path: str = HINTS_PATH, limiter=None,
+                 browsers: int = 1, tabs: int = 1, user_agent: Optional[str] = None):
+        self.static_fetch = static_fetch
+        self.wait_css = wait_css
+        self.min_count = min_count
+        self.hints = RenderHints(hints_path)
+        self.limiter = limiter
+        self._pool_args = {"browsers": browsers, "tabs": tabs, "user_agent": user_agent}
+        self._pool = None
+        self._pool_failed = False
+        self._pool_lock = threading.Lock()
+
+    def _browser(self):
+        with self._pool_lock:
+            if self._pool is None and not self._pool_failed:
+                try:
+                    from browser_pool import BrowserPool
+                    self._pool = BrowserPool(**self._pool_args)
+                except Exception as e:
+                    print(f"Tarayıcı havuzu açılamadı, yalnızca statik yol kullanılacak: {e}")
+                    self._pool_failed = True
+            return self._pool
+
+    def _render(self, url: str) -> Optional[str]:
+        pool = self._browser()
+        if pool is None:
+            return None
+        if self.limiter is not None:
+            self.limiter.wait(url)
+        try:
+            return pool.page_source(url, self.wait_css, min_count=self.min_count)
+        except Exception as e:
+            print(f"Render başarısız: {url}: {e}")
+            return None
+
+    def fetch(self, url: str, extract: Callable[[str], Any],
+              sufficient: Callable[[Any], bool]) -> HybridResult:
+        def size(result) -> int:
+            if isinstance(result, int):
+                return result
+            try:
+                return len(result)
+            except TypeError:
+                return int(bool(result))
+
+        static = None
+        if self.hints.needs_render(url) is not True:
+            text, status = self.static_fetch(url)
+            extracted = extract(text) if status == 200 and text else None
+            static = HybridResult(text, status, False, extracted)
+            if extracted is not None and sufficient(extracted):
+                self.hints.record(url, False, size(extracted))
+                return static
+
+        rendered_html = self._render(url)
+        if rendered_html:
+            extracted = extract(rendered_html)
+            static_size = size(static.extracted) if static and static.extracted is not None else -1
+            if sufficient(extracted) or size(extracted) > static_size:
+                self.hints.record(url, True, size(extracted))
+                return HybridResult(rendered_html, 200, True, extracted)
+        if static is None:
+            # ipucu render diyordu ama tarayıcı yok/başarısız: statik yola dön
+            text, status = self.static_fetch(url)
+            static = HybridResult(text, status, False, extract(text) if status == 200 and text else None)
+        if static.extracted is not None:
+            # render yardımcı olmadı (kısa son sayfa, küçük kategori) ya da tarayıcı yok: statik sonuç kullanıldı
+            self.hints.record(url, False, size(static.extracted))
+        return static
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,253 @@
+# metrics.py
+# Amaç: tüm scraper'lar için ortak, hafif ölçüm katmanı. Çalışma boyunca bellekte toplanır,
+# bitişte tek dosyaya yazılır (.json: özet, .prom / .txt: Prometheus metin biçimi).
+#   - host başına fetch gecikmesi histogramı, indirilen bayt, status dağılımı
+#   - status'a göre retry sayısı
+#   - sayfa türü başına (listing / product ...) ayrıştırma süresi histogramı
+#   - alan başına doluluk oranı ve alanı hangi selector'ın doldurduğu
+#   - saniyede kayıt (items/s)
+# Histogramlar sabit kovalı (Prometheus uyumlu); yüzdelikler kova içinde doğrusal tahmindir.
+# Tüm kayıt metodları thread-safe; fetch yolunda çağrı başına yalnızca bir kilit + bisect.
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)       # saniye
+PARSE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)  # saniye
+PREFIX = "scrapeworks"
+
+
+class Histogram:
+    """Sabit kovalı histogram: kova sayıları (kümülatif değil), toplam ve adet."""
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)     # son kova: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                if i == len(self.buckets):
+                    return lower                       # +Inf kovası: alt sınır
+                return lower + (self.buckets[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+    def summary(self) -> Dict:
+        if not self.count:
+            return {"count": 0}
+        return {"count": self.count, "mean": round(self.sum / self.count, 4),
+                "p50": round(self.quantile(0.5), 4), "p90": round(self.quantile(0.9), 4),
+                "p99": round(self.quantile(0.99), 4)}
+
+
+class CrawlMetrics:
+    """Bir çalışmanın metrikleri. `name` dışa aktarımda crawler etiketi olur."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.monotonic()
+        self.latency: Dict[str, Histogram] = {}
+        self.bytes = Counter()                    # host -> bayt
+        self.statuses = Counter()                 # (host, status) -> adet
+        self.retries = Counter()                  # status (ya da "exception") -> adet
+        self.cache_hits = 0
+        self.parse: Dict[str, Histogram] = {}
+        self.records = 0                          # alan doluluğu ölçülen kayıt sayısı
+        self.field_hits = Counter()               # alan -> dolu kayıt
+        self.selector_hits = Counter()            # (alan, selector) -> alanı dolduran kayıt
+        self.items = 0
+        self._lock = threading.Lock()
+
+    # -------- kayıt --------
+    def observe_fetch(self, url: str, seconds: float, status: int, nbytes: int = 0) -> None:
+        host = urlsplit(url).netloc
+        with self._lock:
+            hist = self.latency.get(host)
+            if hist is None:
+                hist = self.latency[host] = Histogram(LATENCY_BUCKETS)
+            hist.observe(seconds)
+            self.bytes[host] += nbytes
+            self.statuses[(host, status)] += 1
+
+    def observe_retry(self, status, n: int = 1) -> None:
+        with self._lock:
+            self.retries[str(status)] += n
+
+    def observe_cache_hit(self) -> None:
+        with self._lock:
+            self.cache_hits += 1
+
+    def observe_parse(self, kind: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.parse.get(kind)
+            if hist is None:
+                hist = self.parse[kind] = Histogram(PARSE_BUCKETS)
+            hist.observe(seconds)
+
+    @contextmanager
+    def time_parse(self, kind: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_parse(kind, time.perf_counter() - start)
+
+    def observe_fields(self, record: Dict, fields: Iterable[str], missing=("", None),
+                       sources: Optional[Dict[str, str]] = None) -> None:
+        """fields içinde missing dışı değeri olanlar isabet sayılır; sources alan -> selector etiketidir."""
+        fields = list(fields)
+        hits = [f for f in fields if record.get(f) not in missing]
+        with self._lock:
+            self.records += 1
+            for f in fields:
+                self.field_hits[f] += 0               # hiç dolmayan alan da oranda görünsün
+            self.field_hits.update(hits)
+            if sources:
+                self.selector_hits.update((f, sources[f]) for f in hits if f in sources)
+
+    def observe_item(self, n: int = 1) -> None:
+        with self._lock:
+            self.items += n
+
+    # -------- dışa aktarım --------
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            elapsed = self.elapsed()
+            hosts = {}
+            for host, hist in self.latency.items():
+                hosts[host] = {
+                    "latency": hist.summary(),
+                    "bytes": self.bytes[host],
+                    "statuses": {str(s): n for (h, s), n in sorted(self.statuses.items(), key=str) if h == host},
+                }
+            selectors = defaultdict(dict)
+            for (field, selector), n in self.selector_hits.most_common():
+                selectors[field][selector] = n
+            return {
+                "name": self.name,
+                "elapsed_seconds": round(elapsed, 3),
+                "items": self.items,
+                "items_per_second": round(self.items / elapsed, 3) if elapsed > 0 else 0.0,
+                "cache_hits": self.cache_hits,
+                "hosts": hosts,
+                "retries": dict(self.retries),
+                "parse_seconds": {kind: hist.summary() for kind, hist in self.parse.items()},
+                "fields": {
+                    "records": self.records,
+                    "hit_rate": {f: round(n / self.records, 4) for f, n in self.field_hits.most_common()},
+                    "selectors": dict(selectors),
+                },
+            }
+
+    def to_prometheus(self) -> str:
+        crawler = _label(self.name)
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+        def sample(name, value, **labels):
+            labels = {"crawler": crawler, **{k: _label(v) for k, v in labels.items()}}
+            body = ",".join(f'{k}="{v}"' for k, v in labels.items())
+            lines.append(f"{PREFIX}_{name}{{{body}}} {value}")
+
+        def histogram(name, hist, **labels):
+            cumulative = 0
+            for bound, n in zip(hist.buckets + ("+Inf",), hist.counts):
+                cumulative += n
+                sample(f"{name}_bucket", cumulative, le=bound, **labels)
+            sample(f"{name}_sum", round(hist.sum, 6), **labels)
+            sample(f"{name}_count", hist.count, **labels)
+
+        with self._lock:
+            elapsed = self.elapsed()
+            metric("fetch_seconds", "histogram", "Fetch latency per host.")
+            for host, hist in self.latency.items():
+                histogram("fetch_seconds", hist, host=host)
+            metric("downloaded_bytes_total", "counter", "Response body bytes per host.")
+            for host, n in self.bytes.items():
+                sample("downloaded_bytes_total", n, host=host)
+            metric("responses_total", "counter", "Responses per host and status.")
+            for (host, status), n in self.statuses.items():
+                sample("responses_total", n, host=host, status=status)
+            metric("retries_total", "counter", "Retried attempts by status.")
+            for status, n in self.retries.items():
+                sample("retries_total", n, status=status)
+            metric("cache_hits_total", "counter", "Fetches served from the local cache.")
+            sample("cache_hits_total", self.cache_hits)
+            metric("parse_seconds", "histogram", "Parse time per page kind.")
+            for kind, hist in self.parse.items():
+                histogram("parse_seconds", hist, kind=kind)
+            metric("records_total", "counter", "Records checked for field coverage.")
+            sample("records_total", self.records)
+            metric("field_hits_total", "counter", "Records with a non-empty field.")
+            for field, n in self.field_hits.items():
+                sample("field_hits_total", n, field=field)
+            metric("selector_hits_total", "counter", "Fields filled per selector.")
+            for (field, selector), n in self.selector_hits.items():
+                sample("selector_hits_total", n, field=field, selector=selector)
+            metric("items_total", "counter", "Items written.")
+            sample("items_total", self.items)
+            metric("elapsed_seconds", "gauge", "Run duration.")
+            sample("elapsed_seconds", round(elapsed, 3))
+            metric("items_per_second", "gauge", "Items written per second of run time.")
+            sample("items_per_second", round(self.items / elapsed, 3) if elapsed > 0 else 0.0)
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str) -> None:
+        """Uzantıya göre yazar: .prom / .txt -> Prometheus metni, diğerleri -> JSON özet."""
+        path = Path(path)
+        if path.suffix in (".prom", ".txt"):
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def report(self) -> str:
+        """Terminal için kısa özet."""
+        d = self.to_dict()
+        lines = [f"  {d['items']} kayıt, {d['elapsed_seconds']} sn ({d['items_per_second']} kayıt/sn), "
+                 f"cache isabeti {d['cache_hits']}"]
+        for host, h in d["hosts"].items():
+            lat = h["latency"]
+            lines.append(f"  {host}: {lat['count']} yanıt, p50 {lat.get('p50')} sn, p90 {lat.get('p90')} sn, "
+                         f"{h['bytes'] / 1e6:.2f} MB")
+        if d["retries"]:
+            lines.append("  retry: " + ", ".join(f"{s}={n}" for s, n in d["retries"].items()))
+        for kind, p in d["parse_seconds"].items():
+            lines.append(f"  ayrıştırma ({kind}): {p['count']} sayfa, ortalama {p.get('mean')} sn")
+        low = [f"{f} %{rate * 100:.0f}" for f, rate in d["fields"]["hit_rate"].items() if rate < 0.9]
+        if low:
+            lines.append("  düşük doluluk: " + ", ".join(low))
+        return "\n".join(lines)
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
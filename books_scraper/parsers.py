@@ -0,0 +1,42 @@
+# parsers.py
+# Amaç: bs4 tabanlı tüm scraper'lar için tek bir parser seçimi.
+# Kurulu olan en hızlı BeautifulSoup tree builder'ı kullanılır: lxml > html.parser.
+# SCRAPEWORKS_PARSER ortam değişkeni ile zorlanabilir (ör. "html.parser").
+# selectolax bs4 ağacı üretemediği için burada backend değil; benchmarks/bench_parsers.py
+# içinde karşılaştırma için ölçülür.
+
+import os
+from functools import lru_cache
+from typing import List
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+PARSER_ENV = "SCRAPEWORKS_PARSER"
+PREFERENCE = ("lxml", "html.parser")
+
+
+def backend_available(name: str) -> bool:
+    try:
+        BeautifulSoup("<p></p>", name)
+        return True
+    except FeatureNotFound:
+        return False
+
+
+def available_backends() -> List[str]:
+    return [name for name in PREFERENCE if backend_available(name)]
+
+
+@lru_cache(maxsize=None)
+def default_backend() -> str:
+    forced = os.environ.get(PARSER_ENV)
+    if forced:
+        if backend_available(forced):
+            return forced
+        print(f"{PARSER_ENV}={forced} kullanılamıyor, otomatik seçime dönülüyor.")
+    return available_backends()[0]
+
+
+def make_soup(markup, backend: str = None) -> BeautifulSoup:
+    """markup -> BeautifulSoup; backend verilmezse kurulu en hızlı parser."""
+    return BeautifulSoup(markup, backend or default_backend())
@@ -0,0 +1,132 @@
+# rate_limiter.py
+# Amaç: tüm scraper'lar için ortak, domain başına token bucket hız sınırlayıcı.
+# Sabit sleep'ler yerine her domain kendi bucket'ından token harcar; 429/503 gelince
+# hız yarıya iner (Retry-After varsa o süre boyunca domain durdurulur), başarılı
+# yanıtlarla hız yavaşça tekrar yükselir (AIMD). Diğer hatalarda (5xx, bağlantı hatası)
+# tekrar denemeden önce `retry_delay` ile üstel, jitter'lı bekleme yapılır.
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+BACKOFF_STATUSES = (429, 503)
+RETRY_BACKOFF = 1.0               # sn; 1. tekrar öncesi bekleme tabanı, her denemede iki katına çıkar
+RETRY_BACKOFF_MAX = 30.0
+
+
+class TokenBucket:
+    """Klasik token bucket. `reserve()` token'ı hemen ayırır ve beklenmesi gereken süreyi döner;
+    token sayısı eksiye düşebilir, böylece bekleyenler sıraya girmiş olur."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens -= 1
+        wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+        return max(wait, self.paused_until - now)
+
+
+class DomainRateLimiter:
+    """
+    Domain başına TokenBucket tutar. Thread-safe; senkron (`wait`), asyncio (`wait_async`)
+    ve dışarıdan planlanan (`reserve`, ör. Scrapy/Twisted) bekleme destekler.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: float = 1.0, min_rate: float = 0.05,
+                 max_rate: Optional[float] = None, backoff_factor: float = 0.5,
+                 recovery_step: float = 0.05, overrides: Optional[Dict[str, float]] = None):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self.overrides = overrides or {}       # domain -> başlangıç hızı (istek/sn)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    def _bucket(self, domain: str) -> TokenBucket:
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            bucket = TokenBucket(self.overrides.get(domain, self.rate), self.burst)
+            self._buckets[domain] = bucket
+        return bucket
+
+    def reserve(self, url: str) -> float:
+        """Bu URL'nin domain'inden bir token ayır; beklenmesi gereken saniyeyi döner."""
+        with self._lock:
+            return self._bucket(self.domain_of(url)).reserve()
+
+    def wait(self, url: str) -> None:
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url: str) -> None:
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def feedback(self, url: str, status: int, retry_after: Optional[str] = None) -> None:
+        """Yanıt durumuna göre domain hızını uyarlar: 429/503 -> çarpımsal azalma, 2xx/3xx -> toplamsal artış."""
+        domain = self.domain_of(url)
+        with self._lock:
+            bucket = self._bucket(domain)
+            ceiling = max(self.max_rate, self.overrides.get(domain, 0.0))
+            if status in BACKOFF_STATUSES:
+                bucket.rate = max(self.min_rate, bucket.rate * self.backoff_factor)
+                pause = parse_retry_after(retry_after)
+                if pause:
+                    bucket.paused_until = max(bucket.paused_until, time.monotonic() + pause)
+            elif 200 <= status < 400:
+                bucket.rate = min(ceiling, bucket.rate + self.recovery_step)
+
+    def current_rate(self, url: str) -> float:
+        with self._lock:
+            return self._bucket(self.domain_of(url)).rate
+
+
+def parse_retry_after(value: Optional[str]) -> float:
+    """Retry-After başlığını saniyeye çevirir (saniye ya da HTTP tarih biçimi)."""
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_delay(attempt: int, base: float = RETRY_BACKOFF, cap: float = RETRY_BACKOFF_MAX) -> float:
+    """
+    attempt. başarısız denemeden sonra beklenecek süre: min(cap, base * 2^(attempt-1)) üst sınırının
+    yarısı sabit, yarısı rastgele (aynı anda düşen istekler aynı anda tekrar denemez).
+    """
+    ceiling = min(cap, base * 2 ** (attempt - 1))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
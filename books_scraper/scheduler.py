@@ -0,0 +1,85 @@
+# scheduler.py
+# Amaç: çok kategorili / çok sayfalı crawl'lar için öncelikli iş kuyruğu. İşler host başına
+# ayrı bir heap'te (heapq) tutulur; `pop` hazır (uçuştaki istek sınırı dolmamış) hostlar
+# arasından en yüksek öncelikli işi seçer, böylece dolu bir host diğerlerini bekletmez.
+# Öncelik küçük olan önce çıkar: (tür, sıra, kategori) biçimindeki anahtarlarla listeleme
+# sayfaları ürünlerden, üst sıradaki ürünler alttakilerden önce gelir; aynı sıradaki işler
+# kategoriler arasında dönüşümlü dağılır (bir kategorinin 100 ürünü diğerlerini geciktirmez).
+# concurrent_fetch.fetch_as_completed jobs olarak bir CrawlScheduler da kabul eder; bu durumda
+# tüketici sonuçları işlerken kuyruğa yeni iş ekleyebilir (ör. keşfedilen sayfalar).
+
+import heapq
+import itertools
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# iş türleri (önceliğin ilk elemanı)
+LISTING = 0
+PRODUCT = 1
+UNRANKED = 10 ** 6                # sırası bilinmeyen ürünler sıralı olanlardan sonra gelir
+
+
+def listing_priority(page: int, category: int = 0) -> Tuple[int, int, int]:
+    """Tüm kategorilerin 1. sayfaları, sonra 2. sayfaları..."""
+    return (LISTING, page, category)
+
+
+def product_priority(rank: Optional[int], category: int = 0) -> Tuple[int, int, int]:
+    """Tüm kategorilerin 1. ürünleri, sonra 2. ürünleri..."""
+    return (PRODUCT, UNRANKED if rank is None else rank, category)
+
+
+class CrawlScheduler:
+    """
+    Host başına heapq öncelik kuyruğu. Aynı URL (dedupe=True iken) bir kez kuyruğa girer.
+    Eşit öncelikte ekleme sırası korunur; `fifo` ile sıradan bir iş listesi kuyruğa çevrilir.
+    """
+
+    def __init__(self, dedupe: bool = True):
+        self.dedupe = dedupe
+        self._heaps: Dict[str, List] = {}
+        self._seen = set()
+        self._seq = itertools.count()
+        self._size = 0
+
+    @classmethod
+    def fifo(cls, jobs: Iterable[Tuple[Any, str]]) -> "CrawlScheduler":
+        scheduler = cls(dedupe=False)
+        for key, url in jobs:
+            scheduler.push(key, url)
+        return scheduler
+
+    def push(self, key: Any, url: str, priority: Tuple = ()) -> bool:
+        """İşi ekler; dedupe açıkken URL daha önce eklendiyse False döner."""
+        if self.dedupe:
+            if url in self._seen:
+                return False
+            self._seen.add(url)
+        host = urlsplit(url).netloc
+        heapq.heappush(self._heaps.setdefault(host, []), (priority, next(self._seq), key, url))
+        self._size += 1
+        return True
+
+    def pop(self, ready: Optional[Callable[[str], bool]] = None) -> Optional[Tuple[Any, str]]:
+        """
+        En yüksek öncelikli (anahtar, url). ready(host) False dönen hostlar atlanır; hazır
+        hostta iş yoksa None.
+        """
+        best_host = None
+        for host, heap in self._heaps.items():
+            if heap and (ready is None or ready(host)):
+                if best_host is None or heap[0][:2] < self._heaps[best_host][0][:2]:
+                    best_host = host
+        if best_host is None:
+            return None
+        _, _, key, url = heapq.heappop(self._heaps[best_host])
+        self._size -= 1
+        return key, url
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        """Kuyruğu öncelik sırasıyla boşaltır."""
+        while self._size:
+            yield self.pop()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# books_scraper/ altındaki ortak modüller (rate_limiter vb.) projeden import edilebilsin
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
@@ -0,0 +1,48 @@
+# HTTP cache storage backed by the shared books_scraper/http_cache.py store
+#
+# See documentation in:
+# https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#writing-your-own-storage-backend
+
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+from scrapy.utils.project import data_path
+
+from http_cache import ResponseCache
+
+
+class ResponseCacheStorage:
+    # Entries are keyed by URL, so a cache directory can be shared with the
+    # requests-based scrapers. Freshness and ETag/Last-Modified revalidation
+    # are left to HTTPCACHE_POLICY (RFC2616Policy); only HTTPCACHE_EXPIRATION_SECS
+    # drops entries here, like the built-in storages do.
+
+    def __init__(self, settings):
+        self.cachedir = data_path(settings["HTTPCACHE_DIR"], createdir=True)
+        self.expiration_secs = settings.getint("HTTPCACHE_EXPIRATION_SECS")
+        self.max_bytes = settings.getint("HTTPCACHE_MAX_BYTES", 512 * 1024 * 1024)
+        self.cache = None
+
+    def open_spider(self, spider):
+        self.cache = ResponseCache(self.cachedir, ttl=self.expiration_secs or float("inf"),
+                                   max_bytes=self.max_bytes)
+        spider.logger.debug("Using ResponseCache storage in %s" % self.cachedir)
+
+    def close_spider(self, spider):
+        self.cache.close()
+
+    def retrieve_response(self, spider, request):
+        entry = self.cache.lookup(request.url)
+        if entry is None:
+            return None
+        if self.expiration_secs > 0 and not self.cache.is_fresh(entry):
+            return None
+        request.meta["cache_timestamp"] = entry.stored_at
+        headers = Headers(entry.headers)
+        respcls = responsetypes.from_args(headers=headers, url=entry.url, body=entry.body)
+        return respcls(url=entry.url, headers=headers, status=entry.status, body=entry.body)
+
+    def store_response(self, spider, request, response):
+        headers = {k.decode("latin-1"): b", ".join(v).decode("latin-1")
+                   for k, v in response.headers.items()}
+        encoding = getattr(response, "encoding", None)
+        self.cache.store(request.url, response.status, headers, response.body, encoding)
@@ -7,6 +7,14 @@ import scrapy
 
 
 class ScrapyScraperItem(scrapy.Item):
-    # define the fields for your item here like:
-    # name = scrapy.Field()
-    pass
+    # listeleme kartından (soup_scraper ile aynı şema)
+    title = scrapy.Field()
+    price = scrapy.Field()
+    stock = scrapy.Field()
+    rating = scrapy.Field()
+    product_page_url = scrapy.Field()
+    # ürün sayfasından
+    upc = scrapy.Field()
+    category = scrapy.Field()
+    available = scrapy.Field()
+    description = scrapy.Field()
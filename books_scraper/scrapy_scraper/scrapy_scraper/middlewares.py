@@ -3,10 +3,20 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import random
+import time
+
 from scrapy import signals
+from scrapy.downloadermiddlewares.retry import RetryMiddleware, get_retry_request
+from scrapy.exceptions import NotConfigured
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
+from scrapy.utils.defer import maybe_deferred_to_future
+from twisted.internet.task import deferLater
+
+from metrics import CrawlMetrics
+from rate_limiter import DomainRateLimiter
 
 
 class ScrapyScraperSpiderMiddleware:
@@ -98,3 +108,178 @@ class ScrapyScraperDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class DomainRateLimitMiddleware:
+    # Replaces DOWNLOAD_DELAY with the shared per-domain token bucket
+    # (books_scraper/rate_limiter.py): requests wait for a token, 429/503
+    # responses halve the domain's rate and honour Retry-After. Ordered after
+    # HttpCacheMiddleware so cache hits skip the bucket; responses flagged
+    # "cached" give no rate feedback.
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        limiter = DomainRateLimiter(
+            rate=settings.getfloat("RATE_LIMIT_PER_SECOND", 1.0),
+            burst=settings.getfloat("RATE_LIMIT_BURST", 1.0),
+            min_rate=settings.getfloat("RATE_LIMIT_MIN_PER_SECOND", 0.05),
+            overrides=settings.getdict("RATE_LIMIT_DOMAINS"),
+        )
+        s = cls(limiter)
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        return s
+
+    async def process_request(self, request, spider):
+        delay = self.limiter.reserve(request.url)
+        if delay > 0:
+            from twisted.internet import reactor
+
+            await maybe_deferred_to_future(deferLater(reactor, delay, lambda: None))
+        return None
+
+    def process_response(self, request, response, spider):
+        if "cached" in response.flags:
+            return response
+        self.limiter.feedback(request.url, response.status,
+                              response.headers.get("Retry-After", b"").decode("latin-1") or None)
+        return response
+
+    def process_exception(self, request, exception, spider):
+        self.limiter.feedback(request.url, 503)
+        return None
+
+    def spider_opened(self, spider):
+        spider.logger.info("Rate limiter: %.2f req/s per domain" % self.limiter.rate)
+
+
+class RotatingUserAgentMiddleware:
+    # Picks a random USER_AGENTS entry for every request, retries included,
+    # so a blocked attempt is not repeated with the same identity. Runs
+    # before the built-in UserAgentMiddleware (which only sets a default).
+    # Requests with meta["fixed_user_agent"] keep their header.
+
+    def __init__(self, user_agents):
+        self.user_agents = user_agents
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        user_agents = crawler.settings.getlist("USER_AGENTS")
+        if not user_agents:
+            raise NotConfigured
+        return cls(user_agents)
+
+    def process_request(self, request, spider):
+        if not request.meta.get("fixed_user_agent"):
+            request.headers["User-Agent"] = random.choice(self.user_agents)
+        return None
+
+
+class BlockedPageRetryMiddleware(RetryMiddleware):
+    # Built-in retry plus "soft blocks": a 200 response whose body contains
+    # one of BLOCKED_PAGE_MARKERS (captcha / robot check pages) is retried
+    # like a 503 and reported as retry/reason_count/blocked page.
+
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.blocked_markers = [m.encode("utf-8") for m in settings.getlist("BLOCKED_PAGE_MARKERS")]
+
+    def process_response(self, request, response, spider=None):
+        if (self.blocked_markers and response.status == 200 and not request.meta.get("dont_retry", False)
+                and any(marker in response.body for marker in self.blocked_markers)):
+            retry = get_retry_request(
+                request,
+                reason="blocked page",
+                spider=self.crawler.spider,
+                max_retry_times=request.meta.get("max_retry_times", self.max_retry_times),
+            )
+            return retry or response
+        return super().process_response(request, response)
+
+
+class CrawlMetricsMiddleware:
+    # Collects books_scraper/metrics.py metrics for the crawl: download
+    # latency, body bytes and status per host, retries by reason (from the
+    # retry/reason_count stats), time spent inside each callback, field
+    # coverage of scraped items and items/s. Written at spider close to
+    # METRICS_EXPORT_URI ("%(name)s" expands to the spider name). Values in
+    # spider.missing_values count as empty, in addition to "" and None.
+    # Registered near the spider (high order) so only callback time is measured.
+
+    def __init__(self, uri, stats):
+        self.uri = uri
+        self.stats = stats
+        self.metrics = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        uri = crawler.settings.get("METRICS_EXPORT_URI")
+        if not uri:
+            raise NotConfigured
+        s = cls(uri, crawler.stats)
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.response_received, signal=signals.response_received)
+        crawler.signals.connect(s.item_scraped, signal=signals.item_scraped)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    def spider_opened(self, spider):
+        self.metrics = CrawlMetrics(spider.name)
+
+    def response_received(self, response, request, spider):
+        if "cached" in response.flags:
+            self.metrics.observe_cache_hit()
+            return
+        self.metrics.observe_fetch(response.url, request.meta.get("download_latency", 0.0),
+                                   response.status, len(response.body))
+
+    def item_scraped(self, item, response, spider):
+        missing = ("", None, *getattr(spider, "missing_values", ()))
+        fields = getattr(spider, "item_fields", None) or list(ItemAdapter(item).keys())
+        self.metrics.observe_item()
+        self.metrics.observe_fields(ItemAdapter(item), fields, missing=missing)
+
+    def _parse_kind(self, response):
+        callback = response.request.callback if response.request else None
+        return getattr(callback, "__name__", "parse")
+
+    def process_spider_output(self, response, result, spider):
+        # only the time spent producing each output counts, not downstream handling
+        spent = 0.0
+        it = iter(result)
+        while True:
+            start = time.perf_counter()
+            try:
+                out = next(it)
+            except StopIteration:
+                break
+            finally:
+                spent += time.perf_counter() - start
+            yield out
+        self.metrics.observe_parse(self._parse_kind(response), spent)
+
+    async def process_spider_output_async(self, response, result, spider):
+        spent = 0.0
+        it = result.__aiter__()
+        while True:
+            start = time.perf_counter()
+            try:
+                out = await it.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                spent += time.perf_counter() - start
+            yield out
+        self.metrics.observe_parse(self._parse_kind(response), spent)
+
+    def spider_closed(self, spider, reason):
+        prefix = "retry/reason_count/"
+        for key, n in self.stats.get_stats().items():
+            if key.startswith(prefix):
+                self.metrics.observe_retry(key[len(prefix):], n)
+        path = self.uri % {"name": spider.name}
+        self.metrics.export(path)
+        spider.logger.info("Metrics written to %s\n%s" % (path, self.metrics.report()))
@@ -5,9 +5,94 @@
 
 
 # useful for handling different item types with a single interface
+import re
+
 from itemadapter import ItemAdapter
+from scrapy.exceptions import DropItem
+
+from exporters import MultiWriter, open_writer
+from snapshot_store import SNAPSHOT_ROOT, snapshot_writers
 
 
 class ScrapyScraperPipeline:
     def process_item(self, item, spider):
         return item
+
+
+class BookNormalizationPipeline:
+    # Cleans raw selector output into the soup_scraper record format:
+    # whitespace collapsed, "star-rating Three" -> "Three",
+    # "In stock (22 available)" -> available="22". Items without a title
+    # and repeated UPCs are dropped.
+
+    _WS = re.compile(r"\s+")
+    _AVAILABLE = re.compile(r"(\d+)\s+available")
+
+    def __init__(self):
+        self.seen_upcs = set()
+
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        for name, value in adapter.items():
+            if isinstance(value, str):
+                adapter[name] = self._WS.sub(" ", value).strip()
+        if not adapter.get("title"):
+            raise DropItem(f"Başlıksız kayıt: {adapter.get('product_page_url')}")
+
+        rating = adapter.get("rating")
+        if rating:
+            adapter["rating"] = rating.split()[-1]
+        available = self._AVAILABLE.search(adapter.get("available") or "")
+        adapter["available"] = available.group(1) if available else ""
+
+        upc = adapter.get("upc")
+        if upc:
+            if upc in self.seen_upcs:
+                raise DropItem(f"Tekrarlanan UPC: {upc}")
+            self.seen_upcs.add(upc)
+        for name in adapter.field_names():
+            if adapter.get(name) is None:
+                adapter[name] = ""
+        return item
+
+
+class StreamingExportPipeline:
+    # Appends every item to the STREAM_EXPORT_URIS files as soon as it is
+    # scraped (books_scraper/exporters.py), flushing every
+    # STREAM_EXPORT_BATCH_SIZE items. "%(name)s" expands to the spider name.
+    # Items also go to a typed Parquet snapshot under SNAPSHOT_STORE
+    # (books_scraper/snapshot_store.py, partitioned by spider name and date).
+
+    def __init__(self, uris, batch_size, encoding, snapshot_root=SNAPSHOT_ROOT):
+        self.uris = uris
+        self.batch_size = batch_size
+        self.encoding = encoding
+        self.snapshot_root = snapshot_root
+        self.writer = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            uris=settings.getlist("STREAM_EXPORT_URIS", ["%(name)s.csv"]),
+            batch_size=settings.getint("STREAM_EXPORT_BATCH_SIZE", 100),
+            encoding=settings.get("STREAM_EXPORT_ENCODING", "utf-8"),
+            snapshot_root=settings.get("SNAPSHOT_STORE", SNAPSHOT_ROOT),
+        )
+
+    def open_spider(self, spider):
+        # declared item fields fix the column order even if the first item is sparse
+        fields = list(getattr(spider, "item_fields", None) or []) or None
+        self.writer = MultiWriter([
+            open_writer(uri % {"name": spider.name}, fieldnames=fields, batch_size=self.batch_size,
+                        encoding=self.encoding)
+            for uri in self.uris
+        ] + snapshot_writers(spider.name, fields, root=self.snapshot_root))
+
+    def close_spider(self, spider):
+        self.writer.close()
+        spider.logger.info(f"{self.writer.count} kayıt yazıldı: {', '.join(w.path.name for w in self.writer.writers)}")
+
+    def process_item(self, item, spider):
+        self.writer.write(ItemAdapter(item).asdict())
+        return item
@@ -22,9 +22,16 @@ ADDONS = {}
 ROBOTSTXT_OBEY = True
 
 # Concurrency and throttling settings
-#CONCURRENT_REQUESTS = 16
-CONCURRENT_REQUESTS_PER_DOMAIN = 1
-DOWNLOAD_DELAY = 1
+# Pacing is done per domain by DomainRateLimitMiddleware (token bucket with
+# adaptive backoff on 429/503) instead of a fixed DOWNLOAD_DELAY; AutoThrottle
+# below adapts the number of parallel requests to the observed latency.
+CONCURRENT_REQUESTS = 32
+CONCURRENT_REQUESTS_PER_DOMAIN = 16
+DOWNLOAD_DELAY = 0
+RATE_LIMIT_PER_SECOND = 2.0
+RATE_LIMIT_BURST = 4
+# books.toscrape.com is a scraping sandbox; real sites keep the default rate
+RATE_LIMIT_DOMAINS = {"books.toscrape.com": 40.0}
 
 # Disable cookies (enabled by default)
 #COOKIES_ENABLED = False
@@ -40,15 +47,30 @@ DOWNLOAD_DELAY = 1
 
 # Enable or disable spider middlewares
 # See https://docs.scrapy.org/en/latest/topics/spider-middleware.html
-#SPIDER_MIDDLEWARES = {
-#    "scrapy_scraper.middlewares.ScrapyScraperSpiderMiddleware": 543,
-#}
+SPIDER_MIDDLEWARES = {
+    "scrapy_scraper.middlewares.CrawlMetricsMiddleware": 950,
+}
+# Run metrics written at spider close: .json summary or .prom (Prometheus text).
+# Set to "" to disable.
+METRICS_EXPORT_URI = "%(name)s_metrics.json"
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
-#DOWNLOADER_MIDDLEWARES = {
+DOWNLOADER_MIDDLEWARES = {
 #    "scrapy_scraper.middlewares.ScrapyScraperDownloaderMiddleware": 543,
-#}
+    "scrapy_scraper.middlewares.RotatingUserAgentMiddleware": 400,
+    "scrapy.downloadermiddlewares.retry.RetryMiddleware": None,
+    "scrapy_scraper.middlewares.BlockedPageRetryMiddleware": 550,
+    # After HttpCacheMiddleware (900): responses served from the cache never
+    # wait for a token; stale entries revalidated over the network still do.
+    "scrapy_scraper.middlewares.DomainRateLimitMiddleware": 910,
+}
+
+# RotatingUserAgentMiddleware is a no-op while USER_AGENTS is empty and
+# BlockedPageRetryMiddleware behaves like the built-in retry while
+# BLOCKED_PAGE_MARKERS is empty; spiders set both in custom_settings.
+USER_AGENTS = []
+BLOCKED_PAGE_MARKERS = []
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
@@ -58,30 +80,42 @@ DOWNLOAD_DELAY = 1
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
-#ITEM_PIPELINES = {
+ITEM_PIPELINES = {
 #    "scrapy_scraper.pipelines.ScrapyScraperPipeline": 300,
-#}
+    "scrapy_scraper.pipelines.BookNormalizationPipeline": 300,
+    "scrapy_scraper.pipelines.StreamingExportPipeline": 800,
+}
+STREAM_EXPORT_URIS = ["%(name)s.csv", "%(name)s.xlsx"]
+STREAM_EXPORT_BATCH_SIZE = 100
+# Typed Parquet snapshots, one file per run under
+# <SNAPSHOT_STORE>/source=<spider>/date=<YYYY-MM-DD>/. Defaults to
+# $SCRAPEWORKS_SNAPSHOTS or "snapshots"; set to "" to disable.
+#SNAPSHOT_STORE = "snapshots"
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
-#AUTOTHROTTLE_ENABLED = True
+AUTOTHROTTLE_ENABLED = True
 # The initial download delay
-#AUTOTHROTTLE_START_DELAY = 5
+AUTOTHROTTLE_START_DELAY = 0.25
 # The maximum download delay to be set in case of high latencies
-#AUTOTHROTTLE_MAX_DELAY = 60
+AUTOTHROTTLE_MAX_DELAY = 10
 # The average number of requests Scrapy should be sending in parallel to
 # each remote server
-#AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
+AUTOTHROTTLE_TARGET_CONCURRENCY = 8.0
 # Enable showing throttling stats for every response received:
 #AUTOTHROTTLE_DEBUG = False
 
 # Enable and configure HTTP caching (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
-#HTTPCACHE_ENABLED = True
-#HTTPCACHE_EXPIRATION_SECS = 0
-#HTTPCACHE_DIR = "httpcache"
-#HTTPCACHE_IGNORE_HTTP_CODES = []
-#HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+# ResponseCacheStorage keeps bodies content-addressed with LRU eviction and
+# RFC2616Policy revalidates stale entries with ETag/Last-Modified.
+HTTPCACHE_ENABLED = True
+HTTPCACHE_EXPIRATION_SECS = 0
+HTTPCACHE_DIR = "httpcache"
+HTTPCACHE_IGNORE_HTTP_CODES = [301, 302, 403, 404, 429, 500, 502, 503, 504]
+HTTPCACHE_STORAGE = "scrapy_scraper.httpcache.ResponseCacheStorage"
+HTTPCACHE_POLICY = "scrapy.extensions.httpcache.RFC2616Policy"
+HTTPCACHE_MAX_BYTES = 512 * 1024 * 1024
 
 # Set settings whose default value is deprecated to a future-proof value
 FEED_EXPORT_ENCODING = "utf-8"
@@ -0,0 +1,85 @@
+import scrapy
+
+from Amazon.AmazonVeriKazma import (
+    BURST, CATEGORY_NODES, DEFAULT_VALUE, HEADERS_BASE, MAX_PAGES, OUTPUT_FIELDS, PER_HOST_IN_FLIGHT,
+    REQUESTS_PER_SECOND, RETRIES, TARGET_PER_PAGE, USER_AGENTS,
+    collect_products_from_page, extract_product_data, listing_url, rank_number, utc_now,
+)
+from Amazon.extraction_registry import listing_page_count
+from asin_set import AsinSet
+from fingerprint import FINGERPRINT_FIELD, SCRAPED_AT_FIELD, row_fingerprint
+from parsers import make_soup
+
+# captcha / robot check sayfaları 200 döner; bu işaretler varsa istek yeniden denenir
+BLOCKED_PAGE_MARKERS = ["/errors/validateCaptcha", "api-services-support@amazon.com"]
+# Scrapy'de büyük priority önce işlenir: listeleme sayfaları ürünlerden, üst sıradaki
+# ürünler alttakilerden önce (scheduler.py ile aynı sıra)
+LISTING_PRIORITY = 10 ** 6
+
+
+class AmazonBestsellerSpider(scrapy.Spider):
+    name = "amazon_bestsellers"
+    item_fields = OUTPUT_FIELDS
+    missing_values = (DEFAULT_VALUE,)       # metriklerde boş sayılır
+
+    # Ayrıştırma AmazonVeriKazma'daki saf fonksiyonlarla yapılır; retry, UA rotasyonu, hız
+    # sınırı, cache ve eşzamanlılık Scrapy motoru + middlewares.py tarafından sağlanır.
+    custom_settings = {
+        "DEFAULT_REQUEST_HEADERS": HEADERS_BASE,
+        "USER_AGENTS": USER_AGENTS,
+        "BLOCKED_PAGE_MARKERS": BLOCKED_PAGE_MARKERS,
+        "RETRY_TIMES": RETRIES - 1,
+        "RETRY_HTTP_CODES": [429, 500, 502, 503, 504, 522, 524, 408],
+        "CONCURRENT_REQUESTS_PER_DOMAIN": PER_HOST_IN_FLIGHT,
+        "RATE_LIMIT_PER_SECOND": REQUESTS_PER_SECOND,
+        "RATE_LIMIT_BURST": BURST,
+        "AUTOTHROTTLE_TARGET_CONCURRENCY": 2.0,
+        "ITEM_PIPELINES": {"scrapy_scraper.pipelines.StreamingExportPipeline": 800},
+        "STREAM_EXPORT_URIS": ["%(name)s.csv"],
+        "STREAM_EXPORT_BATCH_SIZE": 10,
+        "STREAM_EXPORT_ENCODING": "utf-8-sig",
+    }
+
+    def __init__(self, categories=None, pages=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # scrapy crawl amazon_bestsellers -a categories=computers/12601907031 -a pages=1,2,3
+        # pages verilmezse sayfa sayısı her kategorinin 1. sayfasındaki sayfalamadan keşfedilir
+        self.categories = categories.split(",") if categories else CATEGORY_NODES
+        self.pages = [int(p) for p in pages.split(",")] if pages else None
+        self.seen_asins = AsinSet()
+
+    def listing_request(self, category, page):
+        return scrapy.Request(listing_url(category, page), callback=self.parse, priority=LISTING_PRIORITY - page,
+                              cb_kwargs={"category": category, "page": page})
+
+    async def start(self):
+        for category in self.categories:
+            for page in self.pages or [1]:
+                yield self.listing_request(category, page)
+
+    def parse(self, response, category, page):
+        soup = make_soup(response.text)
+        if page == 1 and self.pages is None:
+            last = min(listing_page_count(soup) or MAX_PAGES, MAX_PAGES)
+            for next_page in range(2, last + 1):
+                yield self.listing_request(category, next_page)
+        products = collect_products_from_page(response.text, soup, limit=TARGET_PER_PAGE,
+                                              seen_global=self.seen_asins)
+        self.logger.info(f"{category} sayfa {page}: {len(products)} benzersiz ürün")
+        self.crawler.stats.inc_value("amazon/products_found", len(products))
+        for meta in products:
+            self.seen_asins.add(meta["asin"])
+            meta["kategori"] = category
+            rank = rank_number(meta.get("rank"))
+            yield response.follow(meta["link"], self.parse_product, cb_kwargs={"meta": meta},
+                                  priority=-rank if rank is not None else -LISTING_PRIORITY)
+
+    def parse_product(self, response, meta):
+        rec = extract_product_data(response.text, meta["link"], meta.get("rank"))
+        rec["asin"] = meta["asin"]
+        if not rec.get("rank"):
+            rec["rank"] = meta.get("rank", DEFAULT_VALUE)
+        rec["kategori"] = meta.get("kategori", DEFAULT_VALUE)
+        rec[SCRAPED_AT_FIELD] = utc_now()
+        rec[FINGERPRINT_FIELD] = row_fingerprint(rec)
+        yield rec
@@ -1,30 +1,38 @@
+import os
+
 import scrapy
-import pandas as pd
+
+from scrapy_scraper.items import ScrapyScraperItem
 
 class BooksSpider(scrapy.Spider):
     name = "books"
-    start_urls = ["https://books.toscrape.com/"]
-
-    def __init__(self):
-        super().__init__()
-        self.books = []
+    # SCRAPEWORKS_BOOKS_ROOT ile yerel mock sunucuya yönlendirilebilir
+    start_urls = [os.environ.get("SCRAPEWORKS_BOOKS_ROOT", "https://books.toscrape.com/").rstrip("/") + "/"]
+    item_fields = list(ScrapyScraperItem.fields)   # çıktı sütun sırası
 
+    # Listeleme kartı -> ürün sayfası -> tek ScrapyScraperItem. Temizlik BookNormalizationPipeline,
+    # yazma StreamingExportPipeline (books.csv / books.xlsx) tarafından yapılır.
     def parse(self, response):
         for book in response.css("article.product_pod"):
-            item = {
-                'title': book.css("h3 a::attr(title)").get(),
-                'price': book.css(".price_color::text").get(),
-                'stock': book.css(".instock.availability::text").re_first(r'\S+'),
-                'rating': book.css("p.star-rating").attrib.get('class').split()[-1],
-                'product_page_url': response.urljoin(book.css("h3 a::attr(href)").get())
-            }
-            self.books.append(item)
+            item = ScrapyScraperItem(
+                title=book.css("h3 a::attr(title)").get(),
+                price=book.css(".price_color::text").get(),
+                stock=" ".join(book.css(".instock.availability::text").getall()),
+                rating=book.css("p.star-rating::attr(class)").get(),
+                product_page_url=response.urljoin(book.css("h3 a::attr(href)").get()),
+            )
+            yield response.follow(item['product_page_url'], self.parse_book, cb_kwargs={'item': item})
 
         next_page = response.css('li.next a::attr(href)').get()
         if next_page:
             yield response.follow(next_page, self.parse)
-        else:
-            df = pd.DataFrame(self.books)
-            df.to_csv('books.csv', index=False, encoding='utf-8')
-            df.to_excel('books.xlsx', index=False)
-            self.log(f"{len(self.books)} kitap kaydedildi.")
+
+    def parse_book(self, response, item):
+        table = {row.css("th::text").get(): row.css("td::text").get()
+                 for row in response.css("table.table-striped tr")}
+        crumbs = response.css("ul.breadcrumb li a::text").getall()
+        item['upc'] = table.get("UPC")
+        item['category'] = crumbs[-1] if len(crumbs) >= 3 else None
+        item['available'] = table.get("Availability")
+        item['description'] = response.css("#product_description + p::text").get()
+        yield item
@@ -1,47 +1,42 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-import time
-import pandas as pd
-
-def get_books_with_selenium():
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--disable-gpu')
-
-    service = Service()  # chromedriver path ayarlanabilir, sistemde varsa boş bırakılabilir
-    driver = webdriver.Chrome(service=service, options=options)
-
-    driver.get("https://books.toscrape.com/")
-    time.sleep(2)
-
-    books = []
-    book_elements = driver.find_elements(By.CSS_SELECTOR, "article.product_pod")
-    for book in book_elements:
-        title = book.find_element(By.CSS_SELECTOR, "h3 a").get_attribute("title")
-        price = book.find_element(By.CSS_SELECTOR, ".price_color").text
-        stock = book.find_element(By.CSS_SELECTOR, ".instock.availability").text.strip()
-        rating_class = book.find_element(By.CSS_SELECTOR, "p.star-rating").get_attribute("class")
-        rating = rating_class.split()[-1]
-        relative_url = book.find_element(By.CSS_SELECTOR, "h3 a").get_attribute("href")
-
-        books.append({
-            'title': title,
-            'price': price,
-            'stock': stock,
-            'rating': rating,
-            'product_page_url': relative_url
-        })
-
-    driver.quit()
-    return books
+from browser_pool import BrowserPool
+from rate_limiter import DomainRateLimiter
+from exporters import MultiWriter, open_writer
+
+BASE_URL = "https://books.toscrape.com/"
+REQUESTS_PER_SECOND = 1.0
+PAGE_TIMEOUT = 10
+limiter = DomainRateLimiter(rate=REQUESTS_PER_SECOND, burst=1)
+
+# tüm kartlar tek execute_script çağrısında, JSON olarak (kart başına WebDriver round-trip'i yok)
+EXTRACT_BOOKS_JS = """
+return JSON.stringify(Array.from(document.querySelectorAll("article.product_pod"), function (b) {
+    var a = b.querySelector("h3 a");
+    var stock = b.querySelector(".instock.availability");
+    var rating = b.querySelector("p.star-rating");
+    return {
+        title: a ? a.getAttribute("title") : "",
+        price: (b.querySelector(".price_color") || {}).textContent || "",
+        stock: stock ? stock.textContent.trim() : "",
+        rating: rating ? rating.classList[rating.classList.length - 1] : "",
+        product_page_url: a ? a.href : ""
+    };
+}));
+"""
+
+def get_books_with_selenium(pool=None, url=BASE_URL):
+    """Tek sayfanın kitapları; pool verilmezse tek tarayıcılık geçici bir havuz açılır."""
+    if pool is None:
+        with BrowserPool(browsers=1, tabs=1, timeout=PAGE_TIMEOUT) as own_pool:
+            return get_books_with_selenium(own_pool, url)
+    limiter.wait(url)
+    return pool.render(url, "article.product_pod", EXTRACT_BOOKS_JS)
 
 def save_books_to_files(data, csv_path, excel_path):
-    df = pd.DataFrame(data)
-    df.to_csv(csv_path, index=False, encoding='utf-8')
-    df.to_excel(excel_path, index=False)
-    print(f"{len(data)} kitap başarıyla kaydedildi.")
+    """Kayıtları (liste ya da generator) geldikçe CSV ve Excel'e yazar."""
+    with MultiWriter([open_writer(csv_path), open_writer(excel_path)]) as writer:
+        for book in data:
+            writer.write(book)
+    print(f"{writer.count} kitap başarıyla kaydedildi.")
     print(f"- CSV: {csv_path}")
     print(f"- Excel: {excel_path}")
 
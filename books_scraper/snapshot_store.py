@@ -0,0 +1,265 @@
+# snapshot_store.py
+# Amaç: scraper çıktılarının tipli, sütunlu (Parquet) snapshot deposu. CSV/XLSX çıktıları
+# aynen kalır; her çalışma ayrıca kaynak ve tarihe göre bölümlenmiş bir Parquet dosyası yazar:
+#   snapshots/source=<kaynak>/date=<YYYY-MM-DD>/run-<YYYYMMDDTHHMMSSZ>-<pid>.parquet
+# (Hive bölümleme: pyarrow.dataset / pandas / DuckDB doğrudan okur, tarih filtresi dosya seviyesinde.)
+# Değerler yazılırken normalize edilir, okuyanlar metni yeniden ayrıştırmaz:
+#   fiyat / price      "₺12.999,00" -> fiyat=Decimal("12999.00"), fiyat_currency="TRY"
+#   rating             "Three" -> 3 (int8)
+#   rank, değerlendirilme sayısı, available   "#12" / "1.234" -> int64
+#   scraped_at         ISO 8601 metin -> timestamp (UTC)
+#   NonePublished / "" / "None" -> null (tüm sütunlar)
+# Yazım önce "." ile başlayan geçici dosyaya yapılır (pyarrow.dataset bunları okumaz), yalnızca
+# başarılı kapanışta yeniden adlandırılır; hata/kesintide (abort) silinir, yarıda kalan çalışma
+# okuyuculara ulaşmaz. SCRAPEWORKS_SNAPSHOTS="" ile kapanır.
+
+import os
+import re
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from exporters import ParquetStreamWriter, StreamWriter
+from fingerprint import SCRAPED_AT_FIELD, normalize_value
+
+SNAPSHOT_ROOT = os.environ.get("SCRAPEWORKS_SNAPSHOTS", "snapshots")
+PRICE_PRECISION = 14              # decimal128(14, 2): 999 milyara kadar kuruş hassasiyeti
+CENTS = Decimal("0.01")
+CURRENCY_SUFFIX = "_currency"
+
+# sütun adı -> tür; listede olmayan sütunlar string kalır
+FIELD_KINDS = {
+    "price": "price", "fiyat": "price",
+    "rating": "rating",
+    "rank": "count", "değerlendirilme sayısı": "count", "available": "count",
+    SCRAPED_AT_FIELD: "timestamp",
+}
+# metindeki ilk eşleşen işaret para birimini belirler (kodlar sembollerden önce denenir)
+CURRENCIES = [("TRY", "TRY"), ("TL", "TRY"), ("₺", "TRY"), ("GBP", "GBP"), ("£", "GBP"),
+              ("EUR", "EUR"), ("€", "EUR"), ("USD", "USD"), ("$", "USD")]
+RATING_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5}
+
+_NUMBER = re.compile(r"\d[\d.,\s]*")
+_SPACE = re.compile(r"\s")
+
+
+# -------- değer normalizasyonu --------
+def clean_text(value) -> Optional[str]:
+    """Boşlukları sadeleştirilmiş metin; NonePublished / boş / NaN -> None."""
+    text = normalize_value(value)
+    return text or None
+
+
+def parse_price(value) -> Tuple[Optional[Decimal], Optional[str]]:
+    """
+    "£51.77" -> (51.77, "GBP"), "₺12.999,00" -> (12999.00, "TRY"), "1,299.99 USD" -> (1299.99, "USD").
+    Ondalık ayraç son ayraçtır; tek tür ayraç tek kez ve ardından 3 hane geliyorsa binliktir
+    ("12.999" TL -> 12999). Sayı yoksa tutar None.
+    """
+    text = clean_text(value)
+    if text is None:
+        return None, None
+    currency = next((code for marker, code in CURRENCIES if marker in text), None)
+    m = _NUMBER.search(text)
+    if not m:
+        return None, currency
+    number = _SPACE.sub("", m.group(0)).rstrip(".,")
+    last_dot, last_comma = number.rfind("."), number.rfind(",")
+    if last_dot >= 0 and last_comma >= 0:
+        decimal_sep = "." if last_dot > last_comma else ","
+    elif last_dot >= 0 or last_comma >= 0:
+        sep = "." if last_dot >= 0 else ","
+        tail = number.rpartition(sep)[2]
+        decimal_sep = None if number.count(sep) > 1 or len(tail) == 3 else sep
+    else:
+        decimal_sep = None
+    if decimal_sep:
+        whole, _, frac = number.rpartition(decimal_sep)
+    else:
+        whole, frac = number, ""
+    try:
+        amount = Decimal(f"{re.sub(r'[.,]', '', whole) or 0}.{frac or 0}").quantize(CENTS, ROUND_HALF_UP)
+    except InvalidOperation:
+        return None, currency
+    return amount, currency
+
+
+def parse_count(value) -> Optional[int]:
+    """"#12" -> 12, "1.234 değerlendirme" -> 1234, "22" -> 22; sayı yoksa None."""
+    text = clean_text(value)
+    m = _NUMBER.search(text) if text else None
+    if not m:
+        return None
+    digits = re.sub(r"\D", "", m.group(0))
+    return int(digits) if digits else None
+
+
+def parse_rating(value) -> Optional[int]:
+    """"Three" / "star-rating Three" -> 3, "4" -> 4; tanınmazsa None."""
+    text = clean_text(value)
+    if text is None:
+        return None
+    word = text.split()[-1].lower()
+    if word in RATING_WORDS:
+        return RATING_WORDS[word]
+    return int(word) if word.isdigit() else None
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """ISO 8601 metin ya da datetime -> UTC datetime; saat dilimi yoksa UTC sayılır."""
+    if isinstance(value, datetime):
+        stamp = value
+    else:
+        text = clean_text(value)
+        if text is None:
+            return None
+        try:
+            stamp = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+    return stamp.replace(tzinfo=timezone.utc) if stamp.tzinfo is None else stamp.astimezone(timezone.utc)
+
+
+def normalize_record(record: Dict, fieldnames: Iterable[str]) -> Dict:
+    """Kaydı snapshot şemasına çevirir (fiyat sütunları tutar + <alan>_currency olarak ikiye ayrılır)."""
+    row = {}
+    for name in fieldnames:
+        kind = FIELD_KINDS.get(name)
+        value = record.get(name)
+        if kind == "price":
+            row[name], row[name + CURRENCY_SUFFIX] = parse_price(value)
+        elif kind == "count":
+            row[name] = parse_count(value)
+        elif kind == "rating":
+            row[name] = parse_rating(value)
+        elif kind == "timestamp":
+            row[name] = parse_timestamp(value)
+        else:
+            row[name] = clean_text(value)
+    return row
+
+
+def snapshot_schema(fieldnames: Iterable[str]):
+    import pyarrow as pa
+
+    types = {"count": pa.int64(), "rating": pa.int8(), "timestamp": pa.timestamp("s", tz="UTC")}
+    fields = []
+    for name in fieldnames:
+        kind = FIELD_KINDS.get(name)
+        if kind == "price":
+            fields.append((name, pa.decimal128(PRICE_PRECISION, 2)))
+            fields.append((name + CURRENCY_SUFFIX, pa.string()))
+        else:
+            fields.append((name, types.get(kind, pa.string())))
+    return pa.schema(fields)
+
+
+# -------- yazma --------
+class SnapshotWriter(ParquetStreamWriter):
+    """
+    Tipli Parquet yazıcısı; MultiWriter'da CSV/XLSX yazıcılarının yanına eklenir ve aynı ham
+    kayıtları alır. Şema ilk kaydın (ya da verilen) alanlarından kurulur.
+    """
+
+    def __init__(self, path: str, fieldnames: Optional[List[str]] = None, batch_size: int = 1000):
+        super().__init__(path, fieldnames, batch_size)
+        self._partial = self.path.with_name("." + self.path.name)
+
+    def _open(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.schema = snapshot_schema(self.fieldnames)
+        self._pa = pa
+        self._writer = pq.ParquetWriter(str(self._partial), self.schema)
+
+    def _write_batch(self, rows: List[Dict]) -> None:
+        super()._write_batch([normalize_record(r, self.fieldnames) for r in rows])
+
+    def _close(self) -> None:
+        super()._close()
+        os.replace(self._partial, self.path)
+
+    def abort(self) -> None:
+        """Yarım çalışma yayımlanmaz: geçici dosya kapatılıp silinir, run-*.parquet oluşmaz."""
+        self._buffer = []
+        if self._opened:
+            self._writer.close()
+            self._opened = False
+        self._partial.unlink(missing_ok=True)
+
+
+class SnapshotStore:
+    """root altındaki source=/date= bölümlenmiş Parquet snapshot'ları."""
+
+    def __init__(self, root: str = SNAPSHOT_ROOT):
+        self.root = Path(root)
+
+    def writer(self, source: str, fieldnames: Optional[List[str]] = None, batch_size: int = 1000,
+               now: Optional[datetime] = None) -> SnapshotWriter:
+        now = now or datetime.now(timezone.utc)
+        path = (self.root / f"source={source}" / f"date={now:%Y-%m-%d}"
+                / f"run-{now:%Y%m%dT%H%M%SZ}-{os.getpid()}.parquet")
+        return SnapshotWriter(str(path), fieldnames, batch_size)
+
+    def runs(self, source: str) -> List[Path]:
+        """Kaynağın tamamlanmış çalışmaları, eskiden yeniye."""
+        return sorted(self.root.glob(f"source={source}/date=*/run-*.parquet"), key=lambda p: p.name)
+
+    def read(self, source: str, since: Optional[str] = None, until: Optional[str] = None,
+             columns: Optional[List[str]] = None):
+        """
+        Kaynağın [since, until] (YYYY-MM-DD, dahil) tarihli tüm çalışmaları tek DataFrame'de;
+        bölüm sütunu "date" eklenir. Filtre dosya seviyesinde uygulanır (diğer günler okunmaz).
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        files = self.runs(source)
+        if not files:
+            return read_snapshot_table(pa.table({}))
+        # sütunları farklı çalışmalar (ör. --details ile / olmadan) tek şemada birleşir
+        schema = pa.unify_schemas([pq.read_schema(f) for f in files] + [pa.schema([("date", pa.string())])])
+        dataset = ds.dataset(self.root / f"source={source}", schema=schema, format="parquet",
+                             partitioning=ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive"))
+        condition = None
+        if since:
+            condition = ds.field("date") >= since
+        if until:
+            clause = ds.field("date") <= until
+            condition = clause if condition is None else condition & clause
+        return read_snapshot_table(dataset.to_table(columns=columns, filter=condition))
+
+
+def read_snapshot_table(table):
+    """pyarrow Table -> DataFrame; null içeren tamsayı sütunları float'a değil Int64/Int8'e çevrilir."""
+    import pandas as pd
+    import pyarrow as pa
+
+    mapping = {pa.int64(): pd.Int64Dtype(), pa.int8(): pd.Int8Dtype()}
+    return table.to_pandas(types_mapper=mapping.get)
+
+
+def read_snapshot(path: str, columns: Optional[List[str]] = None):
+    """Tek bir snapshot dosyası (bir çalışma) DataFrame olarak."""
+    import pyarrow.parquet as pq
+
+    return read_snapshot_table(pq.read_table(path, columns=columns))
+
+
+def snapshot_writers(source: str, fieldnames: Optional[List[str]] = None,
+                     root: str = SNAPSHOT_ROOT) -> List[StreamWriter]:
+    """
+    MultiWriter'a eklenecek snapshot yazıcısı (0 ya da 1 eleman): depo kapalıysa
+    (SCRAPEWORKS_SNAPSHOTS="") ya da pyarrow kurulu değilse boş liste.
+    """
+    if not root:
+        return []
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("Parquet snapshot için pyarrow kurulu değil; yalnızca düz çıktılar yazılıyor.")
+        return []
+    return [SnapshotStore(root).writer(source, fieldnames)]
@@ -1,35 +1,229 @@
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+import argparse
+import os
+import re
+import time
+from urllib.parse import urljoin
+from rate_limiter import BACKOFF_STATUSES, DomainRateLimiter, retry_delay
+from http_cache import ResponseCache
+from parsers import make_soup
+from exporters import MultiWriter, open_writer
+from snapshot_store import snapshot_writers
+from concurrent_fetch import fetch_all
+from scheduler import CrawlScheduler
+from transport import Transport
+from metrics import CrawlMetrics
 
-BASE_URL = "https://books.toscrape.com/"
+# site kökü; yerel mock sunucuya yönlendirmek için SCRAPEWORKS_BOOKS_ROOT=http://127.0.0.1:8800/
+BASE_URL = os.environ.get("SCRAPEWORKS_BOOKS_ROOT", "https://books.toscrape.com/").rstrip("/") + "/"
+PAGE_URL = urljoin(BASE_URL, "catalogue/page-{}.html")
+REQUESTS_PER_SECOND = 2.0
+WORKERS = 8                                     # eşzamanlı istek sayısı (= bağlantı havuzu boyutu)
+RETRIES = 3
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)  # bunlar ve bağlantı hataları tekrar denenir
+OUTPUT_FILES = ["books_soup.csv", "books_soup.xlsx"]
+SNAPSHOT_SOURCE = "books_soup"                  # tipli Parquet snapshot'ı (snapshot_store.py; SCRAPEWORKS_SNAPSHOTS)
+BOOK_FIELDS = ["title", "price", "stock", "rating", "product_page_url"]
+DETAIL_FIELDS = ["upc", "category", "available", "description"]   # yalnızca --details ile
+METRICS_PATH = os.environ.get("SCRAPEWORKS_METRICS", "books_soup_metrics.json")   # .json ya da .prom
 
-def get_books_from_first_page():
-    response = requests.get(BASE_URL)
-    soup = BeautifulSoup(response.text, 'html.parser')
-    books = []
+# ağ/disk kaynakları ilk fetch()/main() çağrısında kurulur (import .httpcache açmaz, DNS'i
+# yamamaz); önceden atanan değer korunur (ör. benchmark'ın hızlı limiter'ı)
+limiter = None
+cache = None
+session = None
+metrics = None
+
+
+def setup_runtime():
+    """limiter / cache / session / metrics henüz kurulmadıysa kurar."""
+    global limiter, cache, session, metrics
+    if limiter is None:
+        limiter = DomainRateLimiter(rate=REQUESTS_PER_SECOND, burst=2)
+    if cache is None:
+        cache = ResponseCache(".httpcache", offline=os.environ.get("SCRAPEWORKS_OFFLINE") == "1")
+    if session is None:
+        session = Transport(pool_maxsize=WORKERS)
+    if metrics is None:
+        metrics = CrawlMetrics("books_soup")
+
+_PAGE_COUNT = re.compile(r"Page\s+\d+\s+of\s+(\d+)")
+_AVAILABLE = re.compile(r"(\d+)\s+available")
+
+
+def fetch(url, retries=RETRIES):
+    """
+    Cache'li GET, (text, status) döner: taze kayıt varsa ağa çıkmaz, bayatsa koşullu istekle doğrular.
+    RETRY_STATUSES ve bağlantı hataları tekrar denenir (429/503'te bekleme limiter'da, diğerlerinde
+    üstel geri çekilme); denemeler tükenirse (None, son status ya da 0).
+    """
+    setup_runtime()
+    cached = cache.lookup(url)
+    if cached and cache.is_fresh(cached):
+        metrics.observe_cache_hit()
+        return cached.text, cached.status
+    last_status = None
+    for attempt in range(1, retries + 1):
+        limiter.wait(url)
+        started = time.monotonic()
+        try:
+            response = session.get(url, headers=cache.conditional_headers(cached), timeout=15)
+        except Exception as e:
+            print(f"GET exception (attempt {attempt}): {url}: {e}")
+            limiter.feedback(url, 503)  # bağlantı hatası: aşırı yük gibi davran, hızı düşür
+            if attempt < retries:
+                metrics.observe_retry("exception")
+                time.sleep(retry_delay(attempt))
+            continue
+        last_status = response.status_code
+        metrics.observe_fetch(url, time.monotonic() - started, response.status_code, len(response.content))
+        limiter.feedback(url, response.status_code, response.headers.get("Retry-After"))
+        if response.status_code == 304 and cached:
+            cache.revalidated(url, response.headers)
+            return cached.text, cached.status
+        if response.status_code not in RETRY_STATUSES:
+            cache.store_response(url, response)
+            return response.text, response.status_code
+        if attempt < retries:
+            metrics.observe_retry(response.status_code)
+            if response.status_code not in BACKOFF_STATUSES:
+                time.sleep(retry_delay(attempt))
+    return None, last_status or 0
 
-    for book in soup.select("article.product_pod"):
-        title = book.h3.a['title']
-        price = book.select_one(".price_color").text
-        stock = book.select_one(".instock.availability").text.strip()
-        rating = book.select_one("p.star-rating")['class'][-1]
-        relative_url = book.h3.a['href']
-        full_url = BASE_URL + relative_url
 
+def fetch_html(url):
+    """Sayfanın HTML'i; alınamazsa None."""
+    text, status = fetch(url)
+    if text is None:
+        print(f"Sayfa alınamadı ({status}): {url}")
+    return text
+
+
+# -------- ayrıştırma --------
+def parse_books(soup, page_url):
+    """Listeleme sayfasındaki kitaplar; linkler sayfanın kendi URL'sine göre çözülür."""
+    books = []
+    for book in soup.select("article.product_pod"):
         books.append({
-            'title': title,
-            'price': price,
-            'stock': stock,
-            'rating': rating,
-            'product_page_url': full_url
+            'title': book.h3.a['title'],
+            'price': book.select_one(".price_color").text,
+            'stock': book.select_one(".instock.availability").text.strip(),
+            'rating': book.select_one("p.star-rating")['class'][-1],
+            'product_page_url': urljoin(page_url, book.h3.a['href'])
         })
-
     return books
 
+
+def page_count(soup):
+    """"Page 1 of 50" yazısından toplam sayfa sayısı (sayfalama yoksa 1)."""
+    current = soup.select_one("ul.pager li.current")
+    match = _PAGE_COUNT.search(current.get_text()) if current else None
+    return int(match.group(1)) if match else 1
+
+
+def parse_detail(soup):
+    """Ürün sayfasındaki ek alanlar (bulunamayan alan boş kalır)."""
+    table = {row.th.get_text(strip=True): row.td.get_text(strip=True)
+             for row in soup.select("table.table-striped tr") if row.th and row.td}
+    crumbs = soup.select("ul.breadcrumb li a")
+    description = soup.select_one("#product_description + p")
+    available = _AVAILABLE.search(table.get("Availability", ""))
+    return {
+        'upc': table.get("UPC", ""),
+        'category': crumbs[-1].get_text(strip=True) if len(crumbs) >= 3 else "",
+        'available': available.group(1) if available else "",
+        'description': description.get_text(strip=True) if description else "",
+    }
+
+
+# -------- crawl --------
+def get_books_from_first_page():
+    html = fetch_html(BASE_URL)
+    if html is None:
+        return []
+    with metrics.time_parse("listing"):
+        return parse_books(make_soup(html), BASE_URL)
+
+
+def crawl_catalogue(on_book, details=False, workers=WORKERS, max_pages=None):
+    """
+    Tüm katalog: ilk sayfadan sayfa sayısı bulunur, kalan listeleme sayfaları eşzamanlı
+    çekilir. details=True ise her listeleme sayfası ayrıştırılır ayrıştırılmaz kitaplarının ürün
+    sayfaları aynı kuyruğa eklenir; kayıt, ürün sayfası gelince on_book'a verilir (sıra geliş sırasıdır).
+    """
+    first_url = PAGE_URL.format(1)
+    first_html = fetch_html(first_url)
+    if first_html is None:
+        return
+    with metrics.time_parse("listing"):
+        first = make_soup(first_html)
+        pages = page_count(first)
+        first_books = parse_books(first, first_url)
+    if max_pages:
+        pages = min(pages, max_pages)
+
+    # öncelik (sayfa, tür): n. sayfanın ürün sayfaları (n+1). listeleme sayfasından önce çekilir,
+    # böylece bekleyen kitap sayısı birkaç sayfayla sınırlı kalır
+    jobs = CrawlScheduler(dedupe=False)
+
+    def add_books(page, books):
+        for book in books:
+            if details:
+                jobs.push(("detail", book), book['product_page_url'], (page, 1))
+            else:
+                on_book(book)
+
+    def handle(key, html, status):
+        kind, value = key
+        if kind == "page":
+            url = PAGE_URL.format(value)
+            if status != 200:
+                print(f"Sayfa alınamadı ({status}): {url}")
+                return
+            with metrics.time_parse("listing"):
+                page_books = parse_books(make_soup(html), url)
+            add_books(value, page_books)
+            return
+        book = value
+        if status == 200:
+            with metrics.time_parse("product"):
+                book.update(parse_detail(make_soup(html)))
+        else:
+            print(f"Ürün sayfası alınamadı ({status}): {book['product_page_url']}")
+        on_book(book)
+
+    add_books(1, first_books)
+    for n in range(2, pages + 1):
+        jobs.push(("page", n), PAGE_URL.format(n), (n, 0))
+    fetch_all(jobs, fetch, handle, concurrency=workers, per_host=workers)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="books.toscrape.com kitaplarını toplar.")
+    ap.add_argument("--all", action="store_true", help="tüm katalog sayfaları (varsayılan: yalnızca ilk sayfa)")
+    ap.add_argument("--details", action="store_true", help="ürün sayfalarını da çek (--all ile)")
+    ap.add_argument("--workers", type=int, default=WORKERS)
+    ap.add_argument("--max-pages", type=int, default=None)
+    args = ap.parse_args(argv)
+    setup_runtime()
+
+    fields = BOOK_FIELDS + (DETAIL_FIELDS if args.details else [])
+    writers = [open_writer(path, fieldnames=fields) for path in OUTPUT_FILES] + snapshot_writers(SNAPSHOT_SOURCE, fields)
+    with MultiWriter(writers) as writer:
+        def write(book):
+            writer.write(book)
+            metrics.observe_item()
+            metrics.observe_fields(book, fields)
+
+        if args.all:
+            crawl_catalogue(write, details=args.details, workers=args.workers, max_pages=args.max_pages)
+        else:
+            for book in get_books_from_first_page():
+                write(book)
+    print(f"{writer.count} kitap başarıyla kaydedildi.")
+    print(session.report())
+    print(metrics.report())
+    metrics.export(METRICS_PATH)
+
+
 if __name__ == "__main__":
-    books = get_books_from_first_page()
-    df = pd.DataFrame(books)
-    df.to_csv("books_soup.csv", index=False, encoding='utf-8')
-    df.to_excel("books_soup.xlsx", index=False)
-    print(f"{len(books)} kitap başarıyla kaydedildi.")
+    main()
@@ -0,0 +1,190 @@
+# transport.py
+# Amaç: requests tabanlı tüm fetcher'lar için ortak taşıma katmanı.
+#   - host başına boyutlandırılmış, keep-alive bağlantı havuzları (HTTPAdapter)
+#   - isteğe bağlı HTTP/2 (httpx[http2] kuruluysa; tek bağlantıda çoklama)
+#   - süreç geneli DNS cache'i (socket.getaddrinfo TTL'li sarmalanır)
+#   - bağlantı yeniden kullanım istatistikleri: host başına istek sayısı ve gerçek TCP(+TLS)
+#     bağlantı kurulumu sayısı. urllib3'ün num_connections sayacı, sunucunun kapattığı bir
+#     bağlantı aynı nesneyle yeniden kurulduğunda artmadığından bağlantı sınıfının connect()
+#     çağrıları sayılır. Kurulum az, istek çoksa handshake maliyeti ödenmiyor demektir.
+# Transport.get, requests.Session.get ile aynı biçimde çağrılır ve aynı alanlara sahip bir
+# yanıt döner (status_code, headers, text, content, encoding), böylece fetcher'lar değişmez.
+
+import os
+import socket
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+POOL_CONNECTIONS = 10          # havuzu tutulan farklı host sayısı
+POOL_MAXSIZE = 16              # host başına açık tutulan bağlantı (eşzamanlılıktan küçük olmamalı)
+DNS_TTL = 300                  # saniye
+HTTP2 = os.environ.get("SCRAPEWORKS_HTTP2") == "1"
+
+
+# -------- DNS cache --------
+class DnsCache:
+    """socket.getaddrinfo'yu TTL'li bir cache ile sarar (süreç geneli, thread-safe)."""
+
+    def __init__(self, ttl: float = DNS_TTL):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self._original = None
+
+    def _getaddrinfo(self, *args, **kwargs):
+        key = args + tuple(sorted(kwargs.items()))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+        result = self._original(*args, **kwargs)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (now + self.ttl, result)
+        return result
+
+    def install(self) -> None:
+        if self._original is None:
+            self._original = socket.getaddrinfo
+            socket.getaddrinfo = self._getaddrinfo
+
+    def uninstall(self) -> None:
+        if self._original is not None:
+            socket.getaddrinfo = self._original
+            self._original = None
+
+
+_dns_cache: Optional[DnsCache] = None
+
+
+def enable_dns_cache(ttl: float = DNS_TTL) -> DnsCache:
+    """Süreçte tek bir DNS cache kurar (tekrar çağrılırsa mevcut olanı döner)."""
+    global _dns_cache
+    if _dns_cache is None:
+        _dns_cache = DnsCache(ttl)
+        _dns_cache.install()
+    return _dns_cache
+
+
+# -------- transport --------
+class CountingAdapter(HTTPAdapter):
+    """Havuzdaki her bağlantı kurulumunu (connect) host:port bazında `handshakes`'e sayar."""
+
+    def __init__(self, *args, **kwargs):
+        self.handshakes = Counter()
+        self._handshake_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        adapter = self
+
+        def counting(conn_cls):
+            class Counting(conn_cls):
+                def connect(self):
+                    super().connect()
+                    with adapter._handshake_lock:
+                        adapter.handshakes[f"{self.host}:{self.port}"] += 1
+            return Counting
+
+        http_pool = type("CountingHTTPPool", (HTTPConnectionPool,), {"ConnectionCls": counting(HTTPConnection)})
+        https_pool = type("CountingHTTPSPool", (HTTPSConnectionPool,), {"ConnectionCls": counting(HTTPSConnection)})
+        self.poolmanager.pool_classes_by_scheme = {"http": http_pool, "https": https_pool}
+
+
+def _http2_client(pool_maxsize: int, headers: Optional[Dict[str, str]]):
+    try:
+        import h2  # noqa: F401  (httpx HTTP/2 için h2 paketini ister)
+        import httpx
+    except ImportError:
+        print("HTTP/2 için httpx[http2] kurulu değil; HTTP/1.1 havuzu kullanılıyor.")
+        return None
+    limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+    return httpx.Client(http2=True, limits=limits, headers=headers, follow_redirects=True)
+
+
+class Transport:
+    """
+    Paylaşılan HTTP istemcisi. http2=True ve httpx kuruluysa httpx.Client, değilse host başına
+    pool_maxsize bağlantılık havuzları olan bir requests.Session kullanılır.
+    """
+
+    def __init__(self, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE,
+                 http2: bool = HTTP2, headers: Optional[Dict[str, str]] = None,
+                 dns_cache: bool = True):
+        self.dns = enable_dns_cache() if dns_cache else None
+        self._requests = Counter()
+        self._versions = Counter()
+        self._lock = threading.Lock()
+        self._client = _http2_client(pool_maxsize, headers) if http2 else None
+        self.http2 = self._client is not None
+        if self._client is None:
+            self._session = requests.Session()
+            if headers:
+                self._session.headers.update(headers)
+            self._adapter = CountingAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            self._session.mount("https://", self._adapter)
+            self._session.mount("http://", self._adapter)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None):
+        if self._client is not None:
+            resp = self._client.get(url, headers=headers, timeout=timeout)
+            version = resp.http_version
+        else:
+            resp = self._session.get(url, headers=headers, timeout=timeout)
+            raw_version = getattr(resp.raw, "version", 11)
+            version = "HTTP/1.0" if raw_version == 10 else "HTTP/1.1"
+        with self._lock:
+            self._requests[urlsplit(url).netloc] += 1
+            self._versions[version] += 1
+        return resp
+
+    # -------- istatistik --------
+    def stats(self) -> Dict[str, Dict]:
+        """
+        host -> {"requests", "connections", "reuse"}. connections (kurulan TCP/TLS bağlantısı)
+        yalnızca HTTP/1.1 havuzu için bilinir; reuse = bağlantı başına düşen istek sayısı.
+        """
+        out = defaultdict(dict)
+        with self._lock:
+            for host, n in self._requests.items():
+                out[host]["requests"] = n
+        if self._client is None:
+            for host_port, n in self._adapter.handshakes.items():
+                host, port = host_port.rsplit(":", 1)
+                out[host if port in ("80", "443") else host_port]["connections"] = n
+        for entry in out.values():
+            conns = entry.get("connections")
+            if conns:
+                entry["reuse"] = round(entry.get("requests", 0) / conns, 2)
+        return dict(out)
+
+    def report(self) -> str:
+        lines = []
+        for host, s in sorted(self.stats().items()):
+            conns = s.get("connections", "?")
+            reuse = f", bağlantı başına {s['reuse']} istek" if "reuse" in s else ""
+            lines.append(f"  {host}: {s.get('requests', 0)} istek, {conns} yeni bağlantı{reuse}")
+        if self._versions:
+            lines.append("  protokol: " + ", ".join(f"{v}={n}" for v, n in sorted(self._versions.items())))
+        if self.dns is not None:
+            lines.append(f"  DNS cache: {self.dns.hits} isabet, {self.dns.misses} çözümleme")
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+        else:
+            self._session.close()